@@ -1,8 +1,22 @@
 """Edge Operator Agent - Industrial AI assistant using Strands Agents SDK."""
 
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from .config import EdgeAgentConfig
-from .session_manager import create_session_manager, EdgeSessionManager
-from .edge_operator_agent import EdgeOperatorAgent
+
+if TYPE_CHECKING:
+    from .session_manager import create_session_manager, EdgeSessionManager
+    from .edge_operator_agent import EdgeOperatorAgent
+
+# Exports are imported on first access, so importing a light submodule such
+# as src.config or src.models does not load the agent, its model clients and
+# caches
+_LAZY_EXPORTS = {
+    "create_session_manager": ".session_manager",
+    "EdgeSessionManager": ".session_manager",
+    "EdgeOperatorAgent": ".edge_operator_agent",
+}
 
 __all__ = [
     "EdgeAgentConfig",
@@ -10,3 +24,11 @@ __all__ = [
     "EdgeSessionManager",
     "EdgeOperatorAgent",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a lazy export on first access."""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
@@ -10,8 +10,12 @@ Requirements:
 """
 
 import streamlit as st
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+import asyncio
+import atexit
 import tempfile
+import threading
 import os
 
 from .config import EdgeAgentConfig
@@ -23,9 +27,6 @@ def init_session_state():
     if "messages" not in st.session_state:
         st.session_state.messages = []
     
-    if "agent" not in st.session_state:
-        st.session_state.agent = None
-    
     if "model_mode" not in st.session_state:
         st.session_state.model_mode = "local"
     
@@ -34,25 +35,73 @@ def init_session_state():
     
     if "indexed_documents" not in st.session_state:
         st.session_state.indexed_documents = []
+    
+    if "index_jobs" not in st.session_state:
+        st.session_state.index_jobs = {}
+    
+    if "_index_pool" not in st.session_state:
+        st.session_state._index_pool = ThreadPoolExecutor(max_workers=1)
+
+
+@st.cache_resource
+def _build_agent(session_id: str, sessions_dir: str, db_path: str) -> EdgeOperatorAgent:
+    """Build and start an EdgeOperatorAgent shared across sessions and reruns.
+    
+    Cached by Streamlit on the config fields, so the model router and database
+    tools are initialized once per process instead of once per browser session.
+    Browser sessions on the same session ID share the agent, so calls into it
+    are made while holding _agent_lock() for that session ID.
+    
+    Args:
+        session_id: Conversation session identifier
+        sessions_dir: Directory for session data
+        db_path: Path to the SQLite telemetry database
+    
+    Returns:
+        EdgeOperatorAgent: The started agent instance
+    """
+    config = EdgeAgentConfig(
+        session_id=session_id,
+        sessions_dir=sessions_dir,
+        db_path=db_path
+    )
+    agent = EdgeOperatorAgent(config)
+    agent.__enter__()
+    
+    # Stop the MCP client when the Streamlit process shuts down
+    atexit.register(agent.__exit__, None, None, None)
+    
+    return agent
+
+
+@st.cache_resource
+def _agent_lock(session_id: str) -> threading.Lock:
+    """Lock serializing turns on the agent shared by a session ID.
+    
+    A strands Agent raises if it is invoked while another invocation is
+    running, so concurrent chats from several browser sessions wait for each
+    other.
+    
+    Args:
+        session_id: Conversation session identifier
+    
+    Returns:
+        threading.Lock: The lock for the session ID's agent
+    """
+    return threading.Lock()
 
 
 def get_agent() -> EdgeOperatorAgent:
     """Get or create the EdgeOperatorAgent instance.
     
     Returns:
-        EdgeOperatorAgent: The agent instance from session state
+        EdgeOperatorAgent: The cached agent instance for the current session ID
     """
-    if st.session_state.agent is None:
-        config = EdgeAgentConfig(
-            session_id=st.session_state.session_id,
-            sessions_dir="./edge_sessions",
-            db_path="./edge_telemetry.db",
-            vector_store_path="./edge_vector_store",
-            documents_dir="./edge_documents"
-        )
-        st.session_state.agent = EdgeOperatorAgent(config)
-    
-    return st.session_state.agent
+    return _build_agent(
+        session_id=st.session_state.session_id,
+        sessions_dir="./edge_sessions",
+        db_path="./edge_telemetry.db"
+    )
 
 
 def render_sidebar():
@@ -85,7 +134,8 @@ def render_sidebar():
         
         if new_mode != st.session_state.model_mode:
             agent = get_agent()
-            success, message = agent.set_model_mode(new_mode)
+            with _agent_lock(st.session_state.session_id):
+                success, message = agent.set_model_mode(new_mode)
             
             if success:
                 st.session_state.model_mode = new_mode
@@ -113,6 +163,34 @@ def render_sidebar():
         render_document_management()
 
 
+def _submit_index_job(
+    pool: ThreadPoolExecutor,
+    agent: EdgeOperatorAgent,
+    tmp_path: str
+) -> Future:
+    """Index an uploaded file on the pool and delete it once indexing ends.
+    
+    Args:
+        pool: Executor that runs indexing off the UI thread
+        agent: The EdgeOperatorAgent instance
+        tmp_path: Temporary copy of the uploaded file, owned by the job
+    
+    Returns:
+        Future: Resolves to the indexing result message
+    
+    Raises:
+        Exception: If the job cannot be started; the file is deleted first
+    """
+    try:
+        future = pool.submit(agent.doc_search.index_document, tmp_path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    # Clean up temp file once indexing finishes
+    future.add_done_callback(lambda _, path=tmp_path: os.unlink(path))
+    return future
+
+
 def render_document_management():
     """Render document management UI in sidebar.
     
@@ -128,8 +206,11 @@ def render_document_management():
         help="Upload technical documents, manuals, or guides for semantic search"
     )
     
-    if uploaded_file is not None:
-        # Save uploaded file temporarily and index it
+    if uploaded_file is not None and not (
+        uploaded_file.name in st.session_state.index_jobs
+        or uploaded_file.name in st.session_state.indexed_documents
+    ):
+        # Save uploaded file temporarily and index it off the UI thread
         with tempfile.NamedTemporaryFile(
             delete=False, 
             suffix=Path(uploaded_file.name).suffix
@@ -137,19 +218,32 @@ def render_document_management():
             tmp_file.write(uploaded_file.getvalue())
             tmp_path = tmp_file.name
         
+        agent = get_agent()
         try:
-            agent = get_agent()
-            result = agent.doc_search.index_document(tmp_path)
-            
-            if "Successfully" in result:
-                st.success(f"✅ Indexed: {uploaded_file.name}")
-                if uploaded_file.name not in st.session_state.indexed_documents:
-                    st.session_state.indexed_documents.append(uploaded_file.name)
-            else:
-                st.error(f"❌ {result}")
-        finally:
-            # Clean up temp file
-            os.unlink(tmp_path)
+            st.session_state.index_jobs[uploaded_file.name] = _submit_index_job(
+                st.session_state._index_pool, agent, tmp_path
+            )
+        except Exception as e:
+            st.error(f"❌ {e}")
+    
+    # Report indexing jobs; pending ones are polled again on the next rerun
+    for name, future in list(st.session_state.index_jobs.items()):
+        if not future.done():
+            st.status(f"Indexing {name}...", state="running")
+            continue
+        
+        del st.session_state.index_jobs[name]
+        try:
+            result = future.result()
+        except Exception as e:
+            result = str(e)
+        
+        if "Successfully" in result:
+            st.success(f"✅ Indexed: {name}")
+            if name not in st.session_state.indexed_documents:
+                st.session_state.indexed_documents.append(name)
+        else:
+            st.error(f"❌ {result}")
     
     # Display indexed documents list
     if st.session_state.indexed_documents:
@@ -160,6 +254,33 @@ def render_document_management():
         st.caption("No documents indexed yet")
 
 
+def stream_agent_response(agent: EdgeOperatorAgent, prompt: str):
+    """Generator that yields text chunks from the agent's streaming response.
+    
+    Drives the agent's async stream_chat generator on a private event loop
+    in the Streamlit script thread, so chunks can be consumed synchronously
+    by st.write_stream as soon as they are produced.
+    
+    Args:
+        agent: The EdgeOperatorAgent instance
+        prompt: The user's input message
+        
+    Yields:
+        Text chunks as they are generated by the agent
+    """
+    loop = asyncio.new_event_loop()
+    stream = agent.stream_chat(prompt)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(stream.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(stream.aclose())
+        loop.close()
+
+
 def render_chat_interface():
     """Render the main chat interface.
     
@@ -186,13 +307,12 @@ def render_chat_interface():
         with st.chat_message("user"):
             st.markdown(prompt)
         
-        # Get agent response
+        # Stream agent response as it is generated
         with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                agent = get_agent()
-                response = agent.chat(prompt)
-            
-            st.markdown(response)
+            agent = get_agent()
+            # Wait for any turn another browser session is running on the agent
+            with _agent_lock(st.session_state.session_id):
+                response = st.write_stream(stream_agent_response(agent, prompt))
         
         # Add assistant response to chat history
         st.session_state.messages.append({"role": "assistant", "content": response})
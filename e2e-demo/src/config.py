@@ -16,17 +16,33 @@ class EdgeAgentConfig:
         session_id: Unique identifier for the conversation session
         sessions_dir: Directory path for storing session data
         db_path: Path to the SQLite telemetry database
+        db_use_mcp: Whether telemetry queries go through the MCP SQLite server
+            instead of a direct connection
+        semantic_cache_enabled: Whether to answer near-duplicate prompts from cache
+        cache_db_path: Path to the SQLite semantic cache database
+        embedding_model: Ollama model used to embed prompts for the cache
+        cache_similarity_threshold: Minimum cosine similarity for a cache hit
+        cache_ttl_seconds: Maximum age of a cached response in seconds
         ollama_config: Configuration dict for local Ollama model
         bedrock_config: Configuration dict for AWS Bedrock model
     """
     session_id: str
     sessions_dir: str = "./sessions"
     db_path: str = "./telemetry.db"
+    db_use_mcp: bool = False
+    semantic_cache_enabled: bool = True
+    cache_db_path: str = "./semantic_cache.db"
+    embedding_model: str = "nomic-embed-text"
+    cache_similarity_threshold: float = 0.92
+    cache_ttl_seconds: int = 24 * 60 * 60
     ollama_config: Dict[str, Any] = field(default_factory=lambda: {
         "host": "http://localhost:11434",
         "model_id": "hoangquan456/qwen3-nothink:4b",
         "temperature": 0.7,
-        "keep_alive": "10m"
+        # Keep the model loaded indefinitely so queries never pay a cold load
+        "keep_alive": -1,
+        # num_gpu=99 offloads every layer to the GPU when one is present
+        "options": {"num_ctx": 4096, "num_gpu": 99}
     })
     bedrock_config: Dict[str, Any] = field(default_factory=lambda: {
         "model_id": "anthropic.claude-3-sonnet-20240229-v1:0",
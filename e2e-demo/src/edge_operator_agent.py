@@ -4,27 +4,108 @@ Provides a unified conversational interface combining IoT device control,
 structured data extraction, persistent sessions, and local database access.
 """
 
-from typing import Optional, List, Any
+from collections import OrderedDict
+from functools import cached_property
+from typing import TYPE_CHECKING, Optional, List, Any, Dict, Set, Tuple
 import logging
-
-from strands import Agent
+import re
+import threading
+import time
 
 from .config import EdgeAgentConfig
 from .model_router import ModelRouter
 from .session_manager import create_session_manager
-from .tools.iot_tools import read_sensor, control_device, list_devices
-from .tools.database_tools import DatabaseTools
-from .tools.scada_extraction_tools import extract_scada_metrics
+from .storage.semantic_cache import SemanticCache
+
+if TYPE_CHECKING:
+    from strands import Agent
+
+# strands and the tool modules are imported where first used rather than at
+# module import, so Streamlit reruns that hit a cached agent skip that cost.
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of responses kept in the per-agent exact-match cache
+EXACT_CACHE_SIZE = 512
+
+# Words that ask for live values, whose responses must never be cached
+_VOLATILE_RE = re.compile(r"\b(now|current|currently|latest|live)\b", re.IGNORECASE)
+
+# Tools whose results change between turns or that act on devices and the
+# database. A turn that calls any of them is never cached, since replaying it
+# would skip the reading, command or write it stands for.
+_UNCACHEABLE_TOOL_PREFIXES = ("control_device", "log_telemetry", "read_sensor", "query_")
+
+# Trivial requests that map 1:1 to a single tool call, keyed by tool name.
+# They are compiled once into a single alternation, so classifying a message
+# is one scan however many phrases are added; the matching branch is read
+# back from match.lastgroup.
+_INTENT_PATTERNS = (
+    ("list_devices", r"(?:list|show)(?:\s+me)?(?:\s+all)?(?:\s+the)?\s+(?:devices|sensors)"),
+    ("read_sensor", r"read(?:\s+the)?\s+(?P<device>[\w-]+?)(?:[\s-]+sensor)?"),
+)
+
+# Patterns must match the whole message, so anything with extra qualifiers
+# still reaches the LLM
+_INTENT_RE = re.compile(
+    r"^\s*(?:"
+    + "|".join(f"(?P<{name}>{pattern})" for name, pattern in _INTENT_PATTERNS)
+    + r")\s*[.?!]?\s*$",
+    re.IGNORECASE
+)
+
+
+def _classify(message: str) -> Optional[Tuple[str, Dict[str, str]]]:
+    """Map a trivial request directly to a tool call.
+    
+    Args:
+        message: The user's input message
+        
+    Returns:
+        Tuple of (tool_name, tool_arguments), or None if the message needs
+        the LLM
+    """
+    match = _INTENT_RE.match(message)
+    if match is None:
+        return None
+    
+    if match.lastgroup == "list_devices":
+        return "list_devices", {}
+    
+    if match.lastgroup == "read_sensor":
+        from .models.device_registry import get_default_registry
+        from .models.iot_devices import SensorDevice
+        registry = get_default_registry()
+        name = match.group("device").lower()
+        for device_id in (name, f"{name}-sensor"):
+            if isinstance(registry.get(device_id), SensorDevice):
+                return "read_sensor", {"device_id": device_id}
+    
+    return None
+
+
+def _record_tool_call(event: Any) -> None:
+    """Add a tool call to the set of tools used by the current turn.
+    
+    Registered on every agent for BeforeToolCallEvent. chat() and
+    stream_chat() pass a fresh "tools_used" set in the invocation state of
+    each turn; calls made outside a turn have no such set and are ignored.
+    
+    Args:
+        event: The BeforeToolCallEvent for the tool about to run
+    """
+    tools_used = event.invocation_state.get("tools_used")
+    if tools_used is not None:
+        tools_used.add(event.tool_use["name"])
+
+
 # System prompt for the Edge Operator Agent
 SYSTEM_PROMPT = """You are an Edge Operator Agent, an AI assistant designed to help field operators 
 manage industrial equipment and access information in manufacturing environments.
 
 Your capabilities include:
 1. **IoT Device Control**: Read sensor values and control actuators through natural language commands
-   - Use read_sensor to get current readings from sensors
+   - Use read_sensor to get current readings from sensors, or read_sensors_batch to read several at once
    - Use control_device to send commands to actuators
    - Use list_devices to see all available devices
 
@@ -32,7 +113,7 @@ Your capabilities include:
    - Use extract_scada_metrics to parse unstructured SCADA reports into structured data
 
 3. **Local Database Operations**: Store and query device telemetry data
-   - Use log_telemetry to record device readings
+   - Use log_telemetry to record a device reading, or log_telemetry_batch for several at once
    - Use query_telemetry to retrieve historical data with filters
    - Use query_telemetry_aggregation for statistical analysis (AVG, MIN, MAX, COUNT)
 
@@ -46,7 +127,6 @@ When responding:
 You operate locally on edge devices and can function fully offline using local models.
 When cloud connectivity is available, you can switch to more powerful cloud models."""
 
-
 class EdgeOperatorAgent:
     """Unified edge operator agent combining all capabilities.
     
@@ -57,7 +137,8 @@ class EdgeOperatorAgent:
         config: Configuration for the agent
         model_router: Routes inference to local or cloud models
         session_manager: Manages conversation persistence
-        db_tools: Database tools for telemetry storage via MCP
+        db_tools: Database tools for telemetry storage (SQLite, optionally via MCP)
+        semantic_cache: Cache of responses for near-duplicate prompts (optional)
         
     Requirements:
         - 3.1: Persist conversation state to local filesystem immediately
@@ -80,6 +161,11 @@ class EdgeOperatorAgent:
             ollama_config=config.ollama_config,
             bedrock_config=config.bedrock_config
         )
+        # Probe cloud connectivity in the background so the first switch
+        # to cloud mode does not block on the network
+        self.model_router.prewarm_connectivity()
+        # Load the local model now rather than on the first query
+        self.model_router.warmup()
         
         # Initialize session manager for conversation persistence
         # This creates the storage directory if it doesn't exist (Req 3.4)
@@ -88,11 +174,37 @@ class EdgeOperatorAgent:
             storage_dir=config.sessions_dir
         )
         
-        # Initialize database tools for telemetry storage via MCP (Req 4.1, 4.2)
-        self.db_tools = DatabaseTools(db_path=config.db_path)
+        # Initialize database tools for telemetry storage (Req 4.1, 4.2)
+        from .tools.database_tools import DatabaseTools
+        self.db_tools = DatabaseTools(
+            db_path=config.db_path,
+            use_mcp=config.db_use_mcp
+        )
+        
+        # Exact-match LRU of (session_id, prompt) -> (response, expiry time),
+        # checked before the semantic cache since it costs no embedding call.
+        # Entries expire after the same TTL as the semantic cache.
+        self._exact_cache: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+        self._exact_cache_lock = threading.Lock()
+        
+        # Semantic cache answers near-duplicate prompts without the LLM
+        self.semantic_cache: Optional[SemanticCache] = None
+        if config.semantic_cache_enabled:
+            self.semantic_cache = SemanticCache(
+                db_path=config.cache_db_path,
+                session_id=config.session_id,
+                embedding_model=config.embedding_model,
+                host=config.ollama_config.get("host", "http://localhost:11434"),
+                similarity_threshold=config.cache_similarity_threshold,
+                ttl_seconds=config.cache_ttl_seconds,
+                client=self.model_router.ollama_client
+            )
         
-        # Agent instance (created lazily)
-        self._agent: Optional[Agent] = None
+        # Tools registered at runtime on top of the built-in tool set
+        self._extra_tools: List[Any] = []
+        
+        # Agent instance, created lazily
+        self._agent: Optional["Agent"] = None
         
         # Track if we're using database tools context manager
         self._db_context_active = False
@@ -101,23 +213,16 @@ class EdgeOperatorAgent:
             f"EdgeOperatorAgent initialized with session '{config.session_id}'"
         )
     
-    def _get_tools(self) -> List[Any]:
-        """Get the list of tools available to the agent.
+    @cached_property
+    def _tools(self) -> Tuple[Any, ...]:
+        """Memoized tool set, invalidated only when add_tools() changes it."""
+        from .tools.iot_tools import read_sensor, read_sensors_batch, control_device, list_devices
+        from .tools.scada_extraction_tools import extract_scada_metrics
         
-        Combines all tool categories:
-        - IoT tools: read_sensor, control_device, list_devices
-        - SCADA extraction: extract_scada_metrics
-        - Database tools: log_telemetry, query_telemetry, query_telemetry_aggregation
-        
-        Returns:
-            List of tool functions for the agent to use
-            
-        Requirements:
-            - 6.1: Initialize all tools and make them available
-        """
         tools = [
             # IoT device control tools (Req 1.1, 1.2, 1.3)
             read_sensor,
+            read_sensors_batch,
             control_device,
             list_devices,
             # SCADA structured extraction tool (Req 2.1, 2.2)
@@ -127,9 +232,57 @@ class EdgeOperatorAgent:
         # Add database tools (Req 4.1, 4.2, 4.3, 4.4)
         tools.extend(self.db_tools.get_tools())
         
-        return tools
+        # Tools registered at runtime via add_tools()
+        tools.extend(self._extra_tools)
+        
+        return tuple(tools)
+    
+    def _get_tools(self) -> List[Any]:
+        """Get the list of tools available to the agent.
+        
+        Combines all tool categories:
+        - IoT tools: read_sensor, read_sensors_batch, control_device, list_devices
+        - SCADA extraction: extract_scada_metrics
+        - Database tools: log_telemetry, log_telemetry_batch, query_telemetry,
+          query_telemetry_aggregation
+        - Any tools registered at runtime with add_tools()
+        
+        Returns:
+            List of tool functions for the agent to use
+        
+        Requirements:
+            - 6.1: Initialize all tools and make them available
+        """
+        return list(self._tools)
+    
+    def add_tools(self, *tools: Any) -> None:
+        """Register additional tools at runtime.
+        
+        The tools are added to the running agent in place instead of
+        rebuilding it, so its in-memory conversation is preserved.
+        
+        Args:
+            *tools: Tool functions to make available to the agent
+        """
+        self._extra_tools.extend(tools)
+        self.__dict__.pop("_tools", None)
+        self._refresh_tools()
+    
+    def _refresh_tools(self) -> None:
+        """Register any tools the running agent does not have yet."""
+        if self._agent is None:
+            return
+        
+        registered = set(self._agent.tool_names)
+        new_tools = [
+            tool for tool in self._get_tools()
+            if getattr(tool, "tool_name", None) not in registered
+        ]
+        if new_tools:
+            self._agent.tool_registry.process_tools(new_tools)
+            logger.info(f"Added {len(new_tools)} tools to the running agent")
     
-    def _create_agent(self, agent_id: str = "default") -> Agent:
+    def _create_agent(self, agent_id: str = "default") -> "Agent":
         """Create or recreate the agent with current model and session.
         
         Creates a new Agent instance with the current model from the
@@ -148,15 +301,25 @@ class EdgeOperatorAgent:
             - 6.1: All tools (IoT, database) initialized and available
             - 6.2: Agent determines appropriate tools based on intent
         """
+        from strands import Agent
+        from strands.hooks import BeforeToolCallEvent
+        from strands.tools.executors import ConcurrentToolExecutor
+        
         tools = self._get_tools()
         
+        # ConcurrentToolExecutor is already the strands default; it is passed
+        # explicitly to pin that behaviour: independent tool calls planned in
+        # the same turn run concurrently, so a turn takes as long as its
+        # slowest tool rather than the sum (Req 6.3)
         agent = Agent(
             model=self.model_router.get_model(),
             tools=tools,
             session_manager=self.session_manager,
             system_prompt=SYSTEM_PROMPT,
-            agent_id=agent_id
+            agent_id=agent_id,
+            tool_executor=ConcurrentToolExecutor()
         )
+        agent.hooks.add_callback(BeforeToolCallEvent, _record_tool_call)
         
         logger.info(
             f"Agent created with {len(tools)} tools in "
@@ -166,11 +329,13 @@ class EdgeOperatorAgent:
         return agent
     
     @property
-    def agent(self) -> Agent:
+    def agent(self) -> "Agent":
         """Get or create the agent instance.
         
         Lazily creates the agent on first access, ensuring all
-        components are properly initialized.
+        components are properly initialized. The agent is built once and
+        reused across turns, so every turn sends the same system prompt
+        prefix and Ollama can reuse its KV cache while the model stays loaded.
         
         Returns:
             Agent: The active agent instance
@@ -224,6 +389,153 @@ class EdgeOperatorAgent:
             logger.warning(error_msg)
             return False, error_msg
     
+    def _is_cacheable(self, message: str) -> bool:
+        """Check whether a response to this message may be served from cache.
+        
+        Messages asking for live values ("now", "current", ...) or naming a
+        registered device must always reach the devices, so they are never
+        cached. This only screens the message; _cache_response() also
+        refuses turns whose tool calls must run every time.
+        
+        Args:
+            message: The user's input message
+            
+        Returns:
+            True if the message's response may be cached
+        """
+        if _VOLATILE_RE.search(message):
+            return False
+        from .models.device_registry import get_default_registry
+        lowered = message.lower()
+        return not any(
+            device_id in lowered for device_id in get_default_registry().list_device_ids()
+        )
+    
+    def _check_exact_cache(self, message: str) -> Optional[str]:
+        """Look up a message in the exact-match tier, dropping it if expired."""
+        key = (self.config.session_id, message.strip())
+        with self._exact_cache_lock:
+            entry = self._exact_cache.get(key)
+            if entry is None:
+                return None
+            response, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._exact_cache[key]
+                return None
+            self._exact_cache.move_to_end(key)
+        return response
+    
+    def _check_cache(self, message: str) -> Tuple[Optional[List[float]], Optional[str]]:
+        """Look up a message in the response caches.
+        
+        Checks the exact-match tier first, then the semantic cache.
+        
+        Args:
+            message: The user's input message
+            
+        Returns:
+            Tuple of (embedding, cached_response). The embedding is None if the
+            message is not cacheable, the semantic cache is disabled, or the
+            embedding model is unavailable; the cached response is None on a
+            cache miss.
+        """
+        if not self._is_cacheable(message):
+            return None, None
+        cached = self._check_exact_cache(message)
+        if cached is not None or self.semantic_cache is None:
+            return None, cached
+        try:
+            embedding = self.semantic_cache.embed(message)
+            return embedding, self.semantic_cache.lookup(embedding)
+        except Exception as e:
+            logger.warning(f"Semantic cache unavailable: {e}")
+            return None, None
+    
+    async def _check_cache_async(
+        self,
+        message: str
+    ) -> Tuple[Optional[List[float]], Optional[str]]:
+        """Async variant of _check_cache that batches concurrent embeddings."""
+        if not self._is_cacheable(message):
+            return None, None
+        cached = self._check_exact_cache(message)
+        if cached is not None or self.semantic_cache is None:
+            return None, cached
+        try:
+            embedding = await self.semantic_cache.embed_async(message)
+            return embedding, self.semantic_cache.lookup(embedding)
+        except Exception as e:
+            logger.warning(f"Semantic cache unavailable: {e}")
+            return None, None
+    
+    def _cache_response(
+        self,
+        message: str,
+        embedding: Optional[List[float]],
+        response: str,
+        tools_used: Set[str]
+    ) -> None:
+        """Store a response in the response caches, ignoring cache errors.
+        
+        Args:
+            message: The user's input message
+            embedding: Embedding of the message, or None to skip the
+                semantic cache
+            response: The agent's response to the message
+            tools_used: Names of the tools the agent called for this turn;
+                turns that read sensors, control devices or touch the
+                database are not cached
+        """
+        if not response or not self._is_cacheable(message):
+            return
+        if any(name.startswith(_UNCACHEABLE_TOOL_PREFIXES) for name in tools_used):
+            logger.debug(f"Not caching turn that called {sorted(tools_used)}")
+            return
+        
+        key = (self.config.session_id, message.strip())
+        expires_at = time.monotonic() + self.config.cache_ttl_seconds
+        with self._exact_cache_lock:
+            self._exact_cache[key] = (response, expires_at)
+            self._exact_cache.move_to_end(key)
+            if len(self._exact_cache) > EXACT_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
+        
+        if embedding is None:
+            return
+        try:
+            self.semantic_cache.add(embedding, response)
+        except Exception as e:
+            logger.warning(f"Failed to cache response: {e}")
+    
+    def _fast_path(self, message: str) -> Optional[str]:
+        """Answer trivial requests by calling their tool directly.
+        
+        Skips LLM generation for requests such as "list devices" or "read
+        temp sensor". The tool call is recorded in the agent's history, so
+        the session stays coherent for later turns.
+        
+        Args:
+            message: The user's input message
+            
+        Returns:
+            The tool output, or None if the message needs the LLM
+        """
+        intent = _classify(message)
+        if intent is None:
+            return None
+        
+        tool_name, arguments = intent
+        try:
+            result = getattr(self.agent.tool, tool_name)(**arguments)
+        except Exception as e:
+            logger.warning(f"Fast path for {tool_name} failed: {e}")
+            return None
+        
+        logger.debug(f"Answered '{message}' directly with {tool_name}")
+        return "".join(
+            block.get("text", "") for block in result.get("content", [])
+        )
+    
     def chat(self, message: str) -> str:
         """Process a user message and return the response.
         
@@ -232,10 +544,17 @@ class EdgeOperatorAgent:
         the request. The conversation is automatically persisted by the
         session manager after each interaction.
         
+        Trivial requests that map to a single tool call are answered by that
+        tool directly. Repeated prompts are answered from an exact-match cache
+        and near-duplicates from the semantic cache when enabled, bypassing
+        the LLM entirely. Prompts asking for live device values, and turns
+        that read sensors, control devices or touch the database, are never
+        cached.
+        
         The agent handles tool orchestration internally:
         - Analyzes the user's intent from the message
         - Selects appropriate tools (IoT, database, SCADA)
-        - Executes tools in sequence when multiple are needed
+        - Executes independent tool calls from the same turn concurrently
         - Synthesizes tool outputs into a coherent response
         
         Args:
@@ -248,17 +567,31 @@ class EdgeOperatorAgent:
         Requirements:
             - 3.1: Conversation persisted immediately after processing
             - 6.2: Agent determines appropriate tools based on intent
-            - 6.3: Agent orchestrates multiple tools in sequence when needed
+            - 6.3: Agent orchestrates multiple tools when needed, running
+              independent calls concurrently
             - 6.4: Coherent natural language response synthesizing tool outputs
             - 6.5: Handle errors gracefully and inform the operator
         """
+        direct = self._fast_path(message)
+        if direct is not None:
+            return direct
+        
+        embedding, cached = self._check_cache(message)
+        if cached is not None:
+            return cached
+        
+        tools_used: Set[str] = set()
         try:
-            response = self.agent(message)
-            return str(response)
+            response = str(self.agent(
+                message, invocation_state={"tools_used": tools_used}
+            ))
         except Exception as e:
             # Handle errors gracefully (Req 6.5)
             logger.error(f"Error processing message: {e}")
             return f"I encountered an error processing your request: {str(e)}"
+        
+        self._cache_response(message, embedding, response, tools_used)
+        return response
     
     async def stream_chat(self, message: str):
         """Process a user message and stream the response.
@@ -276,16 +609,34 @@ class EdgeOperatorAgent:
             - 6.4: Provide coherent natural language response display
             - 6.5: Handle errors gracefully and inform the operator
         """
+        direct = self._fast_path(message)
+        if direct is not None:
+            yield direct
+            return
+        
+        embedding, cached = await self._check_cache_async(message)
+        if cached is not None:
+            yield cached
+            return
+        
+        chunks = []
+        tools_used: Set[str] = set()
         try:
-            async for event in self.agent.stream_async(message):
+            async for event in self.agent.stream_async(
+                message, invocation_state={"tools_used": tools_used}
+            ):
                 # TextStreamEvent stores text in 'data' key
                 if isinstance(event, dict) and 'data' in event:
                     text = event.get('data')
                     if isinstance(text, str) and text:
+                        chunks.append(text)
                         yield text
         except Exception as e:
             logger.error(f"Error streaming message: {e}")
             yield f"I encountered an error processing your request: {str(e)}"
+            return
+        
+        self._cache_response(message, embedding, "".join(chunks), tools_used)
     
     @property
     def current_mode(self) -> str:
@@ -297,12 +648,14 @@ class EdgeOperatorAgent:
         return self.model_router.mode
     
     def __enter__(self):
-        """Enter the context manager, starting the MCP client for database tools."""
+        """Enter the context manager, opening the database tools."""
         self.db_tools.__enter__()
         self._db_context_active = True
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Exit the context manager, stopping the MCP client."""
+        """Exit the context manager, closing the caches and database tools."""
         self._db_context_active = False
+        if self.semantic_cache is not None:
+            self.semantic_cache.close()
         return self.db_tools.__exit__(exc_type, exc_val, exc_tb)
@@ -4,11 +4,18 @@ Provides dynamic switching between local (Ollama) and cloud (Bedrock) model prov
 Supports lazy-loading of cloud models and connectivity checking.
 """
 
-from typing import Literal, Dict, Any, Union
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import TYPE_CHECKING, Literal, Dict, Any, Optional, Tuple, Union
 import socket
 import logging
+import threading
+import time
 
-from strands.models.ollama import OllamaModel
+import httpx
+import ollama
+
+if TYPE_CHECKING:
+    from strands.models.ollama import OllamaModel
 
 logger = logging.getLogger(__name__)
 
@@ -25,11 +32,21 @@ class ModelRouter:
     
     Attributes:
         ollama_model: The local Ollama model instance
+        ollama_client: Shared synchronous Ollama client with a keep-alive
+            connection pool, for non-chat traffic such as embeddings
         bedrock_model: The cloud Bedrock model instance (lazy-loaded)
         current_mode: Current routing mode ("local" or "cloud")
         bedrock_config: Configuration dict for Bedrock model initialization
     """
     
+    # Idle keep-alive connections kept open to the local Ollama server
+    OLLAMA_KEEPALIVE_CONNECTIONS = 16
+    
+    # Seconds a connectivity check result is reused before probing again
+    CONNECTIVITY_TTL = 30.0
+    # Seconds to wait for the connectivity probe before assuming offline
+    CONNECTIVITY_TIMEOUT = 2.0
+    
     def __init__(
         self,
         ollama_config: Dict[str, Any],
@@ -39,16 +56,35 @@ class ModelRouter:
         
         Args:
             ollama_config: Configuration dict for OllamaModel.
-                Expected keys: host, model_id, temperature, keep_alive
+                Expected keys: host, model_id, temperature, keep_alive, options
             bedrock_config: Configuration dict for BedrockModel.
                 Expected keys: model_id, region_name
         """
+        # Imported here so Streamlit reruns that reuse a cached router
+        # don't pay for the strands model stack at module import time
+        from strands.models.ollama import OllamaModel
+        
+        host = ollama_config.get("host", "http://localhost:11434")
+        
         # Initialize local Ollama model immediately
         self.ollama_model = OllamaModel(
-            host=ollama_config.get("host", "http://localhost:11434"),
+            host=host,
             model_id=ollama_config.get("model_id", "llama3.1"),
             temperature=ollama_config.get("temperature"),
-            keep_alive=ollama_config.get("keep_alive", "10m")
+            keep_alive=ollama_config.get("keep_alive", "10m"),
+            options=ollama_config.get("options")
+        )
+        
+        # One pooled client for all synchronous Ollama traffic so each request
+        # reuses an open connection instead of a fresh TCP handshake. The
+        # OllamaModel builds its own async client per event loop, since async
+        # connection pools cannot be shared across loops.
+        self.ollama_client = ollama.Client(
+            host=host,
+            timeout=60,
+            limits=httpx.Limits(
+                max_keepalive_connections=self.OLLAMA_KEEPALIVE_CONNECTIONS
+            )
         )
         
         # Store Bedrock config for lazy initialization
@@ -57,8 +93,18 @@ class ModelRouter:
         
         # Default to local mode for offline-first operation (Requirement 8.7)
         self.current_mode: ModelMode = "local"
+        
+        # Cached (checked_at, available) connectivity result; the probe runs
+        # on a background thread so the caller never blocks on DNS/TCP
+        self._conn_cache: Tuple[float, bool] = (float("-inf"), False)
+        self._conn_lock = threading.Lock()
+        self._probe_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="connectivity-probe"
+        )
+        self._probe_future: Optional[Future] = None
 
-    def get_model(self) -> Union[OllamaModel, Any]:
+    def get_model(self) -> Union["OllamaModel", Any]:
         """Returns the currently active model based on the current mode.
         
         Returns:
@@ -133,14 +179,63 @@ class ModelRouter:
         logger.error(f"Invalid mode: {mode}")
         return False
     
-    def _check_connectivity(self) -> bool:
-        """Check if cloud connectivity is available.
+    def prewarm_connectivity(self) -> None:
+        """Start a background connectivity check without waiting for it.
+        
+        Called at startup so the result is usually cached by the time the
+        operator first selects cloud mode.
+        """
+        self._start_probe()
+    
+    def warmup(self) -> threading.Thread:
+        """Load the local model into memory on a background thread.
         
-        Performs a simple socket connection test to verify network access
-        to AWS services.
+        Sends an empty prompt, which makes Ollama load the model without
+        generating, so the operator's first query does not pay the model
+        load. Uses the same keep_alive and options as inference so Ollama
+        does not reload the model with different settings later.
         
         Returns:
-            True if connectivity is available, False otherwise
+            The started warmup thread
+        """
+        thread = threading.Thread(
+            target=self._warmup,
+            name="ollama-warmup",
+            daemon=True
+        )
+        thread.start()
+        return thread
+    
+    def _warmup(self) -> None:
+        """Issue the warmup request, logging instead of raising on failure."""
+        config = self.ollama_model.get_config()
+        try:
+            self.ollama_client.generate(
+                model=config["model_id"],
+                prompt="",
+                keep_alive=config.get("keep_alive"),
+                options=config.get("options")
+            )
+            logger.info(f"Local model '{config['model_id']}' loaded")
+        except Exception as e:
+            logger.warning(f"Local model warmup failed: {e}")
+    
+    def _start_probe(self) -> Future:
+        """Submit a connectivity probe unless one is already in flight.
+        
+        Returns:
+            The Future of the running probe
+        """
+        with self._conn_lock:
+            if self._probe_future is None or self._probe_future.done():
+                self._probe_future = self._probe_executor.submit(self._probe)
+            return self._probe_future
+    
+    def _probe(self) -> bool:
+        """Open a TCP connection to the Bedrock endpoint and cache the result.
+        
+        Returns:
+            True if the endpoint is reachable, False otherwise
         """
         try:
             # Try to connect to AWS Bedrock endpoint
@@ -148,10 +243,36 @@ class ModelRouter:
             region = self.bedrock_config.get("region_name", "us-east-1")
             host = f"bedrock-runtime.{region}.amazonaws.com"
             
-            socket.create_connection((host, 443), timeout=5)
-            return True
+            with socket.create_connection(
+                (host, 443),
+                timeout=self.CONNECTIVITY_TIMEOUT
+            ):
+                available = True
         except (socket.timeout, socket.error, OSError) as e:
             logger.debug(f"Connectivity check failed: {e}")
+            available = False
+        
+        self._conn_cache = (time.monotonic(), available)
+        return available
+    
+    def _check_connectivity(self) -> bool:
+        """Check if cloud connectivity is available.
+        
+        Returns a cached result if it is younger than CONNECTIVITY_TTL.
+        Otherwise runs (or joins) a background probe and waits at most
+        CONNECTIVITY_TIMEOUT seconds for it.
+        
+        Returns:
+            True if connectivity is available, False otherwise
+        """
+        checked_at, available = self._conn_cache
+        if time.monotonic() - checked_at < self.CONNECTIVITY_TTL:
+            return available
+        
+        try:
+            return self._start_probe().result(timeout=self.CONNECTIVITY_TIMEOUT)
+        except TimeoutError:
+            logger.debug("Connectivity check timed out")
             return False
     
     @property
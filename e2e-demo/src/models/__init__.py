@@ -1,7 +1,7 @@
 """Data models for IoT devices and SCADA/MES data."""
 
 from .iot_devices import IoTDevice, SensorDevice, ActuatorDevice
-from .device_registry import DeviceRegistry, create_default_registry, default_registry
+from .device_registry import DeviceRegistry, create_default_registry, get_default_registry
 from .scada_models import SensorReading, AlarmInfo, EquipmentStatus, ProductionMetrics
 
 __all__ = [
@@ -12,7 +12,7 @@ __all__ = [
     # Device registry
     "DeviceRegistry",
     "create_default_registry",
-    "default_registry",
+    "get_default_registry",
     # SCADA/MES models
     "SensorReading",
     "AlarmInfo",
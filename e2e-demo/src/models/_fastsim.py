@@ -0,0 +1,72 @@
+"""Compiled kernels for high-rate sensor simulation.
+
+Generates many simulated readings at once for telemetry replays and load
+tests. When numba is installed the sampling loops are JIT-compiled, and
+fleet batches are spread across cores; otherwise equivalent vectorized NumPy
+code is used.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+# Generator for the NumPy fallback; numba kernels use numba's own RNG state
+_rng = np.random.default_rng()
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _simulate_sensor(min_v, max_v, out):
+        span = max_v - min_v
+        for i in range(out.shape[0]):
+            out[i] = round((min_v + np.random.random() * span) * 100.0) / 100.0
+    
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _simulate_fleet(lows, highs, out):
+        for s in prange(out.shape[0]):
+            span = highs[s] - lows[s]
+            for i in range(out.shape[1]):
+                out[s, i] = round((lows[s] + np.random.random() * span) * 100.0) / 100.0
+
+
+def simulate_sensor(min_value: float, max_value: float, n: int) -> np.ndarray:
+    """Simulate n readings of one sensor.
+    
+    Args:
+        min_value: Minimum reading value
+        max_value: Maximum reading value
+        n: Number of readings to generate
+    
+    Returns:
+        float32 array of n readings rounded to 2 decimals
+    """
+    if njit is None:
+        return _rng.uniform(min_value, max_value, size=n).round(2).astype(np.float32)
+    out = np.empty(n, dtype=np.float32)
+    _simulate_sensor(float(min_value), float(max_value), out)
+    return out
+
+
+def simulate_fleet(lows: np.ndarray, highs: np.ndarray, n: int) -> np.ndarray:
+    """Simulate n readings for each of several sensors.
+    
+    Args:
+        lows: Minimum reading value per sensor
+        highs: Maximum reading value per sensor
+        n: Number of readings to generate per sensor
+    
+    Returns:
+        float32 array of shape (sensors, n) rounded to 2 decimals
+    """
+    lows = np.asarray(lows, dtype=np.float64)
+    highs = np.asarray(highs, dtype=np.float64)
+    if njit is None:
+        samples = _rng.uniform(lows[:, None], highs[:, None], size=(len(lows), n))
+        return samples.round(2).astype(np.float32)
+    out = np.empty((len(lows), n), dtype=np.float32)
+    _simulate_fleet(lows, highs, out)
+    return out
@@ -4,22 +4,54 @@ Provides a registry of available IoT devices with sample devices
 for temperature sensing, humidity sensing, and valve control.
 """
 
+from functools import lru_cache
 from typing import Dict, Optional, List, Union
-from .iot_devices import IoTDevice, SensorDevice, ActuatorDevice
+
+import numpy as np
+
+from .iot_devices import IoTDevice, SensorDevice, ActuatorDevice, read_sensors
 
 
 class DeviceRegistry:
     """Registry for managing IoT devices.
     
-    Provides methods to register, retrieve, and list devices.
+    Provides methods to register, retrieve, and list devices. Sensors and
+    actuators are also indexed by kind at registration, so listing them
+    needs no type checks.
     """
     
     def __init__(self):
         self._devices: Dict[str, Union[SensorDevice, ActuatorDevice]] = {}
+        self._sensors: Dict[str, SensorDevice] = {}
+        self._actuators: Dict[str, ActuatorDevice] = {}
+        # Comma-separated device IDs for error messages, rebuilt on demand
+        self._available_ids_str: Optional[str] = None
     
     def register(self, device: Union[SensorDevice, ActuatorDevice]) -> None:
-        """Register a device in the registry."""
+        """Register a device in the registry, replacing any with the same ID."""
+        self.unregister(device.device_id)
         self._devices[device.device_id] = device
+        self._available_ids_str = None
+        if isinstance(device, SensorDevice):
+            self._sensors[device.device_id] = device
+        elif isinstance(device, ActuatorDevice):
+            self._actuators[device.device_id] = device
+    
+    def unregister(self, device_id: str) -> Optional[Union[SensorDevice, ActuatorDevice]]:
+        """Remove a device from the registry.
+        
+        Args:
+            device_id: ID of the device to remove
+            
+        Returns:
+            The removed device, or None if it was not registered
+        """
+        self._sensors.pop(device_id, None)
+        self._actuators.pop(device_id, None)
+        device = self._devices.pop(device_id, None)
+        if device is not None:
+            self._available_ids_str = None
+        return device
     
     def get(self, device_id: str) -> Optional[Union[SensorDevice, ActuatorDevice]]:
         """Get a device by ID, returns None if not found."""
@@ -33,13 +65,55 @@ class DeviceRegistry:
         """Return list of all device IDs."""
         return list(self._devices.keys())
     
+    def available_ids_str(self) -> str:
+        """Return all device IDs joined with commas, cached until devices change."""
+        if self._available_ids_str is None:
+            self._available_ids_str = ", ".join(self._devices)
+        return self._available_ids_str
+    
     def get_sensors(self) -> List[SensorDevice]:
         """Return list of all sensor devices."""
-        return [d for d in self._devices.values() if isinstance(d, SensorDevice)]
+        return list(self._sensors.values())
     
     def get_actuators(self) -> List[ActuatorDevice]:
         """Return list of all actuator devices."""
-        return [d for d in self._devices.values() if isinstance(d, ActuatorDevice)]
+        return list(self._actuators.values())
+    
+    def read_all_sensors(self) -> Dict[str, float]:
+        """Read every registered sensor with one vectorized call.
+        
+        Returns:
+            Mapping of sensor device ID to its current reading
+        """
+        sensors = self.get_sensors()
+        if not sensors:
+            return {}
+        values = read_sensors(sensors)
+        return dict(zip((s.device_id for s in sensors), values.tolist()))
+    
+    def simulate_all_sensors(self, n: int) -> Dict[str, np.ndarray]:
+        """Generate n simulated readings for every registered sensor.
+        
+        The whole fleet is sampled in one batch, in parallel across cores
+        when numba is installed.
+        
+        Args:
+            n: Number of readings to generate per sensor
+            
+        Returns:
+            Mapping of sensor device ID to a float32 array of readings
+        """
+        sensors = self.get_sensors()
+        if not sensors:
+            return {}
+        # Imported here: loading numba takes seconds and only simulation needs it
+        from . import _fastsim
+        samples = _fastsim.simulate_fleet(
+            [s.min_value for s in sensors],
+            [s.max_value for s in sensors],
+            n
+        )
+        return {s.device_id: row for s, row in zip(sensors, samples)}
 
 
 def create_default_registry() -> DeviceRegistry:
@@ -88,5 +162,11 @@ def create_default_registry() -> DeviceRegistry:
     return registry
 
 
-# Global default registry instance
-default_registry = create_default_registry()
+@lru_cache(maxsize=1)
+def get_default_registry() -> DeviceRegistry:
+    """Return the shared default registry, creating it on first use.
+    
+    Returns:
+        DeviceRegistry populated with sample IoT devices
+    """
+    return create_default_registry()
@@ -5,28 +5,43 @@ including sensors (temperature, humidity, etc.) and actuators (valves, motors, e
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, Any, List, Literal, Optional
+from types import MappingProxyType
+from typing import Any, FrozenSet, Literal, Mapping, Sequence, Tuple
 import random
 from datetime import datetime
 
+import numpy as np
 
-@dataclass
+# Shared generator for vectorized sensor simulation
+_rng = np.random.default_rng()
+
+
+@dataclass(slots=True)
 class IoTDevice:
     """Base class for all IoT devices.
     
+    Devices use slots rather than a per-instance __dict__, which keeps large
+    simulated fleets small in memory.
+    
     Attributes:
         device_id: Unique identifier for the device
         device_type: Type of device - either "sensor" or "actuator"
         location: Physical location of the device
-        metadata: Additional device-specific information
+        metadata: Additional device-specific information (read-only)
     """
     device_id: str
     device_type: Literal["sensor", "actuator"]
     location: str
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata: Mapping[str, Any] = field(default_factory=dict)
+    
+    def __post_init__(self):
+        # Metadata is fixed once registered; a read-only view lets devices
+        # safely share it
+        if not isinstance(self.metadata, MappingProxyType):
+            self.metadata = MappingProxyType(dict(self.metadata))
 
 
-@dataclass
+@dataclass(slots=True)
 class SensorDevice(IoTDevice):
     """Sensor device that reads environmental or process values.
     
@@ -40,26 +55,79 @@ class SensorDevice(IoTDevice):
     max_value: float = 100.0
     
     def __post_init__(self):
+        # dataclass(slots=True) rebuilds the class, so zero-argument super()
+        # would point at the discarded original
+        IoTDevice.__post_init__(self)
         self.device_type = "sensor"
     
     def read(self) -> float:
         """Simulate reading a sensor value within the valid range."""
         return round(random.uniform(self.min_value, self.max_value), 2)
+    
+    def read_batch(self, n: int) -> np.ndarray:
+        """Simulate n consecutive readings in a single vectorized call.
+        
+        Args:
+            n: Number of readings to generate
+            
+        Returns:
+            Array of n values within the valid range, rounded to 2 decimals
+        """
+        return _rng.uniform(self.min_value, self.max_value, size=n).round(2)
+    
+    def simulate(self, n: int) -> np.ndarray:
+        """Generate n simulated readings for high-rate telemetry replays.
+        
+        Uses the compiled kernel when numba is installed.
+        
+        Args:
+            n: Number of readings to generate
+            
+        Returns:
+            float32 array of n readings within the valid range
+        """
+        # Imported here: loading numba takes seconds and only simulation needs it
+        from . import _fastsim
+        return _fastsim.simulate_sensor(self.min_value, self.max_value, n)
 
 
-@dataclass
+def read_sensors(sensors: Sequence[SensorDevice]) -> np.ndarray:
+    """Simulate one reading from each sensor in a single vectorized call.
+    
+    Args:
+        sensors: Sensors to read
+        
+    Returns:
+        Array of readings in the same order as sensors, rounded to 2 decimals
+    """
+    count = len(sensors)
+    lows = np.fromiter((s.min_value for s in sensors), dtype=float, count=count)
+    highs = np.fromiter((s.max_value for s in sensors), dtype=float, count=count)
+    return _rng.uniform(lows, highs).round(2)
+
+
+@dataclass(slots=True)
 class ActuatorDevice(IoTDevice):
     """Actuator device that can be controlled to change state.
     
     Attributes:
-        states: List of valid states the actuator can be in
+        states: Valid states the actuator can be in, in display order
         current_state: The current state of the actuator
     """
-    states: List[str] = field(default_factory=list)
+    states: Tuple[str, ...] = ()
     current_state: str = ""
+    _states_set: FrozenSet[str] = field(
+        init=False, repr=False, compare=False, default=frozenset()
+    )
+    _states_str: str = field(init=False, repr=False, compare=False, default="")
     
     def __post_init__(self):
+        IoTDevice.__post_init__(self)
         self.device_type = "actuator"
+        # Accept any sequence of states; the frozenset gives O(1) validation
+        self.states = tuple(self.states)
+        self._states_set = frozenset(self.states)
+        self._states_str = ", ".join(self.states)
         if self.states and not self.current_state:
             self.current_state = self.states[0]
     
@@ -72,11 +140,24 @@ class ActuatorDevice(IoTDevice):
         Returns:
             True if state was changed, False if invalid state
         """
-        if new_state in self.states:
+        if new_state in self._states_set:
             self.current_state = new_state
             return True
         return False
     
-    def get_valid_actions(self) -> List[str]:
-        """Return list of valid actions/states for this actuator."""
-        return self.states.copy()
+    @property
+    def valid_actions_set(self) -> FrozenSet[str]:
+        """Valid actions/states as a frozenset, built at construction."""
+        return self._states_set
+    
+    @property
+    def valid_actions_str(self) -> str:
+        """Valid actions/states joined with commas in display order."""
+        return self._states_str
+    
+    def get_valid_actions(self) -> Tuple[str, ...]:
+        """Return the valid actions/states for this actuator.
+        
+        The states tuple is immutable, so it is returned without a copy.
+        """
+        return self.states
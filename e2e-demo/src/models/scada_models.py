@@ -5,11 +5,65 @@ equipment status, sensor readings, and alarm information from
 SCADA reports and MES systems.
 """
 
-from typing import List, Literal, Optional
-from pydantic import BaseModel, Field
+from typing import Any, List, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+# Allowed values for enumerated string fields. Checked with a frozenset
+# lookup in a field validator rather than a Literal union; the JSON schema
+# still advertises them as an enum.
+SEVERITY_LEVELS = ("low", "medium", "high", "critical")
+EQUIPMENT_STATUSES = ("running", "stopped", "maintenance", "fault")
+_SEVERITY_SET = frozenset(SEVERITY_LEVELS)
+_STATUS_SET = frozenset(EQUIPMENT_STATUSES)
+SEVERITY_RANK = {level: rank for rank, level in enumerate(SEVERITY_LEVELS)}
 
-class SensorReading(BaseModel):
+
+def _check_allowed(value: str, allowed: frozenset, ordered: tuple) -> str:
+    """Return value if it is allowed, otherwise raise a ValueError."""
+    if value in allowed:
+        return value
+    raise ValueError(f"Input should be one of: {', '.join(ordered)}")
+
+
+class ScadaModel(BaseModel):
+    """Base class for SCADA/MES models.
+    
+    Instances are immutable and reject unknown fields. Already-validated
+    sub-models are accepted as-is rather than re-validated when nested in
+    a parent model.
+    """
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        revalidate_instances="never"
+    )
+    
+    @classmethod
+    def build_trusted(cls, **data: Any) -> "ScadaModel":
+        """Build an instance from trusted data without validation.
+        
+        Only for data that was validated when it entered the system, such as
+        rows read back from the local database. Untrusted input (operator
+        reports, external payloads) must go through normal validation.
+        
+        Args:
+            **data: Field values for the model
+            
+        Returns:
+            Model instance built with model_construct()
+        """
+        return cls.model_construct(**data)
+
+
+def _build_trusted_list(model: type, items: Any) -> List[Any]:
+    """Build trusted sub-models from dicts, passing model instances through."""
+    return [
+        item if isinstance(item, model) else model.build_trusted(**item)
+        for item in items or ()
+    ]
+
+
+class SensorReading(ScadaModel):
     """A single sensor reading with value and metadata.
     
     Attributes:
@@ -38,7 +92,7 @@ class SensorReading(BaseModel):
     )
 
 
-class AlarmInfo(BaseModel):
+class AlarmInfo(ScadaModel):
     """Information about an active or historical alarm.
     
     Attributes:
@@ -52,9 +106,10 @@ class AlarmInfo(BaseModel):
         description="Unique identifier for the alarm",
         min_length=1
     )
-    severity: Literal["low", "medium", "high", "critical"] = Field(
+    severity: str = Field(
         ...,
-        description="Severity level of the alarm"
+        description="Severity level of the alarm",
+        json_schema_extra={"enum": list(SEVERITY_LEVELS)}
     )
     message: str = Field(
         ...,
@@ -65,10 +120,19 @@ class AlarmInfo(BaseModel):
         default=False,
         description="Whether the alarm has been acknowledged by an operator"
     )
+    
+    @field_validator("severity")
+    @classmethod
+    def _validate_severity(cls, value: str) -> str:
+        return _check_allowed(value, _SEVERITY_SET, SEVERITY_LEVELS)
+    
+    @property
+    def severity_rank(self) -> int:
+        """Integer rank of the severity, from 0 (low) to 3 (critical)."""
+        return SEVERITY_RANK[self.severity]
 
 
-
-class EquipmentStatus(BaseModel):
+class EquipmentStatus(ScadaModel):
     """Status information for a piece of equipment.
     
     Attributes:
@@ -88,9 +152,10 @@ class EquipmentStatus(BaseModel):
         description="Human-readable name of the equipment",
         min_length=1
     )
-    status: Literal["running", "stopped", "maintenance", "fault"] = Field(
+    status: str = Field(
         ...,
-        description="Current operational status of the equipment"
+        description="Current operational status of the equipment",
+        json_schema_extra={"enum": list(EQUIPMENT_STATUSES)}
     )
     readings: List[SensorReading] = Field(
         default_factory=list,
@@ -100,9 +165,38 @@ class EquipmentStatus(BaseModel):
         default_factory=list,
         description="List of active alarms for this equipment"
     )
+    
+    @field_validator("status")
+    @classmethod
+    def _validate_status(cls, value: str) -> str:
+        return _check_allowed(value, _STATUS_SET, EQUIPMENT_STATUSES)
+    
+    def alarms_at_or_above(self, severity: str) -> List[AlarmInfo]:
+        """Return active alarms at or above a severity level.
+        
+        Args:
+            severity: Minimum severity level (low, medium, high, critical)
+            
+        Returns:
+            Active alarms whose severity is at least the given level
+            
+        Raises:
+            KeyError: If severity is not a known severity level
+        """
+        threshold = SEVERITY_RANK[severity]
+        return [alarm for alarm in self.active_alarms if alarm.severity_rank >= threshold]
+    
+    @classmethod
+    def build_trusted(cls, **data: Any) -> "EquipmentStatus":
+        """Build trusted equipment status, constructing nested models too."""
+        data["readings"] = _build_trusted_list(SensorReading, data.get("readings"))
+        data["active_alarms"] = _build_trusted_list(
+            AlarmInfo, data.get("active_alarms")
+        )
+        return cls.model_construct(**data)
 
 
-class ProductionMetrics(BaseModel):
+class ProductionMetrics(ScadaModel):
     """Production metrics for a manufacturing line.
     
     Attributes:
@@ -142,3 +236,27 @@ class ProductionMetrics(BaseModel):
         default_factory=list,
         description="List of equipment status for this production line"
     )
+    
+    @classmethod
+    def build_trusted(cls, **data: Any) -> "ProductionMetrics":
+        """Build trusted production metrics, constructing nested models too."""
+        data["equipment"] = _build_trusted_list(EquipmentStatus, data.get("equipment"))
+        return cls.model_construct(**data)
+    
+    @classmethod
+    def from_json(cls, data: Union[str, bytes]) -> "ProductionMetrics":
+        """Parse and validate metrics from a JSON document in a single pass.
+        
+        Decodes straight into the model in pydantic-core instead of building
+        an intermediate dict with the json module first.
+        
+        Args:
+            data: JSON text or UTF-8 bytes of a ProductionMetrics object
+            
+        Returns:
+            Validated ProductionMetrics object
+            
+        Raises:
+            ValidationError: If the JSON is malformed or fails validation
+        """
+        return cls.model_validate_json(data)
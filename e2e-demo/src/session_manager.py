@@ -5,20 +5,98 @@ with configurable storage directory and automatic directory creation.
 """
 
 import os
+import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from strands.session.file_session_manager import FileSessionManager
+import orjson
+
+if TYPE_CHECKING:
+    from strands.session.file_session_manager import FileSessionManager
+
+# strands is imported when the first session manager is created: importing
+# any strands module loads the whole agent stack, which importing this
+# module should not cost
+
+# orjson options for session files: numpy values from tool results are
+# serialized natively and non-string keys are coerced like json.dump does
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+@lru_cache(maxsize=1)
+def _orjson_session_manager_class() -> type:
+    """Define OrjsonFileSessionManager on first use, importing strands."""
+    from strands.session.file_session_manager import FileSessionManager
+    from strands.types.exceptions import SessionException
+    
+    class OrjsonFileSessionManager(FileSessionManager):
+        """FileSessionManager that reads and writes session files with orjson.
+        
+        Session state is rewritten on every turn (Req 3.1), so the pure-Python
+        json module becomes a hot path for long conversations with tool-call
+        traces. The on-disk format stays plain UTF-8 JSON, so existing session
+        directories remain readable.
+        """
+        
+        def _read_file(self, path: str) -> Dict[str, Any]:
+            """Read a JSON file with symlink protection."""
+            if os.path.islink(path):
+                raise SessionException(
+                    f"Refusing to read symlink at {path}. "
+                    "This may indicate a symlink attack or session tampering."
+                )
+            try:
+                with open(path, "rb") as f:
+                    return orjson.loads(f.read())
+            except orjson.JSONDecodeError as e:
+                raise SessionException(f"Invalid JSON in file {path}: {str(e)}") from e
+        
+        def _write_file(self, path: str, data: Dict[str, Any]) -> None:
+            """Write a JSON file atomically with symlink protection."""
+            dir_path = os.path.dirname(path)
+            os.makedirs(dir_path, mode=0o700, exist_ok=True)
+            
+            if os.path.islink(path):
+                raise SessionException(
+                    f"Refusing to write to symlink at {path}. "
+                    "This may indicate a symlink attack."
+                )
+            
+            payload = orjson.dumps(data, option=_ORJSON_OPTIONS)
+            
+            # Write to an unpredictable temp file and swap it in atomically
+            fd, tmp_path = tempfile.mkstemp(dir=dir_path, prefix=".strands_", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+    
+    return OrjsonFileSessionManager
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve OrjsonFileSessionManager lazily, importing strands."""
+    if name == "OrjsonFileSessionManager":
+        return _orjson_session_manager_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def create_session_manager(
     session_id: str,
     storage_dir: str = "./edge_sessions"
-) -> FileSessionManager:
+) -> "FileSessionManager":
     """Create a FileSessionManager with automatic directory creation.
     
     Creates the storage directory if it doesn't exist, then initializes
-    a FileSessionManager for persisting conversation state.
+    a FileSessionManager for persisting conversation state. Session files
+    are (de)serialized with orjson.
     
     Args:
         session_id: Unique identifier for the conversation session
@@ -44,7 +122,7 @@ def create_session_manager(
     storage_path.mkdir(parents=True, exist_ok=True)
     
     # Create and return the FileSessionManager (Requirement 3.1)
-    return FileSessionManager(
+    return _orjson_session_manager_class()(
         session_id=session_id,
         storage_dir=str(storage_path)
     )
@@ -80,10 +158,15 @@ class EdgeSessionManager:
         """
         self.session_id = session_id
         self.storage_dir = storage_dir
-        self._session_manager: Optional[FileSessionManager] = None
+        self._session_manager: Optional["FileSessionManager"] = None
+        
+        # Paths are fixed for the lifetime of the manager, so build them once
+        self._storage_path = Path(storage_dir)
+        self._session_path = self._storage_path / f"session_{session_id}"
+        self._session_file = self._session_path / "session.json"
     
     @property
-    def session_manager(self) -> FileSessionManager:
+    def session_manager(self) -> "FileSessionManager":
         """Get or create the FileSessionManager instance.
         
         Lazily initializes the session manager on first access,
@@ -105,7 +188,7 @@ class EdgeSessionManager:
         Returns:
             Path: The directory path where this session's data is stored
         """
-        return Path(self.storage_dir) / f"session_{self.session_id}"
+        return self._session_path
     
     def session_exists(self) -> bool:
         """Check if this session has existing persisted data.
@@ -113,6 +196,4 @@ class EdgeSessionManager:
         Returns:
             bool: True if session data exists on disk, False otherwise
         """
-        session_path = self.get_session_path()
-        session_file = session_path / "session.json"
-        return session_file.exists()
+        return self._session_file.exists()
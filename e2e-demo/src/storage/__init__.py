@@ -1 +1,7 @@
 """Storage components for sessions, database, and vector store."""
+
+from .semantic_cache import SemanticCache
+
+__all__ = [
+    "SemanticCache",
+]
@@ -0,0 +1,624 @@
+"""Semantic response cache for the Edge Operator Agent.
+
+Stores agent responses keyed by the embedding of the prompt that produced
+them, so that near-duplicate operator questions can be answered with a single
+embedding call and a vector lookup instead of a full LLM round trip.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import weakref
+
+import numpy as np
+import ollama
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(text: str) -> str:
+    """Normalize a prompt so trivially different phrasings share an embedding."""
+    return _WHITESPACE_RE.sub(" ", text.strip().lower())
+
+
+def _unit_vector(vector: List[float]) -> np.ndarray:
+    """Return a vector as an L2-normalized float32 array."""
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm > 0 else array
+
+
+def _serialize(vector: np.ndarray) -> bytes:
+    """Pack a unit vector as little-endian float16 for storage."""
+    return vector.astype("<f2").tobytes()
+
+
+def _deserialize(blob: bytes) -> np.ndarray:
+    """Unpack a stored float16 vector into a float32 array."""
+    return np.frombuffer(blob, dtype="<f2").astype(np.float32)
+
+
+class _EmbeddingBatcher:
+    """Coalesces concurrent embedding requests on one event loop.
+
+    Requests are queued and flushed as a single batched Ollama call once
+    MAX_BATCH texts are pending or MAX_DELAY seconds have passed since the
+    first one arrived. The worker task exits when the queue drains, so no
+    task is left pending when the event loop is closed.
+    """
+
+    MAX_BATCH = 16
+    MAX_DELAY = 0.01
+
+    def __init__(self, embed_many: Callable[[List[str]], List[List[float]]]):
+        self._embed_many = embed_many
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    async def embed(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put_nowait((text, future))
+        if self._worker is None:
+            self._worker = loop.create_task(self._run())
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._queue.empty():
+            batch = [self._queue.get_nowait()]
+            deadline = loop.time() + self.MAX_DELAY
+            while len(batch) < self.MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                vectors = await asyncio.to_thread(
+                    self._embed_many, [text for text, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+        self._worker = None
+
+
+class SemanticCache:
+    """SQLite-backed cache of agent responses indexed by prompt embedding.
+
+    Prompts are embedded with a local Ollama embedding model. A lookup returns
+    the stored response of the most similar cached prompt if its cosine
+    similarity is above the configured threshold. Entries are namespaced by
+    session ID and expire after a TTL so stale device readings are not served.
+    Expired entries are purged from the database and the search structures.
+
+    Responses live in SQLite; nearest-neighbour search runs against an HNSW
+    index (hnswlib) whose labels are the SQLite row IDs, so lookups stay
+    sub-linear as the cache grows. The session and TTL are checked inside the
+    index search, so entries of other sessions never crowd out a valid hit.
+    The index is saved next to the database as entries are added and rebuilt
+    from SQLite if it is missing or out of date. Without hnswlib,
+    lookups fall back to a brute-force scan of an in-memory float32 matrix of
+    all cached vectors, scored with a single BLAS matrix-vector product.
+
+    Embeddings are L2-normalized and stored as float16, halving the storage
+    per vector; cosine similarity then reduces to an inner product, with an
+    error well below the similarity threshold's resolution.
+
+    Embeddings are memoized in an LRU keyed by the SHA-256 of the normalized
+    prompt, so repeated prompts skip the Ollama round trip entirely.
+
+    Attributes:
+        db_path: Path to the SQLite cache database
+        session_id: Session namespace for cached entries
+        embedding_model: Ollama model used to embed prompts
+        similarity_threshold: Minimum cosine similarity for a cache hit
+        ttl_seconds: Maximum age of a cached entry in seconds
+    """
+
+    # Bumped when the stored embedding format changes; older caches are dropped
+    SCHEMA_VERSION = 2
+
+    CACHE_TABLE_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS semantic_cache (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            embedding BLOB NOT NULL,
+            response TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_cache_session
+            ON semantic_cache(session_id, created_at);
+        CREATE INDEX IF NOT EXISTS idx_cache_created
+            ON semantic_cache(created_at);
+    """
+
+    CANDIDATE_QUERY = """
+        SELECT response FROM semantic_cache
+        WHERE id = ? AND session_id = ? AND created_at > ?
+    """
+
+    INSERT_QUERY = """
+        INSERT INTO semantic_cache (session_id, embedding, response, created_at)
+        VALUES (?, ?, ?, ?)
+    """
+
+    # Initial vector capacity of the HNSW index or scan matrix (grown by doubling)
+    INITIAL_CAPACITY = 1024
+
+    # HNSW construction parameters
+    HNSW_M = 16
+    HNSW_EF_CONSTRUCTION = 200
+    HNSW_EF_SEARCH = 50
+
+    # Minimum seconds between purges of expired entries
+    PURGE_INTERVAL = 60.0
+
+    # Minimum seconds between saves of the HNSW index while entries are added
+    INDEX_SAVE_INTERVAL = 30.0
+
+    # Number of prompt embeddings kept in the in-memory LRU
+    EMBEDDING_CACHE_SIZE = 4096
+
+    def __init__(
+        self,
+        db_path: str,
+        session_id: str,
+        embedding_model: str = "nomic-embed-text",
+        host: str = "http://localhost:11434",
+        similarity_threshold: float = 0.92,
+        ttl_seconds: float = 24 * 60 * 60,
+        client: Optional[ollama.Client] = None
+    ):
+        """Initialize the SemanticCache and create the cache table.
+
+        Args:
+            db_path: Path to the SQLite cache database
+            session_id: Session namespace for cached entries
+            embedding_model: Ollama model used to embed prompts
+            host: Ollama server URL
+            similarity_threshold: Minimum cosine similarity for a cache hit
+            ttl_seconds: Maximum age of a cached entry in seconds
+            client: Ollama client to reuse for embedding calls; a new one
+                is created for host if not provided
+        """
+        self.db_path = db_path
+        self.session_id = session_id
+        self.embedding_model = embedding_model
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+
+        self._client = client or ollama.Client(host=host)
+        self._lock = threading.Lock()
+        self._embeddings: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+        self._embeddings_lock = threading.Lock()
+        self._batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _EmbeddingBatcher]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        self.index_path = f"{db_path}.hnsw"
+        self._index = None
+        # created_at of this session's rows, checked during the index search
+        self._session_rows: Dict[int, float] = {}
+        self._index_dirty = False
+        self._last_index_save = 0.0
+        self._next_purge = 0.0
+
+        # Scan fallback: contiguous unit vectors and their SQLite row IDs
+        self._matrix: Optional[np.ndarray] = None
+        self._row_ids: Optional[np.ndarray] = None
+        self._count = 0
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._migrate_schema()
+        self._purge_expired()
+
+        if hnswlib is not None:
+            self._load_index()
+        else:
+            self._load_matrix()
+
+    def _migrate_schema(self) -> None:
+        """Create the cache table, discarding caches in an older format."""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS semantic_cache")
+            if os.path.exists(self.index_path):
+                os.remove(self.index_path)
+            self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self._conn.executescript(self.CACHE_TABLE_SCHEMA)
+
+    def _new_index(self, dim: int, capacity: int):
+        """Create an empty HNSW index for vectors of the given dimension."""
+        index = hnswlib.Index(space="ip", dim=dim)
+        # Slots of purged entries are reused by later inserts
+        index.init_index(
+            max_elements=max(capacity, self.INITIAL_CAPACITY),
+            ef_construction=self.HNSW_EF_CONSTRUCTION,
+            M=self.HNSW_M,
+            allow_replace_deleted=True
+        )
+        return index
+
+    def _load_index(self) -> None:
+        """Load the persisted HNSW index, rebuilding it from SQLite if stale.
+
+        A saved index is reused when it contains every cached row; labels of
+        rows deleted since it was saved are marked deleted in it.
+        """
+        self._session_rows = dict(self._conn.execute(
+            "SELECT id, created_at FROM semantic_cache WHERE session_id = ?",
+            (self.session_id,)
+        ))
+        row_ids = {
+            row_id for (row_id,) in self._conn.execute("SELECT id FROM semantic_cache")
+        }
+        if not row_ids:
+            return
+
+        sample = self._conn.execute(
+            "SELECT embedding FROM semantic_cache LIMIT 1"
+        ).fetchone()[0]
+        dim = len(sample) // 2
+        if os.path.exists(self.index_path):
+            index = hnswlib.Index(space="ip", dim=dim)
+            try:
+                index.load_index(self.index_path, allow_replace_deleted=True)
+                labels = set(index.get_ids_list())
+                if row_ids <= labels:
+                    self._index = index
+                    self._index_delete(labels - row_ids)
+                    return
+            except RuntimeError as e:
+                logger.debug(f"Discarding unreadable HNSW index: {e}")
+
+        logger.info(f"Rebuilding semantic cache index from {len(row_ids)} entries")
+        self._index = self._new_index(dim, len(row_ids) * 2)
+        for row_id, blob in self._conn.execute(
+            "SELECT id, embedding FROM semantic_cache"
+        ):
+            self._index.add_items(_deserialize(blob)[np.newaxis, :], [row_id])
+        self._index_dirty = True
+        self._save_index()
+
+    def _index_add(self, row_id: int, vector: np.ndarray) -> None:
+        """Add a unit vector to the HNSW index, growing it when full."""
+        vector = vector[np.newaxis, :]
+        if self._index is None:
+            self._index = self._new_index(vector.shape[1], 0)
+        elif self._index.get_current_count() >= self._index.get_max_elements():
+            self._index.resize_index(self._index.get_max_elements() * 2)
+        self._index.add_items(vector, [row_id], replace_deleted=True)
+        self._index_dirty = True
+
+    def _index_delete(self, row_ids: Iterable[int]) -> None:
+        """Mark rows deleted in the HNSW index, skipping ones it lacks."""
+        for row_id in row_ids:
+            try:
+                self._index.mark_deleted(row_id)
+            except RuntimeError:
+                # Not in the index, or already deleted
+                continue
+            self._index_dirty = True
+
+    def _save_index(self, force: bool = True) -> None:
+        """Write the HNSW index next to the database if it has changed.
+
+        The index is written to a temporary file and moved into place, so a
+        crash mid-write leaves the previous index intact.
+
+        Args:
+            force: Save even if INDEX_SAVE_INTERVAL has not passed since the
+                last save
+        """
+        if self._index is None or not self._index_dirty:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_index_save < self.INDEX_SAVE_INTERVAL:
+            return
+        tmp_path = f"{self.index_path}.tmp"
+        self._index.save_index(tmp_path)
+        os.replace(tmp_path, self.index_path)
+        self._index_dirty = False
+        self._last_index_save = now
+
+    def _load_matrix(self) -> None:
+        """Load all cached vectors into the scan matrix."""
+        rows = self._conn.execute(
+            "SELECT id, embedding FROM semantic_cache ORDER BY id"
+        ).fetchall()
+        if not rows:
+            return
+
+        capacity = max(self.INITIAL_CAPACITY, len(rows) * 2)
+        self._matrix = np.empty((capacity, len(rows[0][1]) // 2), dtype=np.float32)
+        self._row_ids = np.empty(capacity, dtype=np.int64)
+        for i, (row_id, blob) in enumerate(rows):
+            self._matrix[i] = _deserialize(blob)
+            self._row_ids[i] = row_id
+        self._count = len(rows)
+
+    def _matrix_add(self, row_id: int, vector: np.ndarray) -> None:
+        """Append a unit vector to the scan matrix, doubling it when full."""
+        if self._matrix is None:
+            self._matrix = np.empty(
+                (self.INITIAL_CAPACITY, vector.shape[0]), dtype=np.float32
+            )
+            self._row_ids = np.empty(self.INITIAL_CAPACITY, dtype=np.int64)
+        elif self._count == len(self._matrix):
+            matrix = np.empty(
+                (len(self._matrix) * 2, self._matrix.shape[1]), dtype=np.float32
+            )
+            matrix[:self._count] = self._matrix
+            row_ids = np.empty(len(matrix), dtype=np.int64)
+            row_ids[:self._count] = self._row_ids
+            self._matrix, self._row_ids = matrix, row_ids
+
+        self._matrix[self._count] = vector
+        self._row_ids[self._count] = row_id
+        self._count += 1
+
+    def _matrix_delete(self, row_ids: Iterable[int]) -> None:
+        """Drop rows from the scan matrix, keeping the rest contiguous."""
+        if self._count == 0:
+            return
+        keep = np.flatnonzero(
+            ~np.isin(self._row_ids[:self._count], np.fromiter(row_ids, dtype=np.int64))
+        )
+        count = len(keep)
+        self._matrix[:count] = self._matrix[keep]
+        self._row_ids[:count] = self._row_ids[keep]
+        self._count = count
+
+    def _purge_expired(self) -> None:
+        """Delete entries older than the TTL from SQLite and the search structures.
+
+        Runs at most once per PURGE_INTERVAL; callers hold the lock or are
+        still constructing the cache.
+        """
+        now = time.time()
+        if now < self._next_purge:
+            return
+        self._next_purge = now + self.PURGE_INTERVAL
+
+        cutoff = now - self.ttl_seconds
+        with self._conn:
+            expired = [
+                row_id for (row_id,) in self._conn.execute(
+                    "SELECT id FROM semantic_cache WHERE created_at <= ?", (cutoff,)
+                )
+            ]
+            if not expired:
+                return
+            self._conn.execute(
+                "DELETE FROM semantic_cache WHERE created_at <= ?", (cutoff,)
+            )
+        logger.debug(f"Purged {len(expired)} expired semantic cache entries")
+
+        for row_id in expired:
+            self._session_rows.pop(row_id, None)
+        if self._index is not None:
+            self._index_delete(expired)
+        elif self._matrix is not None:
+            self._matrix_delete(expired)
+
+    def _cached_embedding(self, key: str) -> Optional[Tuple[float, ...]]:
+        """Return a memoized embedding and mark it as recently used."""
+        with self._embeddings_lock:
+            vector = self._embeddings.get(key)
+            if vector is not None:
+                self._embeddings.move_to_end(key)
+            return vector
+
+    def _remember_embedding(self, key: str, vector: Tuple[float, ...]) -> None:
+        """Memoize an embedding, evicting the least recently used entry."""
+        with self._embeddings_lock:
+            self._embeddings[key] = vector
+            self._embeddings.move_to_end(key)
+            if len(self._embeddings) > self.EMBEDDING_CACHE_SIZE:
+                self._embeddings.popitem(last=False)
+
+    def embed(self, text: str) -> List[float]:
+        """Embed a prompt with the configured Ollama embedding model.
+
+        Args:
+            text: The prompt to embed
+
+        Returns:
+            The embedding vector
+        """
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Embed several prompts, fetching all uncached ones in one Ollama call.
+
+        Args:
+            texts: The prompts to embed
+
+        Returns:
+            The embedding vectors, in the same order as texts
+        """
+        normalized = [_normalize(text) for text in texts]
+        keys = [hashlib.sha256(text.encode()).hexdigest() for text in normalized]
+        vectors = [self._cached_embedding(key) for key in keys]
+
+        missing = {
+            key: text
+            for key, text, vector in zip(keys, normalized, vectors)
+            if vector is None
+        }
+        if missing:
+            response = self._client.embed(
+                model=self.embedding_model, input=list(missing.values())
+            )
+            fetched = dict(zip(missing, response["embeddings"]))
+            for key, vector in fetched.items():
+                self._remember_embedding(key, tuple(vector))
+            vectors = [
+                vector if vector is not None else tuple(fetched[key])
+                for key, vector in zip(keys, vectors)
+            ]
+
+        return [list(vector) for vector in vectors]
+
+    async def embed_async(self, text: str) -> List[float]:
+        """Embed a prompt from async code, batching concurrent requests.
+
+        Args:
+            text: The prompt to embed
+
+        Returns:
+            The embedding vector
+        """
+        loop = asyncio.get_running_loop()
+        with self._embeddings_lock:
+            batcher = self._batchers.get(loop)
+            if batcher is None:
+                batcher = _EmbeddingBatcher(self.embed_many)
+                self._batchers[loop] = batcher
+        return await batcher.embed(text)
+
+    def lookup(self, embedding: List[float]) -> Optional[str]:
+        """Find the cached response for the most similar unexpired prompt.
+
+        Args:
+            embedding: Embedding of the incoming prompt
+
+        Returns:
+            The cached response, or None on a cache miss
+        """
+        query = _unit_vector(embedding)
+        cutoff = time.time() - self.ttl_seconds
+        max_distance = 1.0 - self.similarity_threshold
+
+        with self._lock:
+            if hnswlib is not None:
+                return self._lookup_index(query, cutoff, max_distance)
+            return self._lookup_scan(query, cutoff, max_distance)
+
+    def _first_valid(
+        self,
+        candidates: Iterable[Tuple[int, float]],
+        cutoff: float
+    ) -> Optional[str]:
+        """Return the response of the first candidate row in this session and TTL.
+
+        Args:
+            candidates: (row_id, distance) pairs, nearest first
+            cutoff: Oldest acceptable created_at timestamp
+        """
+        for row_id, distance in candidates:
+            row = self._conn.execute(
+                self.CANDIDATE_QUERY, (int(row_id), self.session_id, cutoff)
+            ).fetchone()
+            if row is not None:
+                logger.debug(f"Semantic cache hit (distance={distance:.4f})")
+                return row[0]
+        return None
+
+    def _lookup_index(
+        self,
+        query: np.ndarray,
+        cutoff: float,
+        max_distance: float
+    ) -> Optional[str]:
+        """Look up the nearest cached prompt of this session through the HNSW index."""
+        if self._index is None or not self._session_rows:
+            return None
+
+        # Only unexpired rows of this session are eligible, so the search
+        # returns the nearest valid entry however many others surround it
+        session_rows = self._session_rows
+        self._index.set_ef(self.HNSW_EF_SEARCH)
+        try:
+            labels, distances = self._index.knn_query(
+                query,
+                k=1,
+                num_threads=1,
+                filter=lambda label: label in session_rows and session_rows[label] > cutoff
+            )
+        except RuntimeError:
+            # No eligible entry in the index
+            return None
+
+        return self._first_valid(
+            (
+                (label, distance)
+                for label, distance in zip(labels[0], distances[0])
+                if distance < max_distance
+            ),
+            cutoff
+        )
+
+    def _lookup_scan(
+        self,
+        query: np.ndarray,
+        cutoff: float,
+        max_distance: float
+    ) -> Optional[str]:
+        """Look up the nearest cached prompts by scoring every cached vector."""
+        if self._count == 0:
+            return None
+
+        # One SGEMV over the contiguous (N, d) matrix scores all entries
+        distances = 1.0 - self._matrix[:self._count] @ query
+        matches = np.flatnonzero(distances < max_distance)
+        matches = matches[np.argsort(distances[matches])]
+
+        return self._first_valid(
+            zip(self._row_ids[matches], distances[matches]),
+            cutoff
+        )
+
+    def add(self, embedding: List[float], response: str) -> None:
+        """Store a response under the embedding of the prompt that produced it.
+
+        Args:
+            embedding: Embedding of the prompt
+            response: The agent's response to cache
+        """
+        vector = _unit_vector(embedding)
+        with self._lock:
+            self._purge_expired()
+            created_at = time.time()
+            with self._conn:
+                cursor = self._conn.execute(
+                    self.INSERT_QUERY,
+                    (self.session_id, _serialize(vector), response, created_at)
+                )
+            if hnswlib is not None:
+                self._index_add(cursor.lastrowid, vector)
+                self._session_rows[cursor.lastrowid] = created_at
+                self._save_index(force=False)
+            else:
+                self._matrix_add(cursor.lastrowid, vector)
+
+    def close(self) -> None:
+        """Persist the HNSW index and close the database connection."""
+        with self._lock:
+            self._save_index()
+            self._conn.close()
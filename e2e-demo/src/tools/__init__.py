@@ -1,14 +1,40 @@
 """Agent tools for IoT, database, and SCADA extraction operations."""
 
-from .iot_tools import read_sensor, control_device, list_devices
-from .database_tools import DatabaseTools
-from .scada_extraction_tools import extract_scada_metrics, ExtractionError
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .iot_tools import read_sensor, read_sensors_batch, control_device, list_devices
+    from .database_tools import DatabaseTools
+    from .scada_extraction_tools import extract_scada_metrics, ExtractionError
+
+# Exports are imported on first access: the IoT and SCADA tool modules import
+# strands, which loads its whole agent stack, so importing e.g.
+# src.tools.database_tools should not pull them in
+_LAZY_EXPORTS = {
+    "read_sensor": ".iot_tools",
+    "read_sensors_batch": ".iot_tools",
+    "control_device": ".iot_tools",
+    "list_devices": ".iot_tools",
+    "DatabaseTools": ".database_tools",
+    "extract_scada_metrics": ".scada_extraction_tools",
+    "ExtractionError": ".scada_extraction_tools",
+}
 
 __all__ = [
     "read_sensor",
+    "read_sensors_batch",
     "control_device",
     "list_devices",
     "DatabaseTools",
     "extract_scada_metrics",
     "ExtractionError",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a lazy export on first access."""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
@@ -0,0 +1,24 @@
+"""Cheap wall-clock timestamps for tool responses and telemetry rows."""
+
+import time
+from typing import Tuple
+
+# (epoch second, formatted local date and time) of the last timestamp, so the
+# strftime work is done at most once per second
+_ts_cache: Tuple[int, str] = (-1, "")
+
+
+def now_iso() -> str:
+    """Return the current local time in ISO 8601 format with microseconds.
+    
+    Equivalent to datetime.now().isoformat(), but the date and time part is
+    formatted once per second and only the microseconds are added per call.
+    """
+    global _ts_cache
+    now_ns = time.time_ns()
+    second, micros = divmod(now_ns // 1000, 1_000_000)
+    cached_second, prefix = _ts_cache
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second))
+        _ts_cache = (second, prefix)
+    return f"{prefix}.{micros:06d}"
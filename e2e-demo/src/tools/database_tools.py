@@ -1,26 +1,244 @@
-"""Database tools for telemetry storage and querying via MCP.
+"""Database tools for telemetry storage and querying.
 
 Provides tools for the Edge Operator Agent to store and query device telemetry
-data using a local SQLite database accessed through the Model Context Protocol.
+data in a local SQLite database, accessed directly or, for queries, through
+the Model Context Protocol.
 """
 
-from typing import Optional, List, Any
-from datetime import datetime
-from strands import tool
-from strands.tools.mcp import MCPClient
-from mcp import stdio_client, StdioServerParameters
+from collections import deque
+from functools import cached_property
+from typing import TYPE_CHECKING, Optional, List, Any, Deque, Dict, Iterable, Tuple
+import atexit
+import logging
+import math
+import os
+import sqlite3
+import sys
+import threading
+import weakref
+
+import orjson
+
+from ._clock import now_iso as _now_iso
+
+if TYPE_CHECKING:
+    from strands.tools.mcp import MCPClient
+
+# strands and mcp are imported on first use: the tools are wrapped in
+# get_tools() and the MCP client is only built when queries go through MCP,
+# so importing this module stays cheap
+
+logger = logging.getLogger(__name__)
+
+# MCP clients shared by every DatabaseTools instance on the same database, so
+# one mcp-server-sqlite subprocess serves them all. The subprocess is started
+# by the first holder to enter and stopped when the last holder exits.
+_MCP_CLIENTS: Dict[str, "MCPClient"] = {}
+_MCP_REFCOUNTS: Dict[str, int] = {}
+_MCP_LOCK = threading.Lock()
+
+# Instances whose write buffers are flushed at interpreter exit, since a
+# pending daemon flush timer is stopped without firing
+_OPEN_TOOLS: "weakref.WeakSet[DatabaseTools]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_tools() -> None:
+    """Write the buffered telemetry of every open DatabaseTools instance."""
+    for tools in list(_OPEN_TOOLS):
+        try:
+            tools.flush()
+        except Exception as e:
+            logger.warning(f"Failed to flush telemetry at exit: {e}")
+
+# SELECT templates, filled with str.format_map() per query. Values are bound
+# as ? parameters, so each filter combination is one statement text that
+# sqlite3's statement cache prepares once.
+_QUERY_TEMPLATE = """
+    SELECT device_id, metric_type, value, unit, timestamp
+    FROM device_telemetry
+    {where}
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+_AGGREGATION_TEMPLATE = """
+    SELECT {select} as result
+    FROM device_telemetry
+    {where}
+"""
+
+_AGGREGATIONS = ("AVG", "MIN", "MAX", "COUNT", "SUM")
+
+# Optional query filters as (argument name, SQL condition, description)
+_FILTERS = (
+    ("device_id", "device_id = ?", "device_id='{}'"),
+    ("metric_type", "metric_type = ?", "metric_type='{}'"),
+    ("start_time", "timestamp >= ?", "from {}"),
+    ("end_time", "timestamp <= ?", "to {}"),
+)
+
+
+def _where_clause(filters: Dict[str, Optional[str]]) -> Tuple[str, List[Any]]:
+    """Build the WHERE clause and its parameters for the filters that are set."""
+    active = [(condition, filters[name]) for name, condition, _ in _FILTERS if filters[name]]
+    if not active:
+        return "", []
+    conditions = " AND ".join(condition for condition, _ in active)
+    return f"WHERE {conditions}", [value for _, value in active]
+
+
+def _telemetry_row(
+    device_id: Any,
+    metric_type: Any,
+    value: Any,
+    unit: Any,
+    timestamp: str
+) -> tuple:
+    """Validate a reading and build its row for INSERT_QUERY.
+    
+    Args:
+        device_id: The unique identifier of the device
+        metric_type: The type of metric
+        value: The reading, as a number or numeric string
+        unit: The unit of measurement
+        timestamp: ISO format timestamp
+        
+    Returns:
+        Tuple of (device_id, metric_type, value, unit, timestamp), with the
+        identifiers interned and value as a float
+        
+    Raises:
+        ValueError: If a field would violate the table's constraints
+    """
+    for name, field in (("device_id", device_id), ("metric_type", metric_type)):
+        if not isinstance(field, str) or not field.strip():
+            raise ValueError(f"{name} must be a non-empty string")
+    if not isinstance(unit, str):
+        raise ValueError("unit must be a string")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"value must be a number, got {value!r}") from None
+    # SQLite stores NaN as NULL, which the NOT NULL constraint rejects
+    if math.isnan(number):
+        raise ValueError("value must not be NaN")
+    
+    # Few distinct devices, metrics and units exist, so buffered rows share
+    # one string object per value
+    return (
+        sys.intern(device_id),
+        sys.intern(metric_type),
+        number,
+        sys.intern(unit),
+        timestamp
+    )
+
+
+def _shared_mcp_client(db_path: str) -> "MCPClient":
+    """Return the MCP client for a database, creating it on first use."""
+    key = os.path.abspath(db_path)
+    with _MCP_LOCK:
+        client = _MCP_CLIENTS.get(key)
+        if client is None:
+            from strands.tools.mcp import MCPClient
+            from mcp import stdio_client, StdioServerParameters
+            
+            client = _MCP_CLIENTS[key] = MCPClient(lambda: stdio_client(
+                StdioServerParameters(
+                    command="uvx",
+                    args=["mcp-server-sqlite", "--db-path", key]
+                )
+            ))
+        return client
+
+
+def _acquire_mcp_client(db_path: str) -> "MCPClient":
+    """Take a reference to the shared MCP client, starting it if needed."""
+    client = _shared_mcp_client(db_path)
+    key = os.path.abspath(db_path)
+    with _MCP_LOCK:
+        if _MCP_REFCOUNTS.get(key, 0) == 0:
+            client.__enter__()
+        _MCP_REFCOUNTS[key] = _MCP_REFCOUNTS.get(key, 0) + 1
+    return client
+
+
+def _release_mcp_client(db_path: str, exc_type=None, exc_val=None, exc_tb=None) -> bool:
+    """Drop a reference to the shared MCP client, stopping it with the last one."""
+    key = os.path.abspath(db_path)
+    with _MCP_LOCK:
+        remaining = _MCP_REFCOUNTS.get(key, 0) - 1
+        if remaining > 0:
+            _MCP_REFCOUNTS[key] = remaining
+            return False
+        _MCP_REFCOUNTS.pop(key, None)
+        client = _MCP_CLIENTS.pop(key, None)
+    if client is None:
+        return False
+    return client.__exit__(exc_type, exc_val, exc_tb)
+
+
+def _sql_literal(value: Any) -> str:
+    """Render a parameter as an SQL literal."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _inline_params(query: str, params: List[Any]) -> str:
+    """Substitute ? placeholders with escaped literals.
+    
+    The MCP SQLite server accepts no bound parameters. The query templates
+    contain no other question marks, so placeholders can be replaced in order.
+    """
+    parts = query.split("?")
+    if len(parts) != len(params) + 1:
+        raise ValueError("Parameter count does not match query placeholders")
+    literals = [_sql_literal(value) for value in params] + [""]
+    return "".join(part + literal for part, literal in zip(parts, literals))
+
+
+def _describe_filters(filters: Dict[str, Optional[str]]) -> str:
+    """Describe the filters that are set, for tool output."""
+    described = ", ".join(
+        description.format(filters[name])
+        for name, _, description in _FILTERS
+        if filters[name]
+    )
+    return described or "all records"
+
+
+def _result_text(result: Dict[str, Any]) -> str:
+    """Extract the first text block from an MCP tool result."""
+    for item in result.get("content", []):
+        if isinstance(item, dict) and item.get("type") == "text":
+            return item.get("text", "")
+    return ""
 
 
 class DatabaseTools:
-    """MCP-based SQLite database tools for telemetry storage and querying.
+    """SQLite database tools for telemetry storage and querying.
     
-    This class manages the connection to a local SQLite database via MCP,
-    providing tools for logging device telemetry and querying historical data.
+    This class manages the connection to a local SQLite database, providing
+    tools for logging device telemetry and querying historical data. All
+    statements run on a direct SQLite connection, since the database is a
+    local file and each MCP call is a JSON-RPC round trip to a subprocess.
+    Queries can be routed through the MCP SQLite server instead with
+    use_mcp=True, e.g. when the database is served remotely; inserts always
+    use the direct connection.
+    
+    Single readings logged by the agent are validated, then buffered and
+    written in batches, either once FLUSH_ROWS are pending or by a timer
+    thread FLUSH_INTERVAL seconds after the first pending row, so one commit
+    covers many inserts. No thread runs while the buffer is empty. Queries flush the buffer first and always see every logged
+    reading, and pending readings are flushed at interpreter exit.
     
     Attributes:
         db_path: Path to the SQLite database file
+        use_mcp: Whether queries go through the MCP server
         mcp_client: The MCP client for database operations
-        _initialized: Whether the telemetry table has been created
     """
     
     TELEMETRY_TABLE_SCHEMA = """
@@ -36,31 +254,190 @@ class DatabaseTools:
         CREATE INDEX IF NOT EXISTS idx_timestamp ON device_telemetry(timestamp);
     """
     
-    def __init__(self, db_path: str = "./telemetry.db"):
+    # Journal mode is stored in the database file, so setting it once here
+    # also applies to the connections opened by the MCP server process
+    JOURNAL_MODE_PRAGMA = "PRAGMA journal_mode=WAL"
+    
+    INSERT_QUERY = """
+        INSERT INTO device_telemetry (device_id, metric_type, value, unit, timestamp)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    
+    # Buffered single readings are written once this many are pending...
+    FLUSH_ROWS = 64
+    # ...or after at most this many seconds
+    FLUSH_INTERVAL = 0.05
+    
+    def __init__(self, db_path: str = "./telemetry.db", use_mcp: bool = False):
         """Initialize the DatabaseTools with the specified database path.
         
         Args:
             db_path: Path to the SQLite database file
+            use_mcp: Route queries through the MCP SQLite server instead of
+                the direct connection
         """
         self.db_path = db_path
-        self._initialized = False
-        self.mcp_client = MCPClient(lambda: stdio_client(
-            StdioServerParameters(
-                command="uvx",
-                args=["mcp-server-sqlite", "--db-path", db_path]
-            )
-        ))
+        self.use_mcp = use_mcp
+        self._conn_lock = threading.Lock()
+        # Opened eagerly so the schema exists before any tool runs
+        self._conn: Optional[sqlite3.Connection] = self._connect()
+        
+        # Write buffer for single readings and the timer that drains it
+        self._pending: Deque[tuple] = deque()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flusher_lock = threading.Lock()
+        
+        # Whether this instance holds a reference to the shared MCP client
+        self._mcp_held = False
+        
+        _OPEN_TOOLS.add(self)
+    
+    @cached_property
+    def mcp_client(self) -> "MCPClient":
+        """MCP client for the SQLite server, created on first access.
+        
+        The client is shared with other instances on the same database.
+        """
+        return _shared_mcp_client(self.db_path)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the direct SQLite connection used for telemetry access.
+        
+        Switches the database to write-ahead logging, so each insert appends
+        to the log instead of rewriting the rollback journal and readers no
+        longer block writers, and creates the telemetry table.
+        
+        Returns:
+            Connection in autocommit mode, shareable across tool threads
+        """
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        mode = conn.execute(self.JOURNAL_MODE_PRAGMA).fetchone()[0]
+        logger.debug(f"Telemetry database journal mode: {mode}")
+        # In WAL mode NORMAL only syncs at checkpoints and stays crash-safe
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.executescript(self.TELEMETRY_TABLE_SCHEMA)
+        return conn
     
-    def _ensure_initialized(self) -> None:
-        """Ensure the telemetry table exists, creating it if necessary."""
-        if not self._initialized:
-            # Execute schema creation
-            self.mcp_client.call_tool_sync(
-                tool_use_id="init-schema",
-                name="write_query",
-                arguments={"query": self.TELEMETRY_TABLE_SCHEMA}
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Get the direct SQLite connection, opening it on first use."""
+        if self._conn is None:
+            with self._conn_lock:
+                if self._conn is None:
+                    self._conn = self._connect()
+        return self._conn
+    
+    def log_telemetry_many(self, rows: Iterable[tuple]) -> None:
+        """Insert telemetry rows with one executemany in a single transaction.
+        
+        Args:
+            rows: Tuples of (device_id, metric_type, value, unit, timestamp)
+        """
+        conn = self.connection
+        with self._conn_lock:
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(self.INSERT_QUERY, rows)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+    
+    def _buffer_row(self, row: tuple) -> None:
+        """Queue a row for the next batched write."""
+        self._pending.append(row)
+        if len(self._pending) >= self.FLUSH_ROWS:
+            self.flush()
+        else:
+            self._start_flusher()
+    
+    def _start_flusher(self) -> None:
+        """Start the flush timer unless one is already pending.
+        
+        The timer thread ends after one flush, so it only holds a reference
+        to this instance while rows are buffered.
+        """
+        with self._flusher_lock:
+            if self._flush_timer is not None:
+                return
+            self._flush_timer = threading.Timer(self.FLUSH_INTERVAL, self._timed_flush)
+            self._flush_timer.name = "telemetry-flush"
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def _timed_flush(self) -> None:
+        """Flush the write buffer when the flush timer fires."""
+        # Cleared before flushing, so a row buffered meanwhile starts a new
+        # timer unless this flush already takes it
+        with self._flusher_lock:
+            self._flush_timer = None
+        self.flush()
+    
+    def flush(self) -> None:
+        """Write all buffered telemetry rows to the database.
+        
+        Rows are written in one transaction. If that fails, they are retried
+        one by one, so a single bad row does not drop the rest of the batch.
+        """
+        rows = []
+        while True:
+            try:
+                rows.append(self._pending.popleft())
+            except IndexError:
+                break
+        if not rows:
+            return
+        
+        try:
+            self.log_telemetry_many(rows)
+        except sqlite3.Error:
+            for row in rows:
+                try:
+                    self.log_telemetry_many([row])
+                except sqlite3.Error as e:
+                    logger.warning(f"Dropped telemetry row {row}: {e}")
+    
+    def _read_query(self, query: str, params: List[Any], tool_use_id: str) -> str:
+        """Run a read-only query and return its rows as text.
+        
+        Rows are rendered as a list of column-to-value objects, the same
+        shape the MCP SQLite server returns. Direct queries serialize them to
+        JSON with orjson; MCP results are passed through as the server's text.
+        
+        Args:
+            query: SELECT statement to run, with ? placeholders
+            params: Values bound to the placeholders
+            tool_use_id: Identifier for the MCP call when use_mcp is set
+            
+        Returns:
+            Text representation of the result rows
+        """
+        # Make buffered readings visible to this query
+        self.flush()
+        
+        if self.use_mcp:
+            result = self.mcp_client.call_tool_sync(
+                tool_use_id=tool_use_id,
+                name="read_query",
+                arguments={"query": _inline_params(query, params)}
             )
-            self._initialized = True
+            return _result_text(result)
+        
+        conn = self.connection
+        with self._conn_lock:
+            cursor = conn.execute(query, params)
+            columns = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+        return orjson.dumps([dict(zip(columns, row)) for row in rows]).decode()
     
     def get_tools(self) -> List[Any]:
         """Get the list of database tools for use with an agent.
@@ -68,13 +445,15 @@ class DatabaseTools:
         Returns:
             List of tool functions for database operations
         """
+        from strands import tool
+        
         return [
-            self.log_telemetry,
-            self.query_telemetry,
-            self.query_telemetry_aggregation
+            tool(self.log_telemetry),
+            tool(self.log_telemetry_batch),
+            tool(self.query_telemetry),
+            tool(self.query_telemetry_aggregation)
         ]
     
-    @tool
     def log_telemetry(
         self,
         device_id: str,
@@ -96,38 +475,68 @@ class DatabaseTools:
             A confirmation message or error description
         """
         try:
-            self._ensure_initialized()
-            
             if timestamp is None:
-                timestamp = datetime.now().isoformat()
-            
-            query = """
-                INSERT INTO device_telemetry (device_id, metric_type, value, unit, timestamp)
-                VALUES (?, ?, ?, ?, ?)
-            """
+                timestamp = _now_iso()
             
-            result = self.mcp_client.call_tool_sync(
-                tool_use_id=f"log-{device_id}-{timestamp}",
-                name="write_query",
-                arguments={
-                    "query": f"""
-                        INSERT INTO device_telemetry (device_id, metric_type, value, unit, timestamp)
-                        VALUES ('{device_id}', '{metric_type}', {value}, '{unit}', '{timestamp}')
-                    """
-                }
-            )
+            # Validated before buffering, so the row cannot fail when it is
+            # written after this call has reported success
+            row = _telemetry_row(device_id, metric_type, value, unit, timestamp)
+            self._buffer_row(row)
             
             return (
                 f"Telemetry logged successfully:\n"
                 f"  Device ID: {device_id}\n"
                 f"  Metric: {metric_type}\n"
-                f"  Value: {value} {unit}\n"
+                f"  Value: {row[2]} {unit}\n"
                 f"  Timestamp: {timestamp}"
             )
         except Exception as e:
             return f"Error logging telemetry: {str(e)}"
     
-    @tool
+    def log_telemetry_batch(self, readings: List[Dict[str, Any]]) -> str:
+        """Log several telemetry records to the database at once.
+        
+        Prefer this over repeated log_telemetry calls when recording more
+        than one reading, since all records are written in one transaction.
+        
+        Args:
+            readings: List of records, each with keys device_id, metric_type,
+                value and unit, and an optional ISO format timestamp
+                (defaults to current time)
+            
+        Returns:
+            A confirmation message or error description
+        """
+        try:
+            if not readings:
+                return "Error logging telemetry: no readings provided."
+            
+            # One timestamp for the whole batch
+            now = _now_iso()
+            rows = [
+                _telemetry_row(
+                    reading["device_id"],
+                    reading["metric_type"],
+                    reading["value"],
+                    reading["unit"],
+                    reading.get("timestamp") or now
+                )
+                for reading in readings
+            ]
+            
+            self.log_telemetry_many(rows)
+            
+            devices = sorted({row[0] for row in rows})
+            return (
+                f"Telemetry logged successfully:\n"
+                f"  Records: {len(rows)}\n"
+                f"  Devices: {', '.join(devices)}"
+            )
+        except KeyError as e:
+            return f"Error logging telemetry: reading is missing field {e}"
+        except Exception as e:
+            return f"Error logging telemetry: {str(e)}"
+    
     def query_telemetry(
         self,
         device_id: Optional[str] = None,
@@ -149,49 +558,19 @@ class DatabaseTools:
             Formatted query results or error description
         """
         try:
-            self._ensure_initialized()
-            
-            # Build query with filters
-            conditions = []
-            if device_id:
-                conditions.append(f"device_id = '{device_id}'")
-            if metric_type:
-                conditions.append(f"metric_type = '{metric_type}'")
-            if start_time:
-                conditions.append(f"timestamp >= '{start_time}'")
-            if end_time:
-                conditions.append(f"timestamp <= '{end_time}'")
+            filters = {
+                "device_id": device_id,
+                "metric_type": metric_type,
+                "start_time": start_time,
+                "end_time": end_time,
+            }
+            where, params = _where_clause(filters)
+            query = _QUERY_TEMPLATE.format_map({"where": where})
+            params.append(int(limit))
             
-            where_clause = ""
-            if conditions:
-                where_clause = "WHERE " + " AND ".join(conditions)
-            
-            query = f"""
-                SELECT device_id, metric_type, value, unit, timestamp
-                FROM device_telemetry
-                {where_clause}
-                ORDER BY timestamp DESC
-                LIMIT {limit}
-            """
-            
-            result = self.mcp_client.call_tool_sync(
-                tool_use_id="query-telemetry",
-                name="read_query",
-                arguments={"query": query}
+            text_content = self._read_query(
+                query, params, tool_use_id="query-telemetry"
             )
-            
-            # Format the results
-            content = result.get("content", [])
-            if not content:
-                return "No telemetry records found matching the criteria."
-            
-            # Extract text content from MCP response
-            text_content = ""
-            for item in content:
-                if isinstance(item, dict) and item.get("type") == "text":
-                    text_content = item.get("text", "")
-                    break
-            
             if not text_content or text_content.strip() == "[]":
                 return "No telemetry records found matching the criteria."
             
@@ -200,7 +579,6 @@ class DatabaseTools:
         except Exception as e:
             return f"Error querying telemetry: {str(e)}"
     
-    @tool
     def query_telemetry_aggregation(
         self,
         aggregation: str,
@@ -222,28 +600,17 @@ class DatabaseTools:
             Aggregation result or error description
         """
         try:
-            self._ensure_initialized()
-            
             # Validate aggregation function
-            valid_aggregations = ["AVG", "MIN", "MAX", "COUNT", "SUM"]
             aggregation_upper = aggregation.upper()
-            if aggregation_upper not in valid_aggregations:
-                return f"Error: Invalid aggregation '{aggregation}'. Valid options: {', '.join(valid_aggregations)}"
-            
-            # Build query with filters
-            conditions = []
-            if device_id:
-                conditions.append(f"device_id = '{device_id}'")
-            if metric_type:
-                conditions.append(f"metric_type = '{metric_type}'")
-            if start_time:
-                conditions.append(f"timestamp >= '{start_time}'")
-            if end_time:
-                conditions.append(f"timestamp <= '{end_time}'")
+            if aggregation_upper not in _AGGREGATIONS:
+                return f"Error: Invalid aggregation '{aggregation}'. Valid options: {', '.join(_AGGREGATIONS)}"
             
-            where_clause = ""
-            if conditions:
-                where_clause = "WHERE " + " AND ".join(conditions)
+            filters = {
+                "device_id": device_id,
+                "metric_type": metric_type,
+                "start_time": start_time,
+                "end_time": end_time,
+            }
             
             # For COUNT, we count all rows; for others, we aggregate the value column
             if aggregation_upper == "COUNT":
@@ -251,38 +618,15 @@ class DatabaseTools:
             else:
                 select_expr = f"{aggregation_upper}(value)"
             
-            query = f"""
-                SELECT {select_expr} as result
-                FROM device_telemetry
-                {where_clause}
-            """
-            
-            result = self.mcp_client.call_tool_sync(
-                tool_use_id="query-aggregation",
-                name="read_query",
-                arguments={"query": query}
+            where, params = _where_clause(filters)
+            query = _AGGREGATION_TEMPLATE.format_map(
+                {"select": select_expr, "where": where}
             )
             
-            # Extract the result value
-            content = result.get("content", [])
-            text_content = ""
-            for item in content:
-                if isinstance(item, dict) and item.get("type") == "text":
-                    text_content = item.get("text", "")
-                    break
-            
-            # Build filter description
-            filter_desc = []
-            if device_id:
-                filter_desc.append(f"device_id='{device_id}'")
-            if metric_type:
-                filter_desc.append(f"metric_type='{metric_type}'")
-            if start_time:
-                filter_desc.append(f"from {start_time}")
-            if end_time:
-                filter_desc.append(f"to {end_time}")
-            
-            filter_str = ", ".join(filter_desc) if filter_desc else "all records"
+            text_content = self._read_query(
+                query, params, tool_use_id="query-aggregation"
+            )
+            filter_str = _describe_filters(filters)
             
             return (
                 f"Aggregation Result:\n"
@@ -295,10 +639,33 @@ class DatabaseTools:
             return f"Error performing aggregation: {str(e)}"
     
     def __enter__(self):
-        """Enter the context manager, starting the MCP client."""
-        self.mcp_client.__enter__()
+        """Enter the context manager, opening the database and MCP client.
+        
+        The MCP server is only started when queries are routed through it.
+        """
+        # Open the direct connection first so WAL mode and the schema are in
+        # place before the MCP server opens the database
+        _ = self.connection
+        if self.use_mcp and not self._mcp_held:
+            self.mcp_client = _acquire_mcp_client(self.db_path)
+            self._mcp_held = True
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Exit the context manager, stopping the MCP client."""
-        return self.mcp_client.__exit__(exc_type, exc_val, exc_tb)
+        """Exit the context manager, closing the database and MCP client."""
+        with self._flusher_lock:
+            timer, self._flush_timer = self._flush_timer, None
+        if timer is not None:
+            timer.cancel()
+            timer.join()
+        self.flush()
+        
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        _OPEN_TOOLS.discard(self)
+        if self._mcp_held:
+            self._mcp_held = False
+            return _release_mcp_client(self.db_path, exc_type, exc_val, exc_tb)
+        return False
@@ -5,11 +5,18 @@ including reading sensor values and controlling actuators.
 """
 
 from strands import tool
-from typing import Optional
-from datetime import datetime
+from typing import List, Optional
 
-from ..models.device_registry import default_registry
-from ..models.iot_devices import SensorDevice, ActuatorDevice
+from ._clock import now_iso
+from ..models.device_registry import get_default_registry
+from ..models.iot_devices import SensorDevice, ActuatorDevice, read_sensors
+
+# Per-device blocks for list_devices(), each rendered with one format() call
+_DEVICE_FMT = "\nDevice ID: {d.device_id}\n  Type: {d.device_type}\n  Location: {d.location}"
+_SENSOR_FMT = _DEVICE_FMT + "\n  Unit: {d.unit}\n  Range: {d.min_value} - {d.max_value}"
+_ACTUATOR_FMT = (
+    _DEVICE_FMT + "\n  Valid States: {d.valid_actions_str}\n  Current State: {d.current_state}"
+)
 
 
 @tool
@@ -23,18 +30,23 @@ def read_sensor(device_id: str) -> str:
         A formatted string containing device info and the current reading,
         or an error message if the device is not found or not a sensor.
     """
-    device = default_registry.get(device_id)
+    registry = get_default_registry()
+    device = registry.get(device_id)
     
     if device is None:
-        available_ids = default_registry.list_device_ids()
-        return f"Error: Device '{device_id}' not found. Available devices: {', '.join(available_ids)}"
+        return f"Error: Device '{device_id}' not found. Available devices: {registry.available_ids_str()}"
     
-    if not isinstance(device, SensorDevice):
+    # device_type is fixed by the device classes, so it stands in for
+    # isinstance; the class is only checked in debug runs, to catch devices
+    # tagged by hand
+    if device.device_type != "sensor":
         return f"Error: Device '{device_id}' is not a sensor. It is a {device.device_type}."
+    if __debug__ and not isinstance(device, SensorDevice):
+        return f"Error: Device '{device_id}' is tagged as a sensor but is a {type(device).__name__}."
     
     # Read the sensor value
     reading = device.read()
-    timestamp = datetime.now().isoformat()
+    timestamp = now_iso()
     
     return (
         f"Sensor Reading:\n"
@@ -46,6 +58,55 @@ def read_sensor(device_id: str) -> str:
     )
 
 
+@tool
+def read_sensors_batch(device_ids: List[str]) -> str:
+    """Read current values from several IoT sensors in one call.
+    
+    Prefer this over repeated read_sensor calls when more than one sensor
+    is needed. All sensors are read together and share one timestamp.
+    
+    Args:
+        device_ids: Unique identifiers of the sensor devices to read
+        
+    Returns:
+        A formatted string with one reading per sensor, followed by an
+        error line for each ID that is unknown or not a sensor.
+    """
+    if not device_ids:
+        return "Error: No device IDs provided."
+    
+    registry = get_default_registry()
+    sensors = []
+    errors = []
+    for device_id in dict.fromkeys(device_ids):
+        device = registry.get(device_id)
+        if device is None:
+            errors.append(f"  - {device_id}: not found")
+        elif device.device_type != "sensor":
+            errors.append(f"  - {device_id}: not a sensor (it is a {device.device_type})")
+        elif __debug__ and not isinstance(device, SensorDevice):
+            errors.append(f"  - {device_id}: tagged as a sensor but is a {type(device).__name__}")
+        else:
+            sensors.append(device)
+    
+    timestamp = now_iso()
+    lines = ["Sensor Readings:"]
+    if sensors:
+        values = read_sensors(sensors).tolist()
+        lines.extend(
+            f"  - {device.device_id} ({device.location}): {value} {device.unit}"
+            for device, value in zip(sensors, values)
+        )
+    lines.append(f"  Timestamp: {timestamp}")
+    
+    if errors:
+        lines.append("Errors:")
+        lines.extend(errors)
+        lines.append(f"Available devices: {registry.available_ids_str()}")
+    
+    return "\n".join(lines)
+
+
 @tool
 def control_device(device_id: str, action: str) -> str:
     """Send a control command to an IoT actuator device.
@@ -58,39 +119,35 @@ def control_device(device_id: str, action: str) -> str:
         A confirmation message if successful, or an error message if the
         device is not found, not an actuator, or the action is invalid.
     """
-    device = default_registry.get(device_id)
+    registry = get_default_registry()
+    device = registry.get(device_id)
     
     if device is None:
-        available_ids = default_registry.list_device_ids()
-        return f"Error: Device '{device_id}' not found. Available devices: {', '.join(available_ids)}"
+        return f"Error: Device '{device_id}' not found. Available devices: {registry.available_ids_str()}"
     
-    if not isinstance(device, ActuatorDevice):
+    if device.device_type != "actuator":
         return f"Error: Device '{device_id}' is not an actuator. It is a {device.device_type}."
+    if __debug__ and not isinstance(device, ActuatorDevice):
+        return f"Error: Device '{device_id}' is tagged as an actuator but is a {type(device).__name__}."
     
-    # Validate and execute the action
-    valid_actions = device.get_valid_actions()
-    if action not in valid_actions:
+    # Validate and execute the action; set_state checks against a frozenset
+    previous_state = device.current_state
+    if not device.set_state(action):
         return (
             f"Error: Invalid action '{action}' for device '{device_id}'.\n"
-            f"Valid actions: {', '.join(valid_actions)}"
+            f"Valid actions: {device.valid_actions_str}"
         )
     
-    previous_state = device.current_state
-    success = device.set_state(action)
-    timestamp = datetime.now().isoformat()
-    
-    if success:
-        return (
-            f"Device Control Successful:\n"
-            f"  Device ID: {device.device_id}\n"
-            f"  Type: {device.device_type}\n"
-            f"  Location: {device.location}\n"
-            f"  Previous State: {previous_state}\n"
-            f"  New State: {device.current_state}\n"
-            f"  Timestamp: {timestamp}"
-        )
-    else:
-        return f"Error: Failed to set device '{device_id}' to state '{action}'."
+    timestamp = now_iso()
+    return (
+        f"Device Control Successful:\n"
+        f"  Device ID: {device.device_id}\n"
+        f"  Type: {device.device_type}\n"
+        f"  Location: {device.location}\n"
+        f"  Previous State: {previous_state}\n"
+        f"  New State: {device.current_state}\n"
+        f"  Timestamp: {timestamp}"
+    )
 
 
 @tool
@@ -101,7 +158,7 @@ def list_devices() -> str:
         A formatted string listing all registered devices with their
         type, location, and relevant details.
     """
-    devices = default_registry.list_devices()
+    devices = get_default_registry().list_devices()
     
     if not devices:
         return "No devices registered in the system."
@@ -109,18 +166,13 @@ def list_devices() -> str:
     lines = ["Available IoT Devices:", "=" * 40]
     
     for device in devices:
-        lines.append(f"\nDevice ID: {device.device_id}")
-        lines.append(f"  Type: {device.device_type}")
-        lines.append(f"  Location: {device.location}")
-        
-        if isinstance(device, SensorDevice):
-            lines.append(f"  Unit: {device.unit}")
-            lines.append(f"  Range: {device.min_value} - {device.max_value}")
-        elif isinstance(device, ActuatorDevice):
-            lines.append(f"  Valid States: {', '.join(device.states)}")
-            lines.append(f"  Current State: {device.current_state}")
-    
-    lines.append("\n" + "=" * 40)
-    lines.append(f"Total: {len(devices)} device(s)")
+        if device.device_type == "sensor":
+            lines.append(_SENSOR_FMT.format(d=device))
+        elif device.device_type == "actuator":
+            lines.append(_ACTUATOR_FMT.format(d=device))
+        else:
+            lines.append(_DEVICE_FMT.format(d=device))
+    
+    lines.append(f"\n{'=' * 40}\nTotal: {len(devices)} device(s)")
     
     return "\n".join(lines)
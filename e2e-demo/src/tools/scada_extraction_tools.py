@@ -4,12 +4,211 @@ Provides tools for extracting validated, type-safe data from unstructured
 SCADA reports using Pydantic models for schema validation.
 """
 
-from typing import Optional
+import os
+import re
+from typing import Any, Dict, Iterator, Optional, Sequence
 from pydantic import ValidationError
 
 from strands import tool
 
-from ..models.scada_models import ProductionMetrics
+from ..models.scada_models import (
+    EQUIPMENT_STATUSES,
+    SEVERITY_LEVELS,
+    AlarmInfo,
+    EquipmentStatus,
+    ProductionMetrics,
+    SensorReading,
+)
+
+# Report patterns run on RE2 when google-re2 is installed, since it matches in
+# linear time whatever the input. Otherwise the third-party regex module is
+# used when present, and the stdlib re module as the last resort. None of the
+# patterns use backreferences, lookarounds or atomic groups, so all three
+# engines accept them unchanged.
+try:
+    import re2 as _regex
+except ImportError:
+    try:
+        import regex as _regex
+    except ImportError:
+        _regex = re
+
+# pyahocorasick, when installed, finds the keyword that starts every report
+# pattern so the patterns only run where a field can begin.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Values pulled out by the report patterns are already checked: the regexes
+# only capture well-formed IDs and numbers, status and severity are filtered
+# against the allowed values, and empty names and messages are skipped. The
+# parser therefore builds models with model_construct(). Set
+# EDGE_STRICT_VALIDATION=1 to run full Pydantic validation instead.
+_STRICT_VALIDATION = os.environ.get("EDGE_STRICT_VALIDATION", "").lower() in (
+    "1", "true", "yes"
+)
+
+
+# Allowed status and severity values, checked once per pattern match
+_VALID_STATUSES = frozenset(EQUIPMENT_STATUSES)
+_VALID_SEVERITIES = frozenset(SEVERITY_LEVELS)
+
+
+# Static tail of the validation error message
+_VALIDATION_HELP = (
+    "\n\n"
+    "Please provide a report with the following required fields:\n"
+    "  - line_id: Production line identifier\n"
+    "  - shift: Shift name (e.g., 'morning', 'afternoon', 'night')\n"
+    "  - units_produced: Number of units produced (non-negative integer)\n"
+    "  - units_target: Target units (non-negative integer)\n"
+    "  - efficiency_percent: Efficiency percentage (non-negative number)"
+)
+
+
+# Acknowledgement marks indexed by AlarmInfo.acknowledged
+_ACK_MAP = ("✗", "✓")
+
+
+def _compile(pattern: str) -> re.Pattern:
+    """Compile a case-insensitive report pattern with the selected engine."""
+    # Inline flag: re2.compile() has no flags argument and no IGNORECASE
+    return _regex.compile("(?i)" + pattern)
+
+
+def _compile_all(*patterns: str) -> tuple:
+    """Compile case-insensitive patterns, kept in the order they are tried."""
+    return tuple(_compile(pattern) for pattern in patterns)
+
+
+# Report patterns are written so that no two adjacent parts can match the
+# same characters: label separators ([:\s]) never overlap the value that
+# follows, names cannot start with the whitespace before them, free text is
+# limited to one line with [^\n] instead of a lazy ".+?" with an end-of-line
+# alternation, and IDs and numbers have bounded lengths. Matching stays
+# linear without atomic groups, which RE2 lacks.
+#
+# A bounded value must also end where the text does: each one is followed by
+# a part that cannot continue it, so an over-long value does not match at all
+# instead of being cut short. RE2 has no lookahead, so the field patterns end
+# with these one-character terminators. ":" cannot end a line ID, so "Line ID:"
+# never reads "ID" as the value.
+_ID_END = r"(?:[^A-Za-z0-9_:-]|$)"
+_INT_END = r"(?:\D|$)"
+_NUMBER_END = r"(?:[^\d.]|\.(?:\D|$)|$)"
+
+# Report field patterns, compiled once at import and tried in order
+_LINE_ID_PATTERNS = _compile_all(
+    r"(?:Production\s+)?Line(?:\s+ID)?[:\s]{1,16}([A-Za-z0-9_-]{1,64})" + _ID_END,
+    r"line_id[:\s]{1,16}([A-Za-z0-9_-]{1,64})" + _ID_END,
+)
+_SHIFT_PATTERNS = _compile_all(
+    r"Shift[:\s]{1,16}(\w{1,32})\b",
+)
+_UNITS_PRODUCED_PATTERNS = _compile_all(
+    r"Units\s+Produced[:\s]{1,16}(\d{1,12})" + _INT_END,
+    r"Produced[:\s]{1,16}(\d{1,12})" + _INT_END,
+    r"units_produced[:\s]{1,16}(\d{1,12})" + _INT_END,
+)
+_UNITS_TARGET_PATTERNS = _compile_all(
+    r"(?:Units\s+)?Target[:\s]{1,16}(\d{1,12})" + _INT_END,
+    r"units_target[:\s]{1,16}(\d{1,12})" + _INT_END,
+)
+_EFFICIENCY_PATTERNS = _compile_all(
+    r"Efficiency(?:\s+Percent)?[:\s]{1,16}(\d{1,12}(?:\.\d{1,12})?)" + _NUMBER_END,
+    r"efficiency_percent[:\s]{1,16}(\d{1,12}(?:\.\d{1,12})?)" + _NUMBER_END,
+    r"efficiency[:\s]{1,16}(\d{1,12}(?:\.\d{1,12})?)" + _NUMBER_END,
+)
+
+# Primary pattern of every field in one alternation, so a single scan finds
+# them all. Each branch has one named group, reported by Match.lastgroup;
+# fields it misses fall back to the per-field pattern lists above.
+_FIELDS_RE = _compile(
+    r"(?:Production\s+)?Line(?:\s+ID)?[:\s]{1,16}(?P<line_id>[A-Za-z0-9_-]{1,64})"
+    + _ID_END
+    + r"|Shift[:\s]{1,16}(?P<shift>\w{1,32})\b"
+    + r"|Units\s+Produced[:\s]{1,16}(?P<units_produced>\d{1,12})" + _INT_END
+    + r"|(?:Units\s+)?Target[:\s]{1,16}(?P<units_target>\d{1,12})" + _INT_END
+    + r"|Efficiency(?:\s+Percent)?[:\s]{1,16}"
+    + r"(?P<efficiency_percent>\d{1,12}(?:\.\d{1,12})?)" + _NUMBER_END
+)
+
+# Equipment, sensor and alarm lines in one alternation, scanned in a single
+# pass. The outer named group of each branch is reported by Match.lastgroup.
+# Sensor and alarm IDs end at the "=", ":" or "(" that must follow them. An
+# equipment ID ends at whitespace or an en dash, since a hyphen could belong
+# to the ID. A unit may start with a digit or "." only after a blank, and it
+# is stripped of that blank when read.
+_EQUIP_BLOCK_RE = _compile(
+    # "Equipment: ID - Name (status)"
+    r"(?P<equipment>Equipment[:\s]{1,16}(?P<equipment_id>[A-Za-z0-9_-]{1,64})"
+    r"(?:[ \t]+[-–]|–)[ \t]*(?P<name>[^(\s][^(\n]{0,127})\((?P<status>\w{1,32})\))"
+    # "Sensor: ID = value unit" or "Sensor: ID: value unit"
+    r"|(?P<sensor>Sensor[:\s]{1,16}(?P<sensor_id>[A-Za-z0-9_-]{1,64})[ \t]*[=:][ \t]*"
+    r"(?P<value>\d{1,12}(?:\.\d{1,12})?)"
+    r"(?P<unit>[ \t]+\S{1,32}|[^\s\d.]\S{0,31})(?:\s|$))"
+    # "Alarm: ID (severity) - message"
+    r"|(?P<alarm>Alarm[:\s]{1,16}(?P<alarm_id>[A-Za-z0-9_-]{1,64})[ \t]*"
+    r"\((?P<severity>\w{1,32})\)[ \t]*[-–:][ \t]*(?P<message>[^\n]*))"
+)
+
+
+def _build_anchors(*keywords: str) -> Any:
+    """Build an Aho-Corasick automaton over lowercase pattern keywords.
+    
+    Args:
+        *keywords: Keywords that every match of a pattern starts with
+        
+    Returns:
+        Automaton yielding (end_index, keyword) pairs, or None when
+        pyahocorasick is not installed
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+# Keywords that open each branch of the combined patterns. "Production Line"
+# is anchored on "line": its optional prefix never changes the captured value.
+_FIELD_ANCHORS = _build_anchors("line", "shift", "units", "target", "efficiency")
+_EQUIP_ANCHORS = _build_anchors("equipment", "sensor", "alarm")
+
+
+def _iter_matches(pattern: re.Pattern, text: str, anchors: Any) -> Iterator[Any]:
+    """Yield the non-overlapping matches of a combined report pattern.
+    
+    With an anchor automaton, the text is walked once for keywords and the
+    pattern is only tried at positions where one starts; otherwise this is
+    pattern.finditer(text).
+    
+    Args:
+        pattern: Combined report pattern
+        text: Text to search
+        anchors: Automaton from _build_anchors(), or None
+        
+    Yields:
+        Matches in text order, as pattern.finditer() would
+    """
+    folded = text.casefold() if anchors is not None else ""
+    # Case folding that changes the length would shift every anchor offset
+    if len(folded) != len(text) or not text:
+        yield from pattern.finditer(text)
+        return
+    
+    pos = 0
+    for end_index, keyword in anchors.iter(folded):
+        start = end_index - len(keyword) + 1
+        if start < pos:
+            continue
+        match = pattern.match(text, start)
+        if match:
+            pos = match.end()
+            yield match
 
 
 @tool
@@ -19,7 +218,8 @@ def extract_scada_metrics(report_text: str) -> str:
     This tool parses unstructured SCADA report text and extracts validated
     production metrics conforming to the ProductionMetrics Pydantic schema.
     The extraction uses pattern matching and heuristics to identify key
-    metrics from the report text.
+    metrics from the report text. Reports exported as a JSON object are
+    decoded and validated directly against the schema.
     
     Args:
         report_text: The raw text content of a SCADA report containing
@@ -42,8 +242,12 @@ def extract_scada_metrics(report_text: str) -> str:
         return "Error: Empty report text provided. Please provide a valid SCADA report."
     
     try:
-        # Parse the report text to extract metrics
-        metrics = _parse_scada_report(report_text)
+        # JSON exports skip pattern matching and are validated in one pass
+        if report_text.lstrip().startswith("{"):
+            metrics = ProductionMetrics.from_json(report_text)
+        else:
+            # Parse the report text to extract metrics
+            metrics = _parse_scada_report(report_text)
         
         # Format the extracted metrics for display
         return _format_production_metrics(metrics)
@@ -58,13 +262,7 @@ def extract_scada_metrics(report_text: str) -> str:
         
         return (
             "Error: Extracted data failed validation.\n"
-            "Validation errors:\n" + "\n".join(error_details) + "\n\n"
-            "Please provide a report with the following required fields:\n"
-            "  - line_id: Production line identifier\n"
-            "  - shift: Shift name (e.g., 'morning', 'afternoon', 'night')\n"
-            "  - units_produced: Number of units produced (non-negative integer)\n"
-            "  - units_target: Target units (non-negative integer)\n"
-            "  - efficiency_percent: Efficiency percentage (non-negative number)"
+            "Validation errors:\n" + "\n".join(error_details) + _VALIDATION_HELP
         )
     except ExtractionError as e:
         return f"Error: Failed to extract metrics from report. {str(e)}"
@@ -92,76 +290,37 @@ def _parse_scada_report(report_text: str) -> ProductionMetrics:
         report_text: Raw SCADA report text
         
     Returns:
-        Validated ProductionMetrics object
+        ProductionMetrics object built from the extracted values
         
     Raises:
         ExtractionError: If required fields cannot be extracted
         ValidationError: If extracted data fails Pydantic validation
+            (only raised with EDGE_STRICT_VALIDATION)
     """
-    import re
-    
     text = report_text.strip()
+    fields = _scan_fields(text)
     
-    # Extract line_id
-    line_id = _extract_field(
-        text,
-        [
-            r"(?:Production\s+)?Line(?:\s+ID)?[:\s]+([A-Za-z0-9_-]+)",
-            r"line_id[:\s]+([A-Za-z0-9_-]+)",
-        ],
-        "line_id"
+    line_id = fields.get("line_id") or _extract_field(
+        text, _LINE_ID_PATTERNS, "line_id"
     )
-    
-    # Extract shift
-    shift = _extract_field(
-        text,
-        [
-            r"Shift[:\s]+(\w+)",
-            r"shift[:\s]+(\w+)",
-        ],
-        "shift"
-    )
-    
-    # Extract units_produced
-    units_produced_str = _extract_field(
-        text,
-        [
-            r"Units\s+Produced[:\s]+(\d+)",
-            r"Produced[:\s]+(\d+)",
-            r"units_produced[:\s]+(\d+)",
-        ],
-        "units_produced"
+    shift = fields.get("shift") or _extract_field(
+        text, _SHIFT_PATTERNS, "shift"
     )
-    units_produced = int(units_produced_str)
-    
-    # Extract units_target
-    units_target_str = _extract_field(
-        text,
-        [
-            r"(?:Units\s+)?Target[:\s]+(\d+)",
-            r"units_target[:\s]+(\d+)",
-        ],
-        "units_target"
-    )
-    units_target = int(units_target_str)
-    
-    # Extract efficiency_percent
-    efficiency_str = _extract_field(
-        text,
-        [
-            r"Efficiency(?:\s+Percent)?[:\s]+(\d+(?:\.\d+)?)\s*%?",
-            r"efficiency_percent[:\s]+(\d+(?:\.\d+)?)",
-            r"efficiency[:\s]+(\d+(?:\.\d+)?)",
-        ],
-        "efficiency_percent"
-    )
-    efficiency_percent = float(efficiency_str)
+    units_produced = int(fields.get("units_produced") or _extract_field(
+        text, _UNITS_PRODUCED_PATTERNS, "units_produced"
+    ))
+    units_target = int(fields.get("units_target") or _extract_field(
+        text, _UNITS_TARGET_PATTERNS, "units_target"
+    ))
+    efficiency_percent = float(fields.get("efficiency_percent") or _extract_field(
+        text, _EFFICIENCY_PATTERNS, "efficiency_percent"
+    ))
     
     # Extract optional equipment status (if present)
     equipment = _extract_equipment_status(text)
     
-    # Create and validate the ProductionMetrics object
-    return ProductionMetrics(
+    return _build(
+        ProductionMetrics,
         line_id=line_id,
         shift=shift,
         units_produced=units_produced,
@@ -171,12 +330,50 @@ def _parse_scada_report(report_text: str) -> ProductionMetrics:
     )
 
 
-def _extract_field(text: str, patterns: list[str], field_name: str) -> str:
+def _build(model: type, **data: Any) -> Any:
+    """Build a SCADA model from values extracted by the report patterns.
+    
+    Args:
+        model: SCADA model class to build
+        **data: Field values for the model
+        
+    Returns:
+        Model instance, validated only when EDGE_STRICT_VALIDATION is set
+    """
+    if _STRICT_VALIDATION:
+        return model(**data)
+    # trusted: regex-validated
+    return model.model_construct(**data)
+
+
+def _scan_fields(text: str) -> Dict[str, str]:
+    """Find the first value of each report field in one pass over the text.
+    
+    Args:
+        text: Text to search
+        
+    Returns:
+        Mapping of field name to its first matched value; fields that were
+        not found are absent
+    """
+    fields: Dict[str, str] = {}
+    for match in _iter_matches(_FIELDS_RE, text, _FIELD_ANCHORS):
+        fields.setdefault(match.lastgroup, match.group(match.lastgroup))
+        if len(fields) == _FIELDS_RE.groups:
+            break
+    return fields
+
+
+def _extract_field(
+    text: str,
+    compiled_patterns: Sequence[re.Pattern],
+    field_name: str
+) -> str:
     """Extract a field value using multiple regex patterns.
     
     Args:
         text: Text to search
-        patterns: List of regex patterns to try (in order)
+        compiled_patterns: Compiled regex patterns to try (in order)
         field_name: Name of the field (for error messages)
         
     Returns:
@@ -185,10 +382,8 @@ def _extract_field(text: str, patterns: list[str], field_name: str) -> str:
     Raises:
         ExtractionError: If no pattern matches
     """
-    import re
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in compiled_patterns:
+        match = pattern.search(text)
         if match:
             return match.group(1).strip()
     
@@ -202,7 +397,10 @@ def _extract_equipment_status(text: str) -> list:
     """Extract equipment status information from report text.
     
     This is an optional extraction - returns empty list if no
-    equipment information is found.
+    equipment information is found. Equipment, sensor and alarm lines are
+    read in a single pass; each sensor reading and alarm belongs to the
+    equipment line above it. Readings and alarms listed before the first
+    equipment line belong to the first equipment.
     
     Args:
         text: Report text to parse
@@ -210,33 +408,46 @@ def _extract_equipment_status(text: str) -> list:
     Returns:
         List of EquipmentStatus objects (may be empty)
     """
-    import re
-    from ..models.scada_models import EquipmentStatus, SensorReading, AlarmInfo
-    
-    equipment_list = []
-    
-    # Look for equipment blocks in the text
-    # Pattern: "Equipment: ID - Name (status)"
-    equipment_pattern = r"Equipment[:\s]+([A-Za-z0-9_-]+)\s*[-–]\s*([^(]+)\s*\((\w+)\)"
-    
-    for match in re.finditer(equipment_pattern, text, re.IGNORECASE):
-        equipment_id = match.group(1).strip()
-        name = match.group(2).strip()
-        status_str = match.group(3).strip().lower()
-        
-        # Validate status
-        valid_statuses = ["running", "stopped", "maintenance", "fault"]
-        if status_str not in valid_statuses:
-            continue
+    # (equipment_id, name, status, readings, alarms) per valid equipment line
+    blocks = []
+    leading_readings = []
+    leading_alarms = []
+    readings = leading_readings
+    alarms = leading_alarms
+    
+    for match in _iter_matches(_EQUIP_BLOCK_RE, text, _EQUIP_ANCHORS):
+        kind = match.lastgroup
         
-        # Extract sensor readings for this equipment (if any)
-        readings = _extract_sensor_readings(text, equipment_id)
+        if kind == "equipment":
+            name = match.group("name").strip()
+            status_str = match.group("status").lower()
+            # Readings and alarms under skipped equipment are dropped with it
+            readings = []
+            alarms = []
+            if status_str in _VALID_STATUSES and name:
+                blocks.append(
+                    (match.group("equipment_id"), name, status_str, readings, alarms)
+                )
         
-        # Extract alarms for this equipment (if any)
-        alarms = _extract_alarms(text, equipment_id)
+        elif kind == "sensor":
+            reading = _build_reading(match)
+            if reading is not None:
+                readings.append(reading)
         
+        else:
+            alarm = _build_alarm(match)
+            if alarm is not None:
+                alarms.append(alarm)
+    
+    if blocks:
+        blocks[0][3][:0] = leading_readings
+        blocks[0][4][:0] = leading_alarms
+    
+    equipment_list = []
+    for equipment_id, name, status_str, readings, alarms in blocks:
         try:
-            equipment = EquipmentStatus(
+            equipment = _build(
+                EquipmentStatus,
                 equipment_id=equipment_id,
                 name=name,
                 status=status_str,
@@ -251,81 +462,52 @@ def _extract_equipment_status(text: str) -> list:
     return equipment_list
 
 
-def _extract_sensor_readings(text: str, equipment_id: str) -> list:
-    """Extract sensor readings associated with equipment.
+def _build_reading(match: re.Match) -> Optional[SensorReading]:
+    """Build a SensorReading from a sensor line match.
     
     Args:
-        text: Report text
-        equipment_id: Equipment ID to find readings for
+        match: Match of the sensor branch of _EQUIP_BLOCK_RE
         
     Returns:
-        List of SensorReading objects
+        SensorReading object, or None if it fails validation
     """
-    import re
-    from ..models.scada_models import SensorReading
-    
-    readings = []
-    
-    # Pattern: "Sensor: ID = value unit" or "sensor_id: value unit"
-    sensor_pattern = r"Sensor[:\s]+([A-Za-z0-9_-]+)\s*[=:]\s*(\d+(?:\.\d+)?)\s*(\S+)"
-    
-    for match in re.finditer(sensor_pattern, text, re.IGNORECASE):
-        sensor_id = match.group(1).strip()
-        value = float(match.group(2))
-        unit = match.group(3).strip()
-        
-        try:
-            reading = SensorReading(
-                sensor_id=sensor_id,
-                value=value,
-                unit=unit
-            )
-            readings.append(reading)
-        except ValidationError:
-            continue
-    
-    return readings
+    try:
+        return _build(
+            SensorReading,
+            sensor_id=match.group("sensor_id"),
+            value=float(match.group("value")),
+            unit=match.group("unit").lstrip()
+        )
+    except ValidationError:
+        return None
 
 
-def _extract_alarms(text: str, equipment_id: str) -> list:
-    """Extract alarm information associated with equipment.
+def _build_alarm(match: re.Match) -> Optional[AlarmInfo]:
+    """Build an AlarmInfo from an alarm line match.
     
     Args:
-        text: Report text
-        equipment_id: Equipment ID to find alarms for
+        match: Match of the alarm branch of _EQUIP_BLOCK_RE
         
     Returns:
-        List of AlarmInfo objects
+        AlarmInfo object, or None if the severity is unknown, the message is
+        empty, or it fails validation
     """
-    import re
-    from ..models.scada_models import AlarmInfo
+    severity_str = match.group("severity").lower()
+    message = match.group("message").strip()
     
-    alarms = []
+    # Validate severity
+    if severity_str not in _VALID_SEVERITIES or not message:
+        return None
     
-    # Pattern: "Alarm: ID (severity) - message"
-    alarm_pattern = r"Alarm[:\s]+([A-Za-z0-9_-]+)\s*\((\w+)\)\s*[-–:]\s*(.+?)(?:\n|$)"
-    
-    for match in re.finditer(alarm_pattern, text, re.IGNORECASE):
-        alarm_id = match.group(1).strip()
-        severity_str = match.group(2).strip().lower()
-        message = match.group(3).strip()
-        
-        # Validate severity
-        valid_severities = ["low", "medium", "high", "critical"]
-        if severity_str not in valid_severities:
-            continue
-        
-        try:
-            alarm = AlarmInfo(
-                alarm_id=alarm_id,
-                severity=severity_str,
-                message=message
-            )
-            alarms.append(alarm)
-        except ValidationError:
-            continue
-    
-    return alarms
+    try:
+        return _build(
+            AlarmInfo,
+            alarm_id=match.group("alarm_id"),
+            severity=severity_str,
+            message=message
+        )
+    except ValidationError:
+        return None
 
 
 def _format_production_metrics(metrics: ProductionMetrics) -> str:
@@ -363,7 +545,7 @@ def _format_production_metrics(metrics: ProductionMetrics) -> str:
             if equip.active_alarms:
                 lines.append("      Active Alarms:")
                 for alarm in equip.active_alarms:
-                    ack_status = "✓" if alarm.acknowledged else "✗"
+                    ack_status = _ACK_MAP[alarm.acknowledged]
                     lines.append(f"        - [{alarm.severity.upper()}] {alarm.alarm_id}: {alarm.message} (Ack: {ack_status})")
     
     lines.append("\n" + "=" * 50)
@@ -12,15 +12,22 @@ Requirements:
 
 import streamlit as st
 from pathlib import Path
+from typing import TYPE_CHECKING
 import sys
+import threading
 
 # Add the e2e-demo directory to path so we can import src as a package
 app_dir = Path(__file__).parent.absolute()
 if str(app_dir) not in sys.path:
     sys.path.insert(0, str(app_dir))
 
-from src.config import EdgeAgentConfig
-from src.edge_operator_agent import EdgeOperatorAgent
+# The agent pulls in Strands and the model clients; it is imported when the
+# first agent is built so the UI can render before those are loaded
+if TYPE_CHECKING:
+    from src.edge_operator_agent import EdgeOperatorAgent
+
+# Speaker labels for messages in the rendered chat history
+_ROLE_LABELS = {"user": "🧑 **You**", "assistant": "🏭 **Agent**"}
 
 
 def init_session_state():
@@ -38,19 +45,59 @@ def init_session_state():
         st.session_state.session_id = "edge-operator-001"
 
 
-def get_agent() -> EdgeOperatorAgent:
+@st.cache_resource(show_spinner=False)
+def _build_agent(session_id: str) -> "EdgeOperatorAgent":
+    """Build the EdgeOperatorAgent for a session ID.
+    
+    Cached across reruns and browser tabs, so models, the semantic cache and
+    the database connection are initialized once per session ID. Tabs on the
+    same session ID share the agent, so calls into it are made while holding
+    _agent_lock() for that session ID.
+    
+    Args:
+        session_id: Conversation session identifier
+        
+    Returns:
+        EdgeOperatorAgent: The shared agent instance for the session ID
+    """
+    from src.config import EdgeAgentConfig
+    from src.edge_operator_agent import EdgeOperatorAgent
+    
+    config = EdgeAgentConfig(
+        session_id=session_id,
+        sessions_dir="./edge_sessions",
+        db_path="./edge_telemetry.db"
+    )
+    return EdgeOperatorAgent(config)
+
+
+@st.cache_resource(show_spinner=False)
+def _agent_lock(session_id: str) -> threading.Lock:
+    """Lock serializing turns on the agent shared by a session ID.
+    
+    A strands Agent raises if it is invoked while another invocation is
+    running, so concurrent chats from several tabs wait for each other.
+    
+    Args:
+        session_id: Conversation session identifier
+        
+    Returns:
+        threading.Lock: The lock for the session ID's agent
+    """
+    return threading.Lock()
+
+
+def get_agent() -> "EdgeOperatorAgent":
     """Get or create the EdgeOperatorAgent instance.
     
     Returns:
         EdgeOperatorAgent: The agent instance from session state
     """
     if st.session_state.agent is None:
-        config = EdgeAgentConfig(
-            session_id=st.session_state.session_id,
-            sessions_dir="./edge_sessions",
-            db_path="./edge_telemetry.db"
-        )
-        st.session_state.agent = EdgeOperatorAgent(config)
+        agent = _build_agent(st.session_state.session_id)
+        # The agent may be shared with another tab that switched its mode
+        st.session_state.model_mode = agent.current_mode
+        st.session_state.agent = agent
     
     return st.session_state.agent
 
@@ -85,7 +132,8 @@ def render_sidebar():
         
         if new_mode != st.session_state.model_mode:
             agent = get_agent()
-            success, message = agent.set_model_mode(new_mode)
+            with _agent_lock(st.session_state.session_id):
+                success, message = agent.set_model_mode(new_mode)
             
             if success:
                 st.session_state.model_mode = new_mode
@@ -121,9 +169,12 @@ def render_sidebar():
             st.session_state.messages = []  # Clear chat history for new session
             st.rerun()
         
-def stream_agent_response(agent: EdgeOperatorAgent, prompt: str):
+def stream_agent_response(agent: "EdgeOperatorAgent", prompt: str):
     """Generator that yields text chunks from the agent's streaming response.
     
+    Drives the agent's async stream on a private event loop in the calling
+    thread, so each chunk is yielded as soon as it is produced.
+    
     Args:
         agent: The EdgeOperatorAgent instance
         prompt: The user's input message
@@ -132,49 +183,49 @@ def stream_agent_response(agent: EdgeOperatorAgent, prompt: str):
         Text chunks as they are generated by the agent
     """
     import asyncio
-    import threading
-    import queue
-    
-    text_queue = queue.Queue()
-    done_event = threading.Event()
-    error_holder = [None]  # Use list to allow modification in nested function
-    
-    async def async_stream():
-        """Async function to stream events and put text in queue."""
-        try:
-            async for text in agent.stream_chat(prompt):
-                text_queue.put(text)
-        except Exception as e:
-            error_holder[0] = str(e)
-        finally:
-            done_event.set()
-    
-    def run_async():
-        """Run the async stream in a new event loop."""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            loop.run_until_complete(async_stream())
-        finally:
-            loop.close()
-    
-    # Start async streaming in background thread
-    thread = threading.Thread(target=run_async, daemon=True)
-    thread.start()
-    
-    # Yield chunks as they arrive
-    while not done_event.is_set() or not text_queue.empty():
-        try:
-            chunk = text_queue.get(timeout=0.1)
-            yield chunk
-        except queue.Empty:
-            continue
     
-    thread.join(timeout=1.0)
+    loop = asyncio.new_event_loop()
+    stream = agent.stream_chat(prompt)
+    error = None
+    try:
+        while True:
+            try:
+                chunk = loop.run_until_complete(stream.__anext__())
+            except StopAsyncIteration:
+                break
+            except Exception as e:
+                error = str(e)
+                break
+            yield chunk
+    finally:
+        # Also runs if the consumer stops early, so the stream is closed on
+        # the loop it was started on
+        loop.run_until_complete(stream.aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
     
     # If there was an error, yield it
-    if error_holder[0]:
-        yield f"\n\nError: {error_holder[0]}"
+    if error:
+        yield f"\n\nError: {error}"
+
+
+def history_markdown(messages: list) -> str:
+    """Render the chat history as a single markdown document.
+    
+    Each message's markdown is built once and stored on the message under
+    "rendered", so reruns only join the cached pieces.
+    
+    Args:
+        messages: Chat history as dicts with "role" and "content" keys
+        
+    Returns:
+        Markdown for all messages, separated by horizontal rules
+    """
+    for message in messages:
+        if "rendered" not in message:
+            label = _ROLE_LABELS.get(message["role"], message["role"])
+            message["rendered"] = f"{label}\n\n{message['content']}"
+    return "\n\n---\n\n".join(message["rendered"] for message in messages)
 
 
 def render_chat_interface():
@@ -186,13 +237,11 @@ def render_chat_interface():
     st.title("🏭 Edge Operator Agent")
     st.caption("AI-powered assistant for industrial equipment management")
     
-    # Display chat messages
-    for message in st.session_state.messages:
-        role = message["role"]
-        content = message["content"]
-        
-        with st.chat_message(role):
-            st.markdown(content)
+    # Display earlier messages as one markdown block instead of one chat
+    # widget per message; only the new exchange below gets chat widgets
+    if st.session_state.messages:
+        with st.container():
+            st.markdown(history_markdown(st.session_state.messages))
     
     # Chat input
     if prompt := st.chat_input("Ask about sensors, equipment, or telemetry data..."):
@@ -207,18 +256,20 @@ def render_chat_interface():
         with st.chat_message("assistant"):
             agent = get_agent()
             
-            try:
-                # Use st.write_stream for streaming response
-                response = st.write_stream(stream_agent_response(agent, prompt))
-                if not response:
-                    # Fallback to non-streaming if streaming returns empty
-                    response = agent.chat(prompt)
+            # Wait for any turn another tab is running on the shared agent
+            with _agent_lock(st.session_state.session_id):
+                try:
+                    # Use st.write_stream for streaming response
+                    response = st.write_stream(stream_agent_response(agent, prompt))
+                    if not response:
+                        # Fallback to non-streaming if streaming returns empty
+                        response = agent.chat(prompt)
+                        st.markdown(response)
+                except Exception as e:
+                    # Fallback to non-streaming chat on error
+                    with st.spinner("Processing..."):
+                        response = agent.chat(prompt)
                     st.markdown(response)
-            except Exception as e:
-                # Fallback to non-streaming chat on error
-                with st.spinner("Processing..."):
-                    response = agent.chat(prompt)
-                st.markdown(response)
         
         # Add assistant response to chat history
         if response:
@@ -0,0 +1,120 @@
+"""Tests for the src.app Streamlit frontend.
+
+Verifies that the cached agent builder produces a valid configuration,
+that browser sessions sharing a session ID share one lock around the agent,
+and that uploaded files are deleted whether or not indexing can start.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src import app
+from src.config import EdgeAgentConfig
+
+
+class FakeAgent:
+    """EdgeOperatorAgent stand-in that records its config and lifecycle."""
+    
+    def __init__(self, config):
+        self.config = config
+        self.entered = False
+    
+    def __enter__(self):
+        self.entered = True
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class FakeDocSearch:
+    """Document search stand-in that records the files it indexed."""
+    
+    def __init__(self):
+        self.indexed = []
+    
+    def index_document(self, path):
+        self.indexed.append(path)
+        return "Successfully indexed"
+
+
+class TestBuildAgent:
+    """Tests for the cached agent builder."""
+    
+    @pytest.fixture(autouse=True)
+    def fake_agent(self, monkeypatch):
+        monkeypatch.setattr(app, "EdgeOperatorAgent", FakeAgent)
+        app._build_agent.clear()
+        yield
+        app._build_agent.clear()
+    
+    def test_builds_started_agent(self, tmp_path):
+        """Test that the agent is built from a valid config and started."""
+        agent = app._build_agent(
+            session_id="app-test",
+            sessions_dir=str(tmp_path / "sessions"),
+            db_path=str(tmp_path / "telemetry.db")
+        )
+        
+        assert agent.entered
+        assert agent.config == EdgeAgentConfig(
+            session_id="app-test",
+            sessions_dir=str(tmp_path / "sessions"),
+            db_path=str(tmp_path / "telemetry.db")
+        )
+    
+    def test_agent_cached_per_config(self, tmp_path):
+        """Test that the same config returns the same agent."""
+        kwargs = {
+            "session_id": "app-test",
+            "sessions_dir": str(tmp_path / "sessions"),
+            "db_path": str(tmp_path / "telemetry.db"),
+        }
+        
+        assert app._build_agent(**kwargs) is app._build_agent(**kwargs)
+        assert app._build_agent(**{**kwargs, "session_id": "other"}) is not (
+            app._build_agent(**kwargs)
+        )
+
+
+class TestAgentLock:
+    """Tests for the per-session agent lock."""
+    
+    def test_one_lock_per_session(self):
+        """Test that a session ID always maps to the same lock."""
+        app._agent_lock.clear()
+        
+        assert app._agent_lock("a") is app._agent_lock("a")
+        assert app._agent_lock("a") is not app._agent_lock("b")
+
+
+class TestSubmitIndexJob:
+    """Tests for background document indexing."""
+    
+    @pytest.fixture
+    def upload(self, tmp_path):
+        path = tmp_path / "manual.txt"
+        path.write_text("Pump maintenance")
+        return str(path)
+    
+    def test_file_deleted_after_indexing(self, upload):
+        """Test that the uploaded copy is indexed and then deleted."""
+        agent = FakeAgent(config=None)
+        agent.doc_search = FakeDocSearch()
+        
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            result = app._submit_index_job(pool, agent, upload).result()
+        
+        assert result == "Successfully indexed"
+        assert agent.doc_search.indexed == [upload]
+        assert not os.path.exists(upload)
+    
+    def test_file_deleted_when_job_cannot_start(self, upload):
+        """Test that the uploaded copy is deleted if indexing is unavailable."""
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            with pytest.raises(AttributeError):
+                app._submit_index_job(pool, FakeAgent(config=None), upload)
+        
+        assert not os.path.exists(upload)
@@ -0,0 +1,475 @@
+"""Tests for the telemetry database tools.
+
+Verifies the direct SQLite connection setup and the insert path that
+bypasses the MCP server.
+"""
+
+import gc
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import weakref
+from datetime import datetime
+from contextlib import closing
+
+import pytest
+
+from src.tools import database_tools
+from src.tools.database_tools import (
+    DatabaseTools,
+    _describe_filters,
+    _inline_params,
+    _now_iso,
+    _where_clause,
+)
+
+
+@pytest.fixture
+def db_tools():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tools = DatabaseTools(db_path=os.path.join(tmpdir, "telemetry.db"))
+        yield tools
+        tools.__exit__(None, None, None)
+
+
+def fetch_rows(db_path):
+    with closing(sqlite3.connect(db_path)) as conn:
+        return conn.execute(
+            "SELECT device_id, metric_type, value, unit, timestamp "
+            "FROM device_telemetry ORDER BY id"
+        ).fetchall()
+
+
+class TestDatabaseSetup:
+    """Tests for database configuration in DatabaseTools."""
+    
+    def test_enables_wal_mode(self, db_tools):
+        """Test that the database is switched to WAL journaling."""
+        _ = db_tools.connection
+        
+        with closing(sqlite3.connect(db_tools.db_path)) as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+    
+    def test_creates_database_directory(self):
+        """Test that a missing database directory is created."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "data", "telemetry.db")
+            tools = DatabaseTools(db_path=db_path)
+            
+            tools.connection.close()
+            
+            assert os.path.exists(db_path)
+    
+    def test_creates_telemetry_table(self, db_tools):
+        """Test that the schema exists as soon as the tools are created."""
+        assert fetch_rows(db_tools.db_path) == []
+    
+    def test_import_does_not_load_strands(self):
+        """Test that importing the module leaves strands unloaded."""
+        script = (
+            "import sys\n"
+            "import src.tools.database_tools\n"
+            "assert not [m for m in sys.modules if m.startswith(('strands', 'mcp'))]\n"
+        )
+        
+        subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            check=True
+        )
+
+
+class TestQueryFilters:
+    """Tests for building query filters."""
+    
+    def test_no_filters(self):
+        """Test that unset filters produce no WHERE clause."""
+        filters = dict.fromkeys(["device_id", "metric_type", "start_time", "end_time"])
+        
+        assert _where_clause(filters) == ("", [])
+        assert _describe_filters(filters) == "all records"
+    
+    def test_set_filters_in_order(self):
+        """Test that only set filters are combined, in a stable order."""
+        filters = {
+            "device_id": "temp-sensor",
+            "metric_type": None,
+            "start_time": "2024-01-01",
+            "end_time": "",
+        }
+        
+        assert _where_clause(filters) == (
+            "WHERE device_id = ? AND timestamp >= ?",
+            ["temp-sensor", "2024-01-01"]
+        )
+        assert _describe_filters(filters) == "device_id='temp-sensor', from 2024-01-01"
+    
+    def test_inline_params_escapes_literals(self):
+        """Test that values inlined for the MCP server are escaped."""
+        query = _inline_params(
+            "SELECT * FROM t WHERE a = ? AND b = ? LIMIT ?",
+            ["x' OR '1'='1", 2.5, 10]
+        )
+        
+        assert query == "SELECT * FROM t WHERE a = 'x'' OR ''1''=''1' AND b = 2.5 LIMIT 10"
+
+
+class TestTimestamps:
+    """Tests for the cached timestamp formatter."""
+    
+    def test_matches_datetime_isoformat(self):
+        """Test that timestamps parse as local ISO times close to now."""
+        before = datetime.now()
+        stamp = _now_iso()
+        after = datetime.now()
+        
+        parsed = datetime.fromisoformat(stamp)
+        assert before.replace(microsecond=0) <= parsed <= after
+        assert len(stamp) == len("2024-01-01T00:00:00.000000")
+    
+    def test_timestamps_sort_in_order(self):
+        """Test that successive timestamps never go backwards."""
+        stamps = [_now_iso() for _ in range(1000)]
+        
+        assert stamps == sorted(stamps)
+
+
+class TestLogTelemetry:
+    """Tests for writing telemetry through the direct connection."""
+    
+    def test_log_single_reading(self, db_tools):
+        """Test that a single reading is stored with bound parameters."""
+        result = db_tools.log_telemetry(
+            device_id="temp-sensor",
+            metric_type="temperature",
+            value=21.5,
+            unit="°C",
+            timestamp="2024-01-01T00:00:00"
+        )
+        
+        db_tools.flush()
+        
+        assert result.startswith("Telemetry logged successfully")
+        assert fetch_rows(db_tools.db_path) == [
+            ("temp-sensor", "temperature", 21.5, "°C", "2024-01-01T00:00:00")
+        ]
+    
+    def test_values_are_not_interpolated(self, db_tools):
+        """Test that quotes in values are stored verbatim."""
+        db_tools.log_telemetry(
+            device_id="o'brien",
+            metric_type="temperature",
+            value=1.0,
+            unit="°C"
+        )
+        db_tools.flush()
+        
+        assert fetch_rows(db_tools.db_path)[0][0] == "o'brien"
+    
+    def test_buffered_strings_are_interned(self, db_tools, monkeypatch):
+        """Test that repeated readings share their identifier strings."""
+        monkeypatch.setattr(db_tools, "_start_flusher", lambda: None)
+        for _ in range(2):
+            db_tools.log_telemetry(
+                device_id="".join(["temp", "-sensor"]),
+                metric_type="temperature",
+                value=1.0,
+                unit="°C"
+            )
+        
+        first, second = db_tools._pending
+        assert first[0] is second[0]
+    
+    def test_buffered_rows_flushed_in_background(self, db_tools):
+        """Test that single readings are written within the flush interval."""
+        db_tools.log_telemetry(
+            device_id="temp-sensor",
+            metric_type="temperature",
+            value=21.5,
+            unit="°C"
+        )
+        
+        time.sleep(db_tools.FLUSH_INTERVAL * 10)
+        
+        assert len(fetch_rows(db_tools.db_path)) == 1
+    
+    def test_flush_timer_ends_with_empty_buffer(self, db_tools):
+        """Test that no flush thread keeps running or holds the instance."""
+        db_tools.log_telemetry(
+            device_id="temp-sensor",
+            metric_type="temperature",
+            value=21.5,
+            unit="°C"
+        )
+        timer = db_tools._flush_timer
+        
+        timer.join(db_tools.FLUSH_INTERVAL * 10)
+        
+        assert not timer.is_alive()
+        assert db_tools._flush_timer is None
+        assert len(fetch_rows(db_tools.db_path)) == 1
+    
+    def test_idle_instance_collected(self, tmp_path):
+        """Test that an instance without pending rows can be garbage collected."""
+        tools = DatabaseTools(db_path=str(tmp_path / "telemetry.db"))
+        tools.log_telemetry("temp-sensor", "temperature", 21.5, "°C")
+        tools._flush_timer.join(tools.FLUSH_INTERVAL * 10)
+        ref = weakref.ref(tools)
+        
+        del tools
+        gc.collect()
+        
+        assert ref() is None
+    
+    def test_full_buffer_flushes_immediately(self, db_tools, monkeypatch):
+        """Test that reaching FLUSH_ROWS writes the batch synchronously."""
+        monkeypatch.setattr(db_tools, "FLUSH_ROWS", 3)
+        monkeypatch.setattr(db_tools, "_start_flusher", lambda: None)
+        
+        for value in range(3):
+            db_tools.log_telemetry(
+                device_id="temp-sensor",
+                metric_type="temperature",
+                value=float(value),
+                unit="°C"
+            )
+        
+        assert len(fetch_rows(db_tools.db_path)) == 3
+        assert len(db_tools._pending) == 0
+    
+    def test_bad_row_does_not_drop_batch(self, db_tools):
+        """Test that a failing row is dropped alone when flushing."""
+        db_tools._pending.extend([
+            ("temp-sensor", "temperature", 20.0, "°C", "t1"),
+            ("temp-sensor", "temperature", 21.0, None, "t2"),
+            ("temp-sensor", "temperature", 22.0, "°C", "t3"),
+        ])
+        
+        db_tools.flush()
+        
+        assert [row[2] for row in fetch_rows(db_tools.db_path)] == [20.0, 22.0]
+    
+    @pytest.mark.parametrize("fields", [
+        {"value": None},
+        {"value": "warm"},
+        {"value": float("nan")},
+        {"device_id": ""},
+        {"metric_type": None},
+        {"unit": None},
+    ])
+    def test_invalid_reading_rejected(self, db_tools, fields):
+        """Test that a reading the table would reject is reported, not buffered."""
+        reading = {
+            "device_id": "temp-sensor",
+            "metric_type": "temperature",
+            "value": 21.5,
+            "unit": "°C",
+        }
+        reading.update(fields)
+        
+        result = db_tools.log_telemetry(**reading)
+        
+        assert result.startswith("Error logging telemetry")
+        assert len(db_tools._pending) == 0
+    
+    def test_numeric_string_value_coerced(self, db_tools):
+        """Test that a numeric string value is stored as a number."""
+        result = db_tools.log_telemetry(
+            device_id="temp-sensor",
+            metric_type="temperature",
+            value="25",
+            unit="°C"
+        )
+        db_tools.flush()
+        
+        assert "Value: 25.0 °C" in result
+        assert fetch_rows(db_tools.db_path)[0][2] == 25.0
+    
+    def test_pending_rows_flushed_at_exit(self, tmp_path):
+        """Test that buffered readings are written when the interpreter exits."""
+        db_path = str(tmp_path / "telemetry.db")
+        script = (
+            "from src.tools.database_tools import DatabaseTools\n"
+            "DatabaseTools.FLUSH_INTERVAL = 60\n"
+            f"tools = DatabaseTools(db_path={db_path!r})\n"
+            "tools.log_telemetry('temp-sensor', 'temperature', 21.5, 'C')\n"
+        )
+        
+        subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            check=True
+        )
+        
+        assert [row[2] for row in fetch_rows(db_path)] == [21.5]
+    
+    def test_log_many(self, db_tools):
+        """Test that rows are inserted with executemany in one call."""
+        db_tools.log_telemetry_many(
+            ("sensor-%d" % i, "temperature", float(i), "°C", "t") for i in range(100)
+        )
+        
+        assert len(fetch_rows(db_tools.db_path)) == 100
+    
+    def test_log_batch(self, db_tools):
+        """Test that a batch of readings is stored in one call."""
+        result = db_tools.log_telemetry_batch(readings=[
+            {"device_id": "temp-sensor", "metric_type": "temperature",
+             "value": 20.0, "unit": "°C"},
+            {"device_id": "humidity-sensor", "metric_type": "humidity",
+             "value": 45, "unit": "%", "timestamp": "2024-01-01T00:00:00"},
+        ])
+        
+        rows = fetch_rows(db_tools.db_path)
+        assert "Records: 2" in result
+        assert [row[0] for row in rows] == ["temp-sensor", "humidity-sensor"]
+        assert rows[1][2:] == (45.0, "%", "2024-01-01T00:00:00")
+    
+    def test_invalid_batch_is_rolled_back(self, db_tools):
+        """Test that a batch with a bad row stores nothing."""
+        result = db_tools.log_telemetry_batch(readings=[
+            {"device_id": "temp-sensor", "metric_type": "temperature",
+             "value": 20.0, "unit": "°C"},
+            {"device_id": "temp-sensor", "metric_type": "temperature",
+             "value": 21.0, "unit": None},
+        ])
+        
+        assert result.startswith("Error logging telemetry")
+        assert fetch_rows(db_tools.db_path) == []
+    
+    def test_batch_missing_field(self, db_tools):
+        """Test that a reading without a required field is reported."""
+        result = db_tools.log_telemetry_batch(readings=[{"device_id": "x"}])
+        
+        assert "missing field" in result
+
+
+class TestQueryTelemetry:
+    """Tests for reading telemetry through the direct connection."""
+    
+    @pytest.fixture
+    def populated(self, db_tools):
+        db_tools.log_telemetry_batch(readings=[
+            {"device_id": "temp-sensor", "metric_type": "temperature",
+             "value": 20.0, "unit": "°C", "timestamp": "2024-01-01T00:00:00"},
+            {"device_id": "temp-sensor", "metric_type": "temperature",
+             "value": 24.0, "unit": "°C", "timestamp": "2024-01-02T00:00:00"},
+            {"device_id": "humidity-sensor", "metric_type": "humidity",
+             "value": 40.0, "unit": "%", "timestamp": "2024-01-02T00:00:00"},
+        ])
+        return db_tools
+    
+    def test_query_with_filter(self, populated):
+        """Test that filtered rows are returned as JSON row objects."""
+        result = populated.query_telemetry(device_id="humidity-sensor")
+        
+        assert result == (
+            "Telemetry Query Results:\n"
+            '[{"device_id":"humidity-sensor","metric_type":"humidity",'
+            '"value":40.0,"unit":"%","timestamp":"2024-01-02T00:00:00"}]'
+        )
+    
+    def test_query_sees_buffered_rows(self, db_tools):
+        """Test that a query flushes pending readings first."""
+        db_tools.log_telemetry(
+            device_id="pump",
+            metric_type="pressure",
+            value=3.0,
+            unit="bar"
+        )
+        
+        assert '"pump"' in db_tools.query_telemetry(device_id="pump")
+    
+    def test_query_value_is_not_interpolated(self, populated):
+        """Test that a quote in a filter value cannot change the query."""
+        result = populated.query_telemetry(device_id="x' OR '1'='1")
+        
+        assert result == "No telemetry records found matching the criteria."
+    
+    def test_query_no_rows(self, populated):
+        """Test that an empty result is reported as no records."""
+        result = populated.query_telemetry(device_id="missing")
+        
+        assert result == "No telemetry records found matching the criteria."
+    
+    def test_aggregation(self, populated):
+        """Test that aggregations run on the direct connection."""
+        result = populated.query_telemetry_aggregation(
+            aggregation="avg",
+            device_id="temp-sensor"
+        )
+        
+        assert "Function: AVG" in result
+        assert 'Result: [{"result":22.0}]' in result
+    
+    def test_mcp_not_started_by_default(self, db_tools):
+        """Test that the context manager does not create the MCP client."""
+        with db_tools:
+            assert db_tools.query_telemetry().startswith("No telemetry")
+        
+        assert "mcp_client" not in vars(db_tools)
+    
+    def test_get_tools_wraps_methods(self, db_tools):
+        """Test that tools are wrapped on demand under their method names."""
+        names = [t.tool_name for t in db_tools.get_tools()]
+        
+        assert names == [
+            "log_telemetry",
+            "log_telemetry_batch",
+            "query_telemetry",
+            "query_telemetry_aggregation",
+        ]
+
+
+class FakeMCPClient:
+    """Stand-in MCP client that counts starts and stops."""
+    
+    def __init__(self):
+        self.entered = 0
+        self.exited = 0
+    
+    def __enter__(self):
+        self.entered += 1
+        return self
+    
+    def __exit__(self, *exc):
+        self.exited += 1
+        return False
+
+
+class TestSharedMCPClient:
+    """Tests for sharing one MCP client per database."""
+    
+    def test_instances_share_one_subprocess(self, tmp_path, monkeypatch):
+        """Test that the client starts once and stops with the last holder."""
+        db_path = str(tmp_path / "telemetry.db")
+        client = FakeMCPClient()
+        monkeypatch.setitem(database_tools._MCP_CLIENTS, os.path.abspath(db_path), client)
+        
+        first = DatabaseTools(db_path=db_path, use_mcp=True)
+        second = DatabaseTools(db_path=db_path, use_mcp=True)
+        with first:
+            with second:
+                assert first.mcp_client is second.mcp_client is client
+            assert (client.entered, client.exited) == (1, 0)
+        
+        assert (client.entered, client.exited) == (1, 1)
+        assert os.path.abspath(db_path) not in database_tools._MCP_CLIENTS
+    
+    def test_exit_without_enter_keeps_client(self, tmp_path, monkeypatch):
+        """Test that exiting an instance that never entered releases nothing."""
+        db_path = str(tmp_path / "telemetry.db")
+        client = FakeMCPClient()
+        monkeypatch.setitem(database_tools._MCP_CLIENTS, os.path.abspath(db_path), client)
+        
+        holder = DatabaseTools(db_path=db_path, use_mcp=True)
+        other = DatabaseTools(db_path=db_path, use_mcp=True)
+        with holder:
+            other.__exit__(None, None, None)
+            assert client.exited == 0
+        
+        assert client.exited == 1
@@ -0,0 +1,195 @@
+"""Tests for the Edge Operator Agent's request handling.
+
+Verifies that trivial requests are answered by their tool directly and
+that everything else is left to the LLM.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pytest
+from strands.handlers.callback_handler import null_callback_handler
+from strands.models.model import Model
+
+from src import edge_operator_agent
+from src.config import EdgeAgentConfig
+from src.edge_operator_agent import EdgeOperatorAgent, _classify
+from src.models.device_registry import get_default_registry
+
+
+class ScriptedModel(Model):
+    """Model that optionally calls one tool, then answers with plain text."""
+    
+    def __init__(self, tool_call=None):
+        self.tool_call = tool_call
+        self.calls = 0
+    
+    def update_config(self, **model_config):
+        pass
+    
+    def get_config(self):
+        return {}
+    
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        raise NotImplementedError
+        yield
+    
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        self.calls += 1
+        yield {"messageStart": {"role": "assistant"}}
+        answered = any("toolResult" in block for block in messages[-1]["content"])
+        if self.tool_call and not answered:
+            name, arguments = self.tool_call
+            yield {"contentBlockStart": {"start": {
+                "toolUse": {"toolUseId": f"call-{self.calls}", "name": name}
+            }}}
+            yield {"contentBlockDelta": {"delta": {"toolUse": {"input": json.dumps(arguments)}}}}
+            yield {"contentBlockStop": {}}
+            yield {"messageStop": {"stopReason": "tool_use"}}
+            return
+        yield {"contentBlockDelta": {"delta": {"text": f"answer {self.calls}"}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+
+
+@pytest.fixture
+def agent():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config = EdgeAgentConfig(
+            session_id="agent-test",
+            sessions_dir=f"{tmpdir}/sessions",
+            db_path=f"{tmpdir}/telemetry.db",
+            semantic_cache_enabled=False
+        )
+        yield EdgeOperatorAgent(config)
+
+
+class TestImport:
+    """Tests for the cost of importing the agent module."""
+    
+    def test_strands_agent_not_loaded(self):
+        """Test that importing the agent module defers the strands agent stack."""
+        script = (
+            "import sys\n"
+            "import src.edge_operator_agent\n"
+            "assert 'strands.agent.agent' not in sys.modules\n"
+        )
+        
+        subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            check=True
+        )
+
+
+class TestClassify:
+    """Tests for the intent fast-path classifier."""
+    
+    @pytest.mark.parametrize("message", [
+        "list devices",
+        "Show all devices",
+        "show me the sensors?",
+    ])
+    def test_list_devices(self, message):
+        """Test that device listing requests map to list_devices."""
+        assert _classify(message) == ("list_devices", {})
+    
+    @pytest.mark.parametrize("message,device_id", [
+        ("read temp sensor", "temp-sensor"),
+        ("Read the humidity sensor.", "humidity-sensor"),
+        ("read temp-sensor", "temp-sensor"),
+    ])
+    def test_read_sensor(self, message, device_id):
+        """Test that sensor reads map to read_sensor with the device ID."""
+        assert _classify(message) == ("read_sensor", {"device_id": device_id})
+    
+    @pytest.mark.parametrize("message", [
+        "list devices that are offline",
+        "show devices and close the valve",
+        "read pressure sensor",
+        "read valve-actuator",
+        "what is the temperature trend today?",
+    ])
+    def test_other_requests_need_llm(self, message):
+        """Test that anything beyond a trivial request falls through."""
+        assert _classify(message) is None
+
+
+class TestFastPath:
+    """Tests for answering trivial requests without the LLM."""
+    
+    def test_list_devices_skips_llm(self, agent, monkeypatch):
+        """Test that the tool output is returned and recorded in history."""
+        def fail(*args, **kwargs):
+            raise AssertionError("LLM should not be called")
+        
+        monkeypatch.setattr(agent.agent.model, "stream", fail)
+        
+        response = agent.chat("list devices")
+        
+        assert "Available IoT Devices" in response
+        assert "temp-sensor" in response
+        assert len(agent.agent.messages) > 0
+
+
+class TestResponseCache:
+    """Tests for which turns are answered from the exact-match cache."""
+    
+    @pytest.fixture(autouse=True)
+    def restore_valve(self):
+        valve = get_default_registry().get("valve-actuator")
+        original = valve.current_state
+        yield
+        valve.set_state(original)
+    
+    def scripted(self, agent, tool_call=None):
+        model = ScriptedModel(tool_call)
+        agent.agent.model = model
+        agent.agent.callback_handler = null_callback_handler
+        return model
+    
+    @pytest.mark.parametrize("message,tool_call", [
+        ("open the valve", ("control_device", {"device_id": "valve-actuator", "action": "open"})),
+        ("close the main valve", ("control_device", {"device_id": "valve-actuator", "action": "closed"})),
+        ("what's the temperature?", ("read_sensor", {"device_id": "temp-sensor"})),
+        ("log a temperature reading of 25 for the temp sensor", ("log_telemetry", {
+            "device_id": "temp-sensor", "metric_type": "temperature", "value": 25, "unit": "C"
+        })),
+        ("how many readings were logged?", ("query_telemetry", {})),
+    ])
+    def test_turns_with_live_tools_not_cached(self, agent, message, tool_call):
+        """Test that repeated device, sensor and database turns rerun their tools."""
+        model = self.scripted(agent, tool_call)
+        
+        agent.chat(message)
+        agent.chat(message)
+        
+        # One tool call plus one answer per turn
+        assert model.calls == 4
+    
+    def test_other_turns_cached(self, agent):
+        """Test that a repeated turn without live tools skips the LLM."""
+        model = self.scripted(agent, ("list_devices", {}))
+        
+        first = agent.chat("which devices are installed?")
+        
+        assert agent.chat("which devices are installed?") == first
+        assert model.calls == 2
+    
+    def test_exact_cache_expires(self, agent, monkeypatch):
+        """Test that exact-match entries expire after the cache TTL."""
+        model = self.scripted(agent)
+        now = [1000.0]
+        monkeypatch.setattr(edge_operator_agent.time, "monotonic", lambda: now[0])
+        
+        agent.chat("summarize the shift")
+        now[0] += agent.config.cache_ttl_seconds - 1
+        agent.chat("summarize the shift")
+        assert model.calls == 1
+        
+        now[0] += 1
+        agent.chat("summarize the shift")
+        assert model.calls == 2
@@ -0,0 +1,368 @@
+"""Tests for simulated IoT devices and the device registry.
+
+Verifies that vectorized sensor reads stay within each sensor's range.
+"""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from src.models.device_registry import (
+    DeviceRegistry,
+    create_default_registry,
+    get_default_registry,
+)
+from src.models import _fastsim
+from src.models.iot_devices import ActuatorDevice, IoTDevice, SensorDevice
+
+
+def make_sensor(device_id, min_value, max_value):
+    return SensorDevice(
+        device_id=device_id,
+        device_type="sensor",
+        location="Test Bench",
+        unit="°C",
+        min_value=min_value,
+        max_value=max_value
+    )
+
+
+class TestSensorDevice:
+    """Tests for SensorDevice readings."""
+    
+    def test_read_within_range(self):
+        """Test that a single read is within the sensor range."""
+        sensor = make_sensor("t1", -10.0, 50.0)
+        
+        assert -10.0 <= sensor.read() <= 50.0
+    
+    def test_read_batch(self):
+        """Test that batch reads have the requested size and range."""
+        sensor = make_sensor("t1", 0.0, 1.0)
+        
+        values = sensor.read_batch(1000)
+        
+        assert values.shape == (1000,)
+        assert np.all((values >= 0.0) & (values <= 1.0))
+        assert np.array_equal(values, values.round(2))
+
+
+    def test_simulate(self):
+        """Test that simulated readings are float32 within range."""
+        sensor = make_sensor("t1", 10.0, 20.0)
+        
+        values = sensor.simulate(500)
+        
+        assert values.dtype == np.float32
+        assert values.shape == (500,)
+        assert np.all((values >= 10.0) & (values <= 20.0))
+
+
+class TestFastSim:
+    """Tests for the simulation kernels, compiled or NumPy."""
+    
+    def check_kernels(self):
+        sensor = _fastsim.simulate_sensor(10.0, 20.0, 200)
+        fleet = _fastsim.simulate_fleet([0.0, 100.0], [1.0, 101.0], 50)
+        
+        assert sensor.dtype == np.float32 and sensor.shape == (200,)
+        assert np.all((sensor >= 10.0) & (sensor <= 20.0))
+        assert fleet.dtype == np.float32 and fleet.shape == (2, 50)
+        assert np.all((fleet[0] >= 0.0) & (fleet[0] <= 1.0))
+        assert np.all((fleet[1] >= 100.0) & (fleet[1] <= 101.0))
+    
+    def test_numba_kernels(self):
+        """Test the JIT-compiled kernels when numba is installed."""
+        pytest.importorskip("numba")
+        assert _fastsim.njit is not None
+        
+        self.check_kernels()
+    
+    def test_numpy_fallback(self, monkeypatch):
+        """Test the NumPy kernels used without numba."""
+        monkeypatch.setattr(_fastsim, "njit", None)
+        
+        self.check_kernels()
+    
+    def test_models_import_without_kernels(self):
+        """Test that importing the device models does not load numba."""
+        script = (
+            "import sys\n"
+            "import src.models.device_registry, src.models.iot_devices\n"
+            "assert 'src.models._fastsim' not in sys.modules\n"
+            "assert 'numba' not in sys.modules\n"
+        )
+        
+        subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            check=True
+        )
+
+
+class TestDeviceLayout:
+    """Tests for the slotted, read-only device representation."""
+    
+    def test_devices_have_no_instance_dict(self):
+        """Test that devices are slotted."""
+        sensor = make_sensor("t1", 0.0, 1.0)
+        
+        assert not hasattr(sensor, "__dict__")
+    
+    def test_metadata_is_read_only(self):
+        """Test that metadata cannot be mutated after construction."""
+        metadata = {"manufacturer": "SensorCorp"}
+        sensor = SensorDevice(
+            device_id="t1",
+            device_type="sensor",
+            location="Test Bench",
+            metadata=metadata
+        )
+        metadata["manufacturer"] = "Other"
+        
+        assert sensor.metadata["manufacturer"] == "SensorCorp"
+        with pytest.raises(TypeError):
+            sensor.metadata["model"] = "TC-100"
+    
+    def test_actuator_states(self):
+        """Test that states are stored as a tuple and validated."""
+        valve = ActuatorDevice(
+            device_id="valve",
+            device_type="actuator",
+            location="Test Bench",
+            states=["open", "closed"]
+        )
+        
+        assert valve.states == ("open", "closed")
+        assert valve.current_state == "open"
+        assert valve.set_state("closed") is True
+        assert valve.set_state("broken") is False
+        assert valve.current_state == "closed"
+        assert valve.get_valid_actions() is valve.states
+        assert valve.valid_actions_set == frozenset({"open", "closed"})
+        assert valve.valid_actions_str == "open, closed"
+    
+    def test_device_type_follows_class(self):
+        """Test that the device_type tag cannot disagree with the class."""
+        sensor = SensorDevice(device_id="t1", device_type="actuator", location="Test Bench")
+        
+        assert sensor.device_type == "sensor"
+
+
+class TestDeviceRegistry:
+    """Tests for registry-wide operations."""
+    
+    def test_kind_indexes(self):
+        """Test that sensors and actuators are listed by kind."""
+        registry = create_default_registry()
+        
+        assert [d.device_id for d in registry.get_sensors()] == [
+            "temp-sensor", "humidity-sensor"
+        ]
+        assert [d.device_id for d in registry.get_actuators()] == ["valve-actuator"]
+    
+    def test_unregister(self):
+        """Test that unregistering removes a device from every index."""
+        registry = create_default_registry()
+        
+        removed = registry.unregister("temp-sensor")
+        
+        assert removed.device_id == "temp-sensor"
+        assert registry.get("temp-sensor") is None
+        assert "temp-sensor" not in [d.device_id for d in registry.get_sensors()]
+        assert registry.unregister("temp-sensor") is None
+    
+    def test_available_ids_str_tracks_changes(self):
+        """Test that the cached ID list is rebuilt after devices change."""
+        registry = create_default_registry()
+        
+        assert registry.available_ids_str() == (
+            "temp-sensor, humidity-sensor, valve-actuator"
+        )
+        assert registry.available_ids_str() is registry.available_ids_str()
+        
+        registry.unregister("humidity-sensor")
+        registry.register(make_sensor("probe", 0.0, 1.0))
+        
+        assert registry.available_ids_str() == "temp-sensor, valve-actuator, probe"
+    
+    def test_reregister_with_new_kind(self):
+        """Test that replacing a device moves it to the right index."""
+        registry = DeviceRegistry()
+        registry.register(make_sensor("dev", 0.0, 1.0))
+        registry.register(ActuatorDevice(
+            device_id="dev",
+            device_type="actuator",
+            location="Test Bench",
+            states=["on", "off"]
+        ))
+        
+        assert registry.get_sensors() == []
+        assert [d.device_id for d in registry.get_actuators()] == ["dev"]
+    
+    def test_read_all_sensors(self):
+        """Test that every sensor is read within its own range."""
+        registry = DeviceRegistry()
+        registry.register(make_sensor("low", 0.0, 1.0))
+        registry.register(make_sensor("high", 100.0, 101.0))
+        registry.register(ActuatorDevice(
+            device_id="valve",
+            device_type="actuator",
+            location="Test Bench",
+            states=["open", "closed"]
+        ))
+        
+        readings = registry.read_all_sensors()
+        
+        assert set(readings) == {"low", "high"}
+        assert 0.0 <= readings["low"] <= 1.0
+        assert 100.0 <= readings["high"] <= 101.0
+        assert isinstance(readings["low"], float)
+    
+    def test_simulate_all_sensors(self):
+        """Test that fleet simulation respects each sensor's range."""
+        registry = DeviceRegistry()
+        registry.register(make_sensor("low", 0.0, 1.0))
+        registry.register(make_sensor("high", 100.0, 101.0))
+        
+        samples = registry.simulate_all_sensors(100)
+        
+        assert samples["low"].shape == (100,)
+        assert np.all((samples["low"] >= 0.0) & (samples["low"] <= 1.0))
+        assert np.all((samples["high"] >= 100.0) & (samples["high"] <= 101.0))
+    
+    def test_read_all_sensors_empty(self):
+        """Test that a registry without sensors returns no readings."""
+        assert DeviceRegistry().read_all_sensors() == {}
+    
+    def test_default_registry_sensors(self):
+        """Test that the default registry's sensors are all read."""
+        readings = create_default_registry().read_all_sensors()
+        
+        assert set(readings) == {"temp-sensor", "humidity-sensor"}
+    
+    def test_default_registry_created_once(self):
+        """Test that the default registry is built lazily and then reused."""
+        assert get_default_registry() is get_default_registry()
+        assert get_default_registry().list_device_ids() == (
+            create_default_registry().list_device_ids()
+        )
+
+
+class TestListDevices:
+    """Tests for the list_devices tool output."""
+    
+    def test_device_blocks(self):
+        """Test that each device kind is rendered with its details."""
+        from src.tools.iot_tools import list_devices
+        
+        result = list_devices()
+        
+        assert result.startswith("Available IoT Devices:\n" + "=" * 40)
+        assert (
+            "\nDevice ID: temp-sensor\n  Type: sensor\n"
+            "  Location: Production Floor - Zone A\n"
+            "  Unit: °C\n  Range: -10.0 - 50.0\n"
+        ) in result
+        assert "  Valid States: open, closed, partial\n  Current State: " in result
+        assert result.endswith("=" * 40 + "\nTotal: 3 device(s)")
+
+
+class TestControlDevice:
+    """Tests for the control_device tool."""
+    
+    @pytest.fixture
+    def valve(self):
+        valve = get_default_registry().get("valve-actuator")
+        original = valve.current_state
+        yield valve
+        valve.set_state(original)
+    
+    def test_valid_action(self, valve):
+        """Test that a valid action changes the actuator state."""
+        from src.tools.iot_tools import control_device
+        
+        valve.set_state("closed")
+        result = control_device(device_id="valve-actuator", action="open")
+        
+        assert "Previous State: closed\n  New State: open" in result
+        assert valve.current_state == "open"
+    
+    def test_invalid_action(self, valve):
+        """Test that an invalid action lists the valid ones in order."""
+        from src.tools.iot_tools import control_device
+        
+        valve.set_state("closed")
+        result = control_device(device_id="valve-actuator", action="explode")
+        
+        assert result.endswith("Valid actions: open, closed, partial")
+        assert valve.current_state == "closed"
+    
+    def test_wrong_device_type(self):
+        """Test that the type tag routes sensors and actuators apart."""
+        from src.tools.iot_tools import control_device, read_sensor
+        
+        assert control_device(device_id="temp-sensor", action="open") == (
+            "Error: Device 'temp-sensor' is not an actuator. It is a sensor."
+        )
+        assert read_sensor(device_id="valve-actuator") == (
+            "Error: Device 'valve-actuator' is not a sensor. It is a actuator."
+        )
+    
+    def test_base_device_with_kind_tag(self, monkeypatch):
+        """Test that a base device tagged by hand is reported in debug runs."""
+        from src.tools import iot_tools
+        
+        registry = DeviceRegistry()
+        for kind in ("sensor", "actuator"):
+            registry.register(IoTDevice(device_id=kind, device_type=kind, location="Test Bench"))
+        monkeypatch.setattr(iot_tools, "get_default_registry", lambda: registry)
+        
+        assert iot_tools.read_sensor(device_id="sensor") == (
+            "Error: Device 'sensor' is tagged as a sensor but is a IoTDevice."
+        )
+        assert "  - sensor: tagged as a sensor but is a IoTDevice\n" in (
+            iot_tools.read_sensors_batch(device_ids=["sensor"])
+        )
+        assert iot_tools.control_device(device_id="actuator", action="open") == (
+            "Error: Device 'actuator' is tagged as an actuator but is a IoTDevice."
+        )
+
+
+class TestReadSensors:
+    """Tests for the read_sensors_batch tool."""
+    
+    def test_reads_each_sensor_once(self):
+        """Test that every requested sensor is read, duplicates once."""
+        from src.tools.iot_tools import read_sensors_batch
+        
+        result = read_sensors_batch(
+            device_ids=["temp-sensor", "humidity-sensor", "temp-sensor"]
+        )
+        
+        lines = result.splitlines()
+        assert lines[0] == "Sensor Readings:"
+        assert lines[1].startswith("  - temp-sensor (Production Floor - Zone A): ")
+        assert lines[1].endswith(" °C")
+        assert lines[2].startswith("  - humidity-sensor ")
+        assert lines[3].startswith("  Timestamp: ")
+        assert "Errors:" not in result
+    
+    def test_reports_invalid_ids(self):
+        """Test that unknown IDs and non-sensors are listed as errors."""
+        from src.tools.iot_tools import read_sensors_batch
+        
+        result = read_sensors_batch(device_ids=["temp-sensor", "valve-actuator", "nope"])
+        
+        assert "  - valve-actuator: not a sensor (it is a actuator)" in result
+        assert "  - nope: not found" in result
+        assert "  - temp-sensor (" in result
+    
+    def test_empty_request(self):
+        """Test that an empty ID list is rejected."""
+        from src.tools.iot_tools import read_sensors_batch
+        
+        assert read_sensors_batch(device_ids=[]) == "Error: No device IDs provided."
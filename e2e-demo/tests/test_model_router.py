@@ -0,0 +1,133 @@
+"""Tests for the model router's connectivity handling.
+
+Verifies that connectivity checks are cached, run off the calling thread,
+and never block mode switching for longer than the probe timeout.
+"""
+
+import socket
+import threading
+
+import pytest
+
+from src.model_router import ModelRouter
+
+
+@pytest.fixture
+def router():
+    return ModelRouter(
+        ollama_config={"host": "http://localhost:11434", "model_id": "test-model"},
+        bedrock_config={"region_name": "us-east-1"}
+    )
+
+
+class FakeConnection:
+    """Stand-in for the socket returned by socket.create_connection."""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+class TestConnectivityCheck:
+    """Tests for ModelRouter connectivity probing."""
+    
+    def test_result_is_cached(self, router, monkeypatch):
+        """Test that repeated checks within the TTL reuse the first probe."""
+        calls = []
+        
+        def fake_connect(address, timeout):
+            calls.append(address)
+            return FakeConnection()
+        
+        monkeypatch.setattr(socket, "create_connection", fake_connect)
+        
+        assert router._check_connectivity() is True
+        assert router._check_connectivity() is True
+        assert len(calls) == 1
+    
+    def test_failed_probe_reports_offline(self, router, monkeypatch):
+        """Test that a connection error is reported as no connectivity."""
+        def fake_connect(address, timeout):
+            raise OSError("network unreachable")
+        
+        monkeypatch.setattr(socket, "create_connection", fake_connect)
+        
+        assert router._check_connectivity() is False
+        assert router.set_mode("cloud") is False
+        assert router.mode == "local"
+    
+    def test_slow_probe_times_out(self, router, monkeypatch):
+        """Test that a hanging probe does not block past the timeout."""
+        release = threading.Event()
+        
+        def fake_connect(address, timeout):
+            release.wait(5)
+            return FakeConnection()
+        
+        monkeypatch.setattr(socket, "create_connection", fake_connect)
+        monkeypatch.setattr(router, "CONNECTIVITY_TIMEOUT", 0.05)
+        
+        assert router._check_connectivity() is False
+        release.set()
+    
+    def test_prewarm_populates_cache(self, router, monkeypatch):
+        """Test that prewarming runs the probe in the background."""
+        monkeypatch.setattr(
+            socket, "create_connection", lambda address, timeout: FakeConnection()
+        )
+        
+        router.prewarm_connectivity()
+        router._probe_future.result(timeout=1)
+        
+        _, available = router._conn_cache
+        assert available is True
+
+
+class FakeOllamaClient:
+    """Records generate() calls in place of a real Ollama client."""
+    
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+    
+    def generate(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.error is not None:
+            raise self.error
+        return {"response": ""}
+
+
+class TestWarmup:
+    """Tests for loading the local model at startup."""
+    
+    def test_warmup_loads_model_with_inference_settings(self):
+        """Test that warmup sends an empty prompt with the model's settings."""
+        router = ModelRouter(
+            ollama_config={
+                "model_id": "test-model",
+                "keep_alive": -1,
+                "options": {"num_ctx": 4096}
+            },
+            bedrock_config={}
+        )
+        client = FakeOllamaClient()
+        router.ollama_client = client
+        
+        router.warmup().join(timeout=1)
+        
+        assert client.calls == [{
+            "model": "test-model",
+            "prompt": "",
+            "keep_alive": -1,
+            "options": {"num_ctx": 4096}
+        }]
+    
+    def test_warmup_failure_is_not_raised(self, router):
+        """Test that an unreachable Ollama server does not break startup."""
+        router.ollama_client = FakeOllamaClient(error=ConnectionError("refused"))
+        
+        router._warmup()
+        
+        assert len(router.ollama_client.calls) == 1
@@ -0,0 +1,415 @@
+"""Tests for SCADA report extraction.
+
+Verifies that text and JSON reports are parsed into validated
+ProductionMetrics and that invalid reports are reported as errors.
+"""
+
+import json
+import re
+
+import pytest
+from pydantic import ValidationError
+
+from src.models.scada_models import (
+    AlarmInfo,
+    EquipmentStatus,
+    ProductionMetrics,
+    SensorReading,
+)
+from src.tools import scada_extraction_tools
+from src.tools.scada_extraction_tools import (
+    _extract_equipment_status,
+    _iter_matches,
+    _parse_scada_report,
+    _scan_fields,
+    extract_scada_metrics,
+)
+
+
+@pytest.fixture(autouse=True, params=["default", "re2"])
+def regex_engine(request, monkeypatch):
+    """Run every test with the engine picked at import and again with RE2."""
+    if request.param == "default":
+        return
+    re2 = pytest.importorskip("re2")
+    monkeypatch.setattr(scada_extraction_tools, "_regex", re2)
+    for name, value in vars(scada_extraction_tools).copy().items():
+        if isinstance(value, re.Pattern):
+            monkeypatch.setattr(scada_extraction_tools, name, re2.compile(value.pattern))
+        elif isinstance(value, tuple) and value and isinstance(value[0], re.Pattern):
+            monkeypatch.setattr(
+                scada_extraction_tools, name,
+                tuple(re2.compile(pattern.pattern) for pattern in value)
+            )
+
+
+TEXT_REPORT = """
+Production Line: LINE-001
+Shift: Morning
+Units Produced: 450
+Target: 500
+Efficiency: 90%
+Equipment: PUMP-01 - Coolant Pump (running)
+Sensor: TEMP-01 = 72.5 °C
+Alarm: ALM-7 (high) - Coolant pressure low
+"""
+
+JSON_REPORT = {
+    "line_id": "LINE-002",
+    "shift": "night",
+    "units_produced": 300,
+    "units_target": 400,
+    "efficiency_percent": 75.0,
+    "equipment": [{
+        "equipment_id": "PRESS-01",
+        "name": "Hydraulic Press",
+        "status": "maintenance",
+        "readings": [{"sensor_id": "P-1", "value": 120.0, "unit": "PSI"}],
+        "active_alarms": [],
+    }],
+}
+
+
+class TestProductionMetricsFromJson:
+    """Tests for the ProductionMetrics JSON fast path."""
+    
+    def test_parses_nested_models(self):
+        """Test that nested equipment and readings are validated."""
+        metrics = ProductionMetrics.from_json(json.dumps(JSON_REPORT).encode())
+        
+        assert metrics.line_id == "LINE-002"
+        assert metrics.equipment[0].status == "maintenance"
+        assert metrics.equipment[0].readings[0].value == 120.0
+    
+    def test_rejects_invalid_values(self):
+        """Test that constraint violations raise ValidationError."""
+        report = dict(JSON_REPORT, units_produced=-1)
+        
+        with pytest.raises(ValidationError):
+            ProductionMetrics.from_json(json.dumps(report))
+
+
+class TestBuildTrusted:
+    """Tests for building SCADA models from trusted data."""
+    
+    def test_builds_nested_models(self):
+        """Test that nested dicts become model instances."""
+        metrics = ProductionMetrics.build_trusted(**json.loads(json.dumps(JSON_REPORT)))
+        
+        equipment = metrics.equipment[0]
+        assert isinstance(equipment, EquipmentStatus)
+        assert isinstance(equipment.readings[0], SensorReading)
+        assert equipment.readings[0].unit == "PSI"
+        assert equipment.active_alarms == []
+    
+    def test_matches_validated_model(self):
+        """Test that trusted construction yields an equal model."""
+        trusted = ProductionMetrics.build_trusted(**json.loads(json.dumps(JSON_REPORT)))
+        
+        assert trusted == ProductionMetrics.model_validate(JSON_REPORT)
+    
+    def test_models_are_frozen(self):
+        """Test that SCADA models cannot be mutated."""
+        reading = SensorReading(sensor_id="T-1", value=20.0, unit="°C")
+        
+        with pytest.raises(ValidationError):
+            reading.value = 25.0
+    
+    def test_enumerated_fields_validated(self):
+        """Test that severity and status only accept their allowed values."""
+        with pytest.raises(ValidationError):
+            AlarmInfo(alarm_id="A-1", severity="urgent", message="Overheat")
+        with pytest.raises(ValidationError):
+            EquipmentStatus(equipment_id="E-1", name="Pump", status="idle")
+        
+        assert AlarmInfo(alarm_id="A-1", severity="high", message="Overheat").severity == "high"
+    
+    def test_schema_lists_allowed_values(self):
+        """Test that the JSON schema still advertises the enumerations."""
+        schema = EquipmentStatus.model_json_schema()
+        
+        assert schema["properties"]["status"]["enum"] == [
+            "running", "stopped", "maintenance", "fault"
+        ]
+    
+    def test_unknown_fields_rejected(self):
+        """Test that validation rejects fields outside the schema."""
+        with pytest.raises(ValidationError):
+            SensorReading(sensor_id="T-1", value=20.0, unit="°C", raw="20")
+
+
+class TestSeverityRank:
+    """Tests for severity ranking and alarm filtering."""
+    
+    def test_rank_follows_severity_order(self):
+        """Test that ranks increase from low to critical."""
+        ranks = [
+            AlarmInfo(alarm_id="A-1", severity=level, message="m").severity_rank
+            for level in ("low", "medium", "high", "critical")
+        ]
+        
+        assert ranks == [0, 1, 2, 3]
+    
+    def test_alarms_at_or_above(self):
+        """Test that alarms below the threshold are filtered out."""
+        equipment = EquipmentStatus.build_trusted(
+            equipment_id="E-1",
+            name="Pump",
+            status="fault",
+            active_alarms=[
+                {"alarm_id": f"A-{level}", "severity": level, "message": "m"}
+                for level in ("medium", "critical", "low", "high")
+            ]
+        )
+        
+        assert [a.alarm_id for a in equipment.alarms_at_or_above("high")] == [
+            "A-critical", "A-high"
+        ]
+        assert equipment.alarms_at_or_above("low") == equipment.active_alarms
+    
+    def test_rank_not_serialized(self):
+        """Test that the rank is not part of the model's fields."""
+        alarm = AlarmInfo(alarm_id="A-1", severity="high", message="m")
+        
+        assert "severity_rank" not in alarm.model_dump()
+
+
+class TestExtractScadaMetrics:
+    """Tests for the extract_scada_metrics tool."""
+    
+    def test_text_report(self):
+        """Test extraction from a plain-text report."""
+        result = extract_scada_metrics(TEXT_REPORT)
+        
+        assert "Line ID: LINE-001" in result
+        assert "Efficiency: 90.0%" in result
+        assert "PUMP-01 - Coolant Pump" in result
+        assert "[HIGH] ALM-7: Coolant pressure low (Ack: ✗)" in result
+    
+    def test_json_report(self):
+        """Test extraction from a JSON export."""
+        result = extract_scada_metrics(json.dumps(JSON_REPORT))
+        
+        assert "Line ID: LINE-002" in result
+        assert "P-1: 120.0 PSI" in result
+    
+    def test_invalid_json_report(self):
+        """Test that invalid JSON reports return a validation error."""
+        result = extract_scada_metrics(json.dumps(dict(JSON_REPORT, shift="")))
+        
+        assert result.startswith("Error: Extracted data failed validation.")
+        assert "  - shift: String should have at least 1 character\n\n" in result
+        assert result.endswith(
+            "  - efficiency_percent: Efficiency percentage (non-negative number)"
+        )
+    
+    def test_empty_report(self):
+        """Test that an empty report is rejected."""
+        assert extract_scada_metrics("   ").startswith("Error: Empty report text")
+    
+    def test_missing_field(self):
+        """Test that a report without a required field names the field."""
+        result = extract_scada_metrics(TEXT_REPORT.replace("Shift: Morning", ""))
+        
+        assert result.startswith("Error: Failed to extract metrics")
+        assert "'shift'" in result
+    
+    def test_field_labels_case_insensitive(self):
+        """Test that field labels match regardless of case."""
+        result = extract_scada_metrics(TEXT_REPORT.upper())
+        
+        assert "Line ID: LINE-001" in result
+        assert "Shift: MORNING" in result
+
+    
+    def test_snake_case_fields_fall_back(self):
+        """Test that fields missed by the combined scan use the fallbacks."""
+        report = (
+            "line_id: L-9\nshift: night\nunits_produced: 10\n"
+            "units_target: 20\nefficiency_percent: 50.5"
+        )
+        result = extract_scada_metrics(report)
+        
+        assert "Line ID: L-9" in result
+        assert "Units Produced: 10" in result
+        assert "Efficiency: 50.5%" in result
+    
+    @pytest.mark.parametrize("old, new, field", [
+        ("Units Produced: 450", "Units Produced: 12345678901234", "'units_produced'"),
+        ("Efficiency: 90%", "Efficiency: 90.1234567890123%", "'efficiency_percent'"),
+        ("Production Line: LINE-001", "Production Line ID: " + "L" * 70, "'line_id'"),
+    ])
+    def test_over_long_value_rejected(self, old, new, field):
+        """Test that a value past its length bound is not cut short."""
+        result = extract_scada_metrics(TEXT_REPORT.replace(old, new))
+        
+        assert result.startswith("Error: Failed to extract metrics")
+        assert field in result
+
+
+class TestScanFields:
+    """Tests for the single-pass field scan."""
+    
+    def test_finds_all_fields(self):
+        """Test that every field in a standard report is found in one scan."""
+        assert _scan_fields(TEXT_REPORT) == {
+            "line_id": "LINE-001",
+            "shift": "Morning",
+            "units_produced": "450",
+            "units_target": "500",
+            "efficiency_percent": "90",
+        }
+    
+    def test_keeps_first_occurrence(self):
+        """Test that a repeated field keeps its first value."""
+        assert _scan_fields("Shift: Day\nShift: Night") == {"shift": "Day"}
+
+
+class KeywordAnchors:
+    """Stand-in for an Aho-Corasick automaton, yielding (end_index, keyword)."""
+    
+    def __init__(self, *keywords):
+        self.keywords = keywords
+    
+    def iter(self, haystack):
+        hits = []
+        for keyword in self.keywords:
+            start = haystack.find(keyword)
+            while start != -1:
+                hits.append((start + len(keyword) - 1, keyword))
+                start = haystack.find(keyword, start + 1)
+        return iter(sorted(hits))
+
+
+class TestIterMatches:
+    """Tests for the keyword-anchored pattern scan."""
+    
+    FIELD_ANCHORS = KeywordAnchors("line", "shift", "units", "target", "efficiency")
+    EQUIP_ANCHORS = KeywordAnchors("equipment", "sensor", "alarm")
+    
+    @pytest.mark.parametrize("text", [
+        TEXT_REPORT,
+        "",
+        "PRODUCTION LINE: L-9\nunits target: 10\nUnits Produced: 7",
+        "Pipeline: P-1 Shift:Shift: Day\nEfficiency Percent 88.5",
+        "Units Target: 5 Target: 6",
+    ])
+    def test_fields_match_finditer(self, text):
+        """Test that anchored matching finds exactly what finditer finds."""
+        def found(matches):
+            # "Production Line" is anchored after its optional prefix
+            return [(m.lastgroup, m.group(m.lastgroup), m.end()) for m in matches]
+        
+        pattern = scada_extraction_tools._FIELDS_RE
+        anchored = _iter_matches(pattern, text, self.FIELD_ANCHORS)
+        
+        assert found(anchored) == found(pattern.finditer(text))
+    
+    def test_equipment_match_finditer(self):
+        """Test that anchored equipment matching follows finditer."""
+        text = TEXT_REPORT + "SENSOR: S-2: 4 V\nAlarm: A (low) - Sensor: X = 1 C"
+        pattern = scada_extraction_tools._EQUIP_BLOCK_RE
+        anchored = _iter_matches(pattern, text, self.EQUIP_ANCHORS)
+        
+        assert [m.span() for m in anchored] == [m.span() for m in pattern.finditer(text)]
+    
+    def test_length_changing_case_fold_falls_back(self):
+        """Test that text whose case folding changes length is still scanned."""
+        text = "Straße\nShift: Day"
+        
+        pattern = scada_extraction_tools._FIELDS_RE
+        matches = list(_iter_matches(pattern, text, self.FIELD_ANCHORS))
+        
+        assert [m.group("shift") for m in matches] == ["Day"]
+
+
+class TestParseScadaReport:
+    """Tests for building models from parsed report text."""
+    
+    def test_trusted_matches_strict(self, monkeypatch):
+        """Test that constructed models equal fully validated ones."""
+        trusted = _parse_scada_report(TEXT_REPORT)
+        monkeypatch.setattr(scada_extraction_tools, "_STRICT_VALIDATION", True)
+        strict = _parse_scada_report(TEXT_REPORT)
+        
+        assert trusted == strict
+        assert trusted.equipment[0].active_alarms[0].severity == "high"
+    
+    def test_empty_alarm_message_skipped(self):
+        """Test that alarms the models would reject are not constructed."""
+        report = "Equipment: E-1 - Pump (running)\nAlarm: A-1 (high) - \n\n"
+        
+        assert _extract_equipment_status(report)[0].active_alarms == []
+
+
+class TestExtractEquipmentStatus:
+    """Tests for the single-pass equipment, sensor and alarm scan."""
+    
+    REPORT = """
+Sensor: T-0 = 1.0 C
+Equipment: PUMP-01 - Coolant Pump (running)
+Sensor: T-1 = 20.5 °C
+Alarm: ALM-1 (low) - Filter due
+Equipment: PRESS-01 - Press (idle)
+Sensor: P-9 = 5 PSI
+Equipment: FAN-01 - Exhaust Fan (fault)
+Sensor: RPM-1 = 0 rpm
+Alarm: ALM-2 (critical) - Fan stalled
+"""
+    
+    def test_items_bucketed_by_equipment(self):
+        """Test that readings and alarms belong to the equipment above them."""
+        pump, fan = _extract_equipment_status(self.REPORT)
+        
+        assert [r.sensor_id for r in pump.readings] == ["T-0", "T-1"]
+        assert [a.alarm_id for a in pump.active_alarms] == ["ALM-1"]
+        assert [r.sensor_id for r in fan.readings] == ["RPM-1"]
+        assert [a.severity for a in fan.active_alarms] == ["critical"]
+    
+    def test_invalid_equipment_drops_its_items(self):
+        """Test that lines under skipped equipment are not reassigned."""
+        sensor_ids = {
+            r.sensor_id
+            for equipment in _extract_equipment_status(self.REPORT)
+            for r in equipment.readings
+        }
+        
+        assert "P-9" not in sensor_ids
+    
+    def test_alarm_message_stays_on_its_line(self):
+        """Test that an alarm without a message does not take the next line."""
+        report = (
+            "Equipment: E-1 - Pump (running)\n"
+            "Alarm: A-1 (high) -\n"
+            "Alarm: A-2 (low) - Filter due"
+        )
+        
+        alarms = _extract_equipment_status(report)[0].active_alarms
+        
+        assert [(a.alarm_id, a.message) for a in alarms] == [("A-2", "Filter due")]
+    
+    def test_unterminated_equipment_line(self):
+        """Test that a long line without a status does not backtrack heavily."""
+        report = "Equipment: E-1 - " + " " * 20000 + "\nEquipment: E-2 - Fan (running)"
+        
+        assert [e.equipment_id for e in _extract_equipment_status(report)] == ["E-2"]
+    
+    def test_over_long_values_not_truncated(self):
+        """Test that sensor lines with over-long values are skipped whole."""
+        report = (
+            "Equipment: E-1 - Pump (running)\n"
+            "Sensor: T-1 = 12345678901234 C\n"
+            "Sensor: T-2 = 1.5 " + "m" * 40 + "\n"
+            "Sensor: T-3 = 2.5mm\n"
+            "Sensor: T-4 = 3 .5mm"
+        )
+        
+        readings = _extract_equipment_status(report)[0].readings
+        
+        assert [(r.sensor_id, r.value, r.unit) for r in readings] == [
+            ("T-3", 2.5, "mm"), ("T-4", 3.0, ".5mm"),
+        ]
+    
+    def test_no_equipment(self):
+        """Test that readings without any equipment line are ignored."""
+        assert _extract_equipment_status("Sensor: T-1 = 20 C") == []
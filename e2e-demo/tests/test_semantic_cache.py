@@ -0,0 +1,264 @@
+"""Tests for the semantic response cache.
+
+Verifies similarity lookups, session isolation, and TTL expiry using
+hand-built embeddings so no Ollama server is required.
+"""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+from src.storage import semantic_cache
+from src.storage.semantic_cache import SemanticCache
+
+
+@pytest.fixture
+def cache_dir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield tmpdir
+
+
+class FakeOllamaClient:
+    """Records embed calls and returns a deterministic vector per text."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def embed(self, model, input):
+        texts = [input] if isinstance(input, str) else list(input)
+        self.calls.append(texts)
+        return {"embeddings": [[float(len(t)), 1.0, 0.0] for t in texts]}
+
+
+def make_cache(cache_dir, session_id="test-session", **kwargs):
+    return SemanticCache(
+        db_path=os.path.join(cache_dir, "cache.db"),
+        session_id=session_id,
+        **kwargs
+    )
+
+
+class TestSemanticCache:
+    """Tests for the SemanticCache class."""
+    
+    def test_miss_on_empty_cache(self, cache_dir):
+        """Test that lookup returns None when nothing is cached."""
+        cache = make_cache(cache_dir)
+        
+        assert cache.lookup([1.0, 0.0, 0.0]) is None
+        cache.close()
+    
+    def test_hit_on_similar_embedding(self, cache_dir):
+        """Test that a near-duplicate embedding returns the cached response."""
+        cache = make_cache(cache_dir)
+        cache.add([1.0, 0.0, 0.0], "Temperature is 23.5°C")
+        
+        assert cache.lookup([0.99, 0.05, 0.0]) == "Temperature is 23.5°C"
+        cache.close()
+    
+    def test_miss_on_dissimilar_embedding(self, cache_dir):
+        """Test that an unrelated embedding is a cache miss."""
+        cache = make_cache(cache_dir)
+        cache.add([1.0, 0.0, 0.0], "Temperature is 23.5°C")
+        
+        assert cache.lookup([0.0, 1.0, 0.0]) is None
+        cache.close()
+    
+    def test_returns_closest_match(self, cache_dir):
+        """Test that the most similar cached prompt wins."""
+        cache = make_cache(cache_dir, similarity_threshold=0.5)
+        cache.add([1.0, 0.0, 0.0], "first")
+        cache.add([0.8, 0.6, 0.0], "second")
+        
+        assert cache.lookup([0.75, 0.65, 0.0]) == "second"
+        cache.close()
+    
+    def test_session_isolation(self, cache_dir):
+        """Test that entries are not shared between sessions."""
+        cache1 = make_cache(cache_dir, session_id="session-1")
+        cache2 = make_cache(cache_dir, session_id="session-2")
+        cache1.add([1.0, 0.0, 0.0], "session one answer")
+        
+        assert cache2.lookup([1.0, 0.0, 0.0]) is None
+        assert cache1.lookup([1.0, 0.0, 0.0]) == "session one answer"
+        cache1.close()
+        cache2.close()
+    
+    def test_expired_entries_ignored(self, cache_dir):
+        """Test that entries older than the TTL are not returned."""
+        cache = make_cache(cache_dir, ttl_seconds=-1)
+        cache.add([1.0, 0.0, 0.0], "stale reading")
+        
+        assert cache.lookup([1.0, 0.0, 0.0]) is None
+        cache.close()
+    
+    def test_entries_persist_across_instances(self, cache_dir):
+        """Test that cached responses survive reopening the database."""
+        cache = make_cache(cache_dir)
+        cache.add([0.0, 0.0, 1.0], "persisted")
+        cache.close()
+        
+        reopened = make_cache(cache_dir)
+        assert reopened.lookup([0.0, 0.0, 1.0]) == "persisted"
+        reopened.close()
+    
+    def test_embeddings_stored_as_float16(self, cache_dir):
+        """Test that stored vectors take two bytes per dimension."""
+        cache = make_cache(cache_dir)
+        cache.add([3.0, 4.0, 0.0, 0.0], "compact")
+        
+        blob = cache._conn.execute("SELECT embedding FROM semantic_cache").fetchone()[0]
+        assert len(blob) == 8
+        assert cache.lookup([0.6, 0.8, 0.0, 0.0]) == "compact"
+        cache.close()
+    
+    def test_old_format_cache_discarded(self, cache_dir):
+        """Test that a cache written in an older format is dropped on open."""
+        db_path = os.path.join(cache_dir, "cache.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE semantic_cache (id INTEGER PRIMARY KEY, embedding BLOB)")
+        conn.execute("INSERT INTO semantic_cache (embedding) VALUES (x'00')")
+        conn.commit()
+        conn.close()
+        
+        cache = make_cache(cache_dir)
+        count = cache._conn.execute("SELECT COUNT(*) FROM semantic_cache").fetchone()[0]
+        assert count == 0
+        cache.close()
+    
+    def test_index_rebuilt_when_missing(self, cache_dir):
+        """Test that the HNSW index is rebuilt from SQLite if its file is gone."""
+        cache = make_cache(cache_dir)
+        cache.add([0.0, 1.0, 0.0], "rebuilt")
+        cache.close()
+        if os.path.exists(cache.index_path):
+            os.remove(cache.index_path)
+        
+        reopened = make_cache(cache_dir)
+        assert reopened.lookup([0.0, 1.0, 0.0]) == "rebuilt"
+        reopened.close()
+    
+    def test_scan_fallback_without_hnswlib(self, cache_dir, monkeypatch):
+        """Test that lookups still work when hnswlib is not installed."""
+        monkeypatch.setattr("src.storage.semantic_cache.hnswlib", None)
+        cache = make_cache(cache_dir)
+        cache.add([1.0, 0.0, 0.0], "scanned")
+        
+        assert cache.lookup([0.99, 0.05, 0.0]) == "scanned"
+        assert cache.lookup([0.0, 1.0, 0.0]) is None
+        cache.close()
+
+
+    def test_scan_matrix_grows_and_reloads(self, cache_dir, monkeypatch):
+        """Test that the scan matrix grows past its capacity and reloads."""
+        monkeypatch.setattr("src.storage.semantic_cache.hnswlib", None)
+        monkeypatch.setattr(SemanticCache, "INITIAL_CAPACITY", 2)
+        cache = make_cache(cache_dir)
+        for i in range(5):
+            vector = [0.0] * 5
+            vector[i] = 1.0
+            cache.add(vector, f"answer {i}")
+        cache.close()
+        
+        reopened = make_cache(cache_dir)
+        assert reopened.lookup([0.0, 0.0, 0.0, 1.0, 0.0]) == "answer 3"
+        reopened.close()
+    
+    def test_other_sessions_do_not_crowd_out_hit(self, cache_dir):
+        """Test that a session's entry is found among many identical ones."""
+        for i in range(40):
+            cache = make_cache(cache_dir, session_id=f"s{i}")
+            cache.add([1.0, 0.0, 0.0], f"answer for s{i}")
+            cache.close()
+        
+        reopened = make_cache(cache_dir, session_id="s0")
+        assert reopened.lookup([1.0, 0.0, 0.0]) == "answer for s0"
+        reopened.close()
+    
+    @pytest.mark.parametrize("use_hnswlib", [True, False])
+    def test_expired_entries_purged(self, cache_dir, monkeypatch, use_hnswlib):
+        """Test that expired entries are deleted from SQLite and the index."""
+        if not use_hnswlib:
+            monkeypatch.setattr("src.storage.semantic_cache.hnswlib", None)
+        now = [1000.0]
+        monkeypatch.setattr(semantic_cache.time, "time", lambda: now[0])
+        cache = make_cache(cache_dir, ttl_seconds=60)
+        cache.add([1.0, 0.0, 0.0], "old reading")
+        
+        now[0] += cache.PURGE_INTERVAL + 60
+        cache.add([0.0, 1.0, 0.0], "new reading")
+        
+        responses = cache._conn.execute("SELECT response FROM semantic_cache").fetchall()
+        assert responses == [("new reading",)]
+        if use_hnswlib:
+            assert list(cache._session_rows) == [2]
+            with pytest.raises(RuntimeError):
+                cache._index.mark_deleted(1)
+        else:
+            assert cache._count == 1
+        assert cache.lookup([1.0, 0.0, 0.0]) is None
+        assert cache.lookup([0.0, 1.0, 0.0]) == "new reading"
+        cache.close()
+    
+    def test_index_saved_on_insert(self, cache_dir, monkeypatch):
+        """Test that the HNSW index is saved without waiting for close()."""
+        cache = make_cache(cache_dir)
+        cache.add([0.0, 1.0, 0.0], "saved")
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("index should be loaded, not rebuilt")
+        
+        monkeypatch.setattr(SemanticCache, "_new_index", fail)
+        reopened = make_cache(cache_dir)
+        assert reopened.lookup([0.0, 1.0, 0.0]) == "saved"
+        reopened.close()
+        cache.close()
+
+
+class TestEmbeddingCache:
+    """Tests for prompt embedding memoization and batching."""
+    
+    def test_repeated_prompt_embedded_once(self, cache_dir):
+        """Test that normalized repeats reuse the memoized embedding."""
+        cache = make_cache(cache_dir)
+        cache._client = FakeOllamaClient()
+        
+        first = cache.embed("List devices")
+        second = cache.embed("  list   DEVICES ")
+        
+        assert first == second
+        assert cache._client.calls == [["list devices"]]
+        cache.close()
+    
+    def test_embed_many_fetches_only_missing(self, cache_dir):
+        """Test that a batch only sends uncached prompts to Ollama."""
+        cache = make_cache(cache_dir)
+        cache._client = FakeOllamaClient()
+        cache.embed("read temp-sensor")
+        
+        vectors = cache.embed_many(["read temp-sensor", "open valve", "open valve"])
+        
+        assert len(vectors) == 3
+        assert vectors[1] == vectors[2]
+        assert cache._client.calls[-1] == ["open valve"]
+        cache.close()
+    
+    def test_concurrent_async_embeds_are_batched(self, cache_dir):
+        """Test that concurrent embed_async calls share one Ollama request."""
+        cache = make_cache(cache_dir)
+        cache._client = FakeOllamaClient()
+        
+        async def embed_all():
+            return await asyncio.gather(
+                *(cache.embed_async(f"prompt {i}") for i in range(5))
+            )
+        
+        vectors = asyncio.run(embed_all())
+        
+        assert len(vectors) == 5
+        assert len(cache._client.calls) == 1
+        assert len(cache._client.calls[0]) == 5
+        cache.close()
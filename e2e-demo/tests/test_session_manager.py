@@ -4,6 +4,7 @@ Verifies that the session manager correctly creates directories,
 persists sessions, and integrates with the agent.
 """
 
+import json
 import os
 import tempfile
 import shutil
@@ -58,6 +59,52 @@ class TestCreateSessionManager:
             )
             
             assert isinstance(session_manager, FileSessionManager)
+    
+    def test_session_file_round_trip(self):
+        """Test that session files written with orjson read back unchanged."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session_manager = create_session_manager(
+                session_id="orjson-test",
+                storage_dir=tmpdir
+            )
+            path = os.path.join(tmpdir, "data", "message.json")
+            data = {"role": "user", "content": [{"text": "Druck ü 25°C"}]}
+            
+            session_manager._write_file(path, data)
+            
+            assert session_manager._read_file(path) == data
+            with open(path, encoding="utf-8") as f:
+                assert json.load(f) == data
+    
+    def test_reads_files_written_by_json_module(self):
+        """Test that existing session files stay readable."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session_manager = create_session_manager(
+                session_id="legacy-test",
+                storage_dir=tmpdir
+            )
+            path = os.path.join(tmpdir, "legacy.json")
+            data = {"session_id": "legacy-test", "count": 3}
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            
+            assert session_manager._read_file(path) == data
+    
+    def test_invalid_json_raises_session_exception(self):
+        """Test that corrupt session files raise SessionException."""
+        from strands.types.exceptions import SessionException
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session_manager = create_session_manager(
+                session_id="corrupt-test",
+                storage_dir=tmpdir
+            )
+            path = os.path.join(tmpdir, "corrupt.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("{not json")
+            
+            with pytest.raises(SessionException):
+                session_manager._read_file(path)
 
 
 class TestEdgeSessionManager:
@@ -88,6 +135,7 @@ class TestEdgeSessionManager:
             
             expected_path = Path(tmpdir) / "session_path-test"
             assert edge_manager.get_session_path() == expected_path
+            assert edge_manager.get_session_path() is edge_manager.get_session_path()
     
     def test_session_exists_false_for_new_session(self):
         """Test that session_exists returns False for new sessions."""
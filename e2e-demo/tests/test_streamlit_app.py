@@ -0,0 +1,95 @@
+"""Tests for the Streamlit frontend helpers.
+
+Verifies that the agent's async stream is bridged to a synchronous
+generator without losing chunks or leaving the stream open, and that the
+chat history is rendered as one cached markdown block. Tabs sharing a
+session ID also share one lock around the agent.
+"""
+
+from streamlit_app import _agent_lock, history_markdown, stream_agent_response
+
+
+class FakeAgent:
+    """Agent stand-in whose stream yields fixed chunks."""
+    
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.closed = False
+    
+    async def stream_chat(self, prompt):
+        try:
+            for chunk in self.chunks:
+                yield chunk
+            if self.error:
+                raise self.error
+        finally:
+            self.closed = True
+
+
+class TestStreamAgentResponse:
+    """Tests for stream_agent_response."""
+    
+    def test_yields_chunks_in_order(self):
+        """Test that every chunk is yielded and the stream is closed."""
+        agent = FakeAgent(["Hello", ", ", "operator"])
+        
+        assert list(stream_agent_response(agent, "hi")) == ["Hello", ", ", "operator"]
+        assert agent.closed
+    
+    def test_error_is_reported_after_chunks(self):
+        """Test that a stream error is yielded as a final chunk."""
+        agent = FakeAgent(["partial"], error=RuntimeError("model offline"))
+        
+        assert list(stream_agent_response(agent, "hi")) == [
+            "partial", "\n\nError: model offline"
+        ]
+    
+    def test_early_stop_closes_stream(self):
+        """Test that abandoning the generator closes the agent stream."""
+        agent = FakeAgent(["a", "b", "c"])
+        
+        chunks = stream_agent_response(agent, "hi")
+        assert next(chunks) == "a"
+        chunks.close()
+        
+        assert agent.closed
+
+
+class TestHistoryMarkdown:
+    """Tests for history_markdown."""
+    
+    def test_joins_labelled_messages(self):
+        """Test that messages are labelled by role and separated."""
+        messages = [
+            {"role": "user", "content": "Read the temp sensor"},
+            {"role": "assistant", "content": "It is **21.5 °C**."},
+        ]
+        
+        assert history_markdown(messages) == (
+            "🧑 **You**\n\nRead the temp sensor"
+            "\n\n---\n\n"
+            "🏭 **Agent**\n\nIt is **21.5 °C**."
+        )
+    
+    def test_rendered_markdown_is_cached(self):
+        """Test that each message is rendered once and then reused."""
+        messages = [{"role": "user", "content": "hi"}]
+        history_markdown(messages)
+        messages[0]["rendered"] = "cached"
+        messages.append({"role": "assistant", "content": "hello"})
+        
+        assert history_markdown(messages) == (
+            "cached\n\n---\n\n🏭 **Agent**\n\nhello"
+        )
+
+
+class TestAgentLock:
+    """Tests for the per-session agent lock."""
+    
+    def test_one_lock_per_session(self):
+        """Test that a session ID always maps to the same lock."""
+        _agent_lock.clear()
+        
+        assert _agent_lock("a") is _agent_lock("a")
+        assert _agent_lock("a") is not _agent_lock("b")